@@ -7,7 +7,9 @@ def main():
     action_dict = {
         "0": 'Update data from recent S&P and FRED workbooks',
         "1": 'Generate Displays for the S&P500 Index',
-        "2": 'Generate Displays for the S&P500 Industries'
+        "2": 'Generate Displays for the S&P500 Industries',
+        "3": 'Roll back data to a previous snapshot generation',
+        "4": 'Nowcast P/Es and premiums from a new price'
     }
     
     while True:
@@ -29,6 +31,21 @@ def main():
             case "2":
                 from main_script_module import display_ind_data
                 display_ind_data.display_ind()
+            case "3":
+                from main_script_module import rollback_data
+                rollback_data.rollback()
+            case "4":
+                from main_script_module import nowcast_data
+                price = input('\nEnter the price of the S&P 500: ')
+                tips = input('Enter the 10-year TIPS rate, '
+                             'blank for the latest: ')
+                try:
+                    price = float(price)
+                    tips = float(tips) if tips else None
+                except ValueError:
+                    print(f'{price} or {tips} is not a number')
+                else:
+                    nowcast_data.nowcast(price, tips)
             case _:
                 print(f'{action} is not a valid key')
                 
@@ -0,0 +1,179 @@
+'''
+   these are functions that measure the accuracy of the projections,
+   page 9
+
+   a pair is a quarter's projection of the eps of a target quarter,
+   proj_yr_qtr and yr_qtr in the projections file, joined with the
+   eps realized in the target quarter
+   pairs file, one row per pair whose target quarter is in the history
+        proj_yr_qtr, yr_qtr
+        horizon             quarters from proj_yr_qtr to yr_qtr
+        op_proj, op_actual  projected and realized quarterly op_eps
+        op_error            op_proj - op_actual
+        op_pct_error        100 * op_error / op_actual
+        rep_...             the same for rep_eps
+
+   update() adds only the pairs not already in the published pairs
+   file, the pairs whose target quarters are new to the history
+   a pair does not change once its target quarter is realized:
+   the history is not revised and a projection is not replaced
+   after its quarter ends
+
+   access these functions in other modules by
+        from helper_func_module import accuracy_func as ac
+'''
+import polars as pl
+
+from helper_func_module import backup_func as bf
+from helper_func_module import display_helper_func as dh
+from helper_func_module import display_read_proj_dict
+
+
+KEYS = ['proj_yr_qtr', 'yr_qtr']
+
+
+def qtr_index(col):
+    '''
+        return expr, the number of quarters since year 0 of
+        col, yr_qtrs 'yyyy-Qq'
+    '''
+    return pl.col(col).str.slice(0, 4).cast(pl.Int32) * 4 + \
+           pl.col(col).str.slice(-1).cast(pl.Int32)
+
+
+def new_pairs(proj_lf, hist_lf, known_lf= None):
+    '''
+        proj_lf: projections for all yr_qtrs, see dh.proj_lf()
+        hist_lf: the history file
+        known_lf: pairs already computed, omitted, or None
+        return LazyFrame of the pairs, in one join
+    '''
+    if known_lf is not None:
+        proj_lf = proj_lf.join(known_lf.select(KEYS),
+                               on= KEYS,
+                               how= 'anti')
+    actual_lf = hist_lf.select('yr_qtr', 'op_eps', 'rep_eps')\
+                       .drop_nulls()
+    return proj_lf.select(KEYS + ['op_eps', 'rep_eps'])\
+                  .join(actual_lf,
+                        on= 'yr_qtr',
+                        how= 'inner',
+                        suffix= '_actual')\
+                  .select(*KEYS,
+                          (qtr_index('yr_qtr') -
+                           qtr_index('proj_yr_qtr'))
+                             .cast(pl.Int16)
+                             .alias('horizon'),
+                          *[expr
+                            for eps in ['op', 'rep']
+                            for expr in (
+                                pl.col(f'{eps}_eps')
+                                  .alias(f'{eps}_proj'),
+                                pl.col(f'{eps}_eps_actual')
+                                  .alias(f'{eps}_actual'),
+                                (pl.col(f'{eps}_eps') -
+                                 pl.col(f'{eps}_eps_actual'))
+                                  .alias(f'{eps}_error'),
+                                ((pl.col(f'{eps}_eps') -
+                                  pl.col(f'{eps}_eps_actual')) * 100 /
+                                 pl.col(f'{eps}_eps_actual'))
+                                  .alias(f'{eps}_pct_error'))])
+
+
+def proj_lf(address):
+    return dh.proj_lf(display_read_proj_dict.to_proj_dict(
+        pl.read_parquet(address)))
+
+
+def update(src, dst):
+    '''
+        src: Generation of the published files
+        dst: Generation whose history and projections files
+             are complete, ordinarily the staged generation
+        write the pairs of dst to dst.OUTPUT_ACCURACY_ADDR,
+        computing only the pairs not in the pairs file of src
+    '''
+    known_lf = pl.scan_parquet(src.OUTPUT_ACCURACY_ADDR) \
+        if src.OUTPUT_ACCURACY_ADDR.exists() else None
+    added_df = new_pairs(proj_lf(dst.OUTPUT_PROJ_ADDR),
+                         pl.scan_parquet(dst.OUTPUT_HIST_ADDR),
+                         known_lf)\
+                 .collect()
+
+    if known_lf is None:
+        pairs_df = added_df
+    else:
+        pairs_df = pl.concat([known_lf.collect(), added_df],
+                             how= 'vertical')
+    pairs_df = pairs_df.sort(by= KEYS)
+    bf.write_replace(dst.OUTPUT_ACCURACY_ADDR, pairs_df.write_parquet)
+
+    print('\n============================================')
+    print(f'Wrote projection pairs, {added_df.height} new, '
+          f'{pairs_df.height} in all, to: \n{dst.OUTPUT_ACCURACY_ADDR}')
+    print('============================================\n')
+    return
+
+
+def read(src, p_lf):
+    '''
+        p_lf: projections of src, see dh.proj_lf()
+        return LazyFrame of the pairs for src
+        scan the pairs file, or compute the pairs if there is none
+    '''
+    if src.OUTPUT_ACCURACY_ADDR.exists():
+        return pl.scan_parquet(src.OUTPUT_ACCURACY_ADDR)
+    return new_pairs(p_lf, pl.scan_parquet(src.OUTPUT_HIST_ADDR))
+
+
+def by_horizon(pairs_lf):
+    '''
+        return LazyFrame, one row for each horizon
+        cols: horizon, n, and for op and rep, the bias, mean
+        absolute error, and root mean squared error, in percent
+    '''
+    return pairs_lf.group_by('horizon')\
+                   .agg(pl.len().alias('n'),
+                        *[expr
+                          for eps in ['op', 'rep']
+                          for expr in (
+                              pl.col(f'{eps}_pct_error').mean()
+                                .alias(f'{eps}_bias'),
+                              pl.col(f'{eps}_pct_error').abs().mean()
+                                .alias(f'{eps}_mae'),
+                              pl.col(f'{eps}_pct_error').pow(2).mean()
+                                .sqrt()
+                                .alias(f'{eps}_rmse'))])\
+                   .sort(by= 'horizon')\
+                   .cast({pl.Float64: pl.Float32})
+
+
+def rolling_rmse(pairs_lf, eps, horizons, window= 8):
+    '''
+        return LazyFrame, one row for each target yr_qtr and
+        horizon in horizons, see rolling_pivot()
+        cols: yr_qtr, horizon, rmse, in percent, of the window
+        of target quarters that ends in yr_qtr
+    '''
+    return pairs_lf.filter(pl.col('horizon').is_in(horizons))\
+                   .sort(by= ['horizon', 'yr_qtr'])\
+                   .select('yr_qtr', 'horizon',
+                           pl.col(f'{eps}_pct_error').pow(2)
+                             .rolling_mean(window)
+                             .over('horizon')
+                             .sqrt()
+                             .cast(pl.Float32)
+                             .alias('rmse'))
+
+
+def rolling_pivot(df):
+    '''
+        df: collected rolling_rmse()
+        return df: yr_qtr and a col of rmse for each horizon
+    '''
+    return df.with_columns(pl.format('{} qtrs ahead', 'horizon')
+                             .alias('horizon'))\
+             .pivot(on= 'horizon',
+                    index= 'yr_qtr',
+                    values= 'rmse')\
+             .sort(by= 'yr_qtr')
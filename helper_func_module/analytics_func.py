@@ -0,0 +1,254 @@
+'''
+   these are functions that export the project's output files
+   to analytics.sqlite, an embedded sqlite database for ad hoc
+   queries, see the README for examples
+
+   tables, one row per key, with indexes
+        actuals         yr_qtr; also indexed on real_int_rate
+        industry        (year, industry); also (industry, year)
+        industry_stats  (measure, year, industry); also
+                        (industry, measure, year)
+                        the cross-sectional statistics of the
+                        industries' p/es, see ind_stats_func.py
+        projections     (proj_yr_qtr, yr_qtr); also yr_qtr
+                        proj_yr_qtr is the quarter in which the
+                        projection was made, yr_qtr is the quarter
+                        projected
+        sources         sha256 of the file loaded into each table
+   views, the measures computed for the display pages
+        v_quarterly     p/e, earnings yield, equity premium,
+                        margin, and quality of earnings (pages 1, 2)
+        v_fwd_premium   earnings projected over the next 4 quarters,
+                        forward earnings yield and premium (page 3)
+        v_industry      industry eps and p/e with the Q4 TIPS rate,
+                        and the percentile rank of each industry's
+                        p/e within its year (pages 4, 5, 6)
+
+   refresh() is incremental: it skips a table whose file has not
+   changed, otherwise it writes only the rows that have changed
+
+   access these functions in other modules by
+        from helper_func_module import analytics_func as an
+'''
+import time
+import sqlite3
+
+import polars as pl
+import polars.selectors as cs
+
+from helper_func_module import snapshot_func as sf
+
+
+# names of columns in sqlite: no '/', no leading digit
+COLUMN_RENAME = {'op_p/e': 'op_pe',
+                 'rep_p/e': 'rep_pe',
+                 '12m_op_eps': 'op_eps_12m',
+                 '12m_rep_eps': 'rep_eps_12m'}
+
+# table: (primary key, secondary indexes)
+TABLE_KEYS = {
+    'actuals': (('yr_qtr',),
+                [('real_int_rate',)]),
+    'industry': (('year', 'industry'),
+                 [('industry', 'year')]),
+    'industry_stats': (('measure', 'year', 'industry'),
+                       [('industry', 'measure', 'year')]),
+    'projections': (('proj_yr_qtr', 'yr_qtr'),
+                    [('yr_qtr',)])
+}
+
+# recreated by each refresh, so that a changed view replaces the old
+VIEWS = '''
+    DROP VIEW IF EXISTS v_quarterly;
+    CREATE VIEW v_quarterly AS
+    SELECT yr_qtr, date, price, real_int_rate,
+        price / op_eps_12m AS op_pe_12m,
+        price / rep_eps_12m AS rep_pe_12m,
+        100.0 * rep_eps_12m / price AS rep_earnings_yield,
+        100.0 * rep_eps_12m / price - real_int_rate AS equity_premium,
+        100.0 * op_margin AS margin,
+        100.0 * rep_eps_12m / op_eps_12m AS quality
+    FROM actuals;
+
+    DROP VIEW IF EXISTS v_fwd_premium;
+    CREATE VIEW v_fwd_premium AS
+    WITH ranked AS (
+        SELECT proj_yr_qtr, op_eps, rep_eps,
+            ROW_NUMBER() OVER (PARTITION BY proj_yr_qtr
+                               ORDER BY yr_qtr) AS n
+        FROM projections
+        WHERE yr_qtr >= proj_yr_qtr)
+    SELECT a.yr_qtr, a.price, a.real_int_rate,
+        SUM(r.op_eps) AS fwd_op_eps,
+        SUM(r.rep_eps) AS fwd_rep_eps,
+        100.0 * SUM(r.op_eps) / a.price AS fwd_op_yield,
+        100.0 * SUM(r.rep_eps) / a.price AS fwd_rep_yield,
+        100.0 * SUM(r.op_eps) / a.price - a.real_int_rate
+            AS fwd_op_premium,
+        100.0 * SUM(r.rep_eps) / a.price - a.real_int_rate
+            AS fwd_rep_premium
+    FROM actuals AS a
+    JOIN ranked AS r ON r.proj_yr_qtr = a.yr_qtr AND r.n <= 4
+    GROUP BY a.yr_qtr
+    HAVING COUNT(*) = 4;
+
+    DROP VIEW IF EXISTS v_industry;
+    CREATE VIEW v_industry AS
+    SELECT i.*, a.real_int_rate,
+        PERCENT_RANK() OVER (PARTITION BY i.year
+                             ORDER BY i.op_pe) AS op_pe_pct_rank,
+        PERCENT_RANK() OVER (PARTITION BY i.year
+                             ORDER BY i.rep_pe) AS rep_pe_pct_rank
+    FROM industry AS i
+    LEFT JOIN actuals AS a ON a.yr_qtr = i.year || '-Q4'
+    WHERE i.industry != 'SP500';
+'''
+
+
+def refresh(env, src):
+    '''
+        src: Generation of the published files
+        bring analytics.sqlite up to date with the files of src
+    '''
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(env.ANALYTICS_ADDR)
+    conn.execute('CREATE TABLE IF NOT EXISTS sources ('
+                 'name TEXT PRIMARY KEY, sha256 TEXT NOT NULL)')
+
+    counts = dict()
+    with conn:
+        for name, address, read_func in (
+                ('actuals', src.OUTPUT_HIST_ADDR, actuals_df),
+                ('industry', src.OUTPUT_IND_ADDR, industry_df),
+                ('industry_stats', src.OUTPUT_IND_STATS_ADDR,
+                 industry_stats_df),
+                ('projections', src.OUTPUT_PROJ_ADDR, projections_df)):
+            if not address.exists():
+                continue
+            digest = sf.file_hash(address)
+            row = conn.execute('SELECT sha256 FROM sources WHERE name = ?',
+                               (name,)).fetchone()
+            if row is not None and row[0] == digest:
+                counts[name] = 0
+                continue
+            counts[name] = refresh_table(conn, name, read_func(address))
+            conn.execute('INSERT OR REPLACE INTO sources VALUES (?, ?)',
+                         (name, digest))
+        conn.executescript(VIEWS)
+    conn.close()
+
+    print('\n============================================')
+    print(f'Refreshed analytics database: \n{env.ANALYTICS_ADDR}')
+    for name, count in counts.items():
+        print(f'\t{name:<15} {count:>6} rows written or removed')
+    print(f'\t{1000 * (time.perf_counter() - start):.1f} ms')
+    print('============================================\n')
+    return counts
+
+
+def refresh_table(conn, name, df):
+    '''
+        make table name match df, writing only the rows that differ
+        recreate the table if its columns differ from df's
+        return the number of rows written or removed
+    '''
+
+    keys, indexes = TABLE_KEYS[name]
+    columns = df.columns
+    if table_columns(conn, name) != columns:
+        create_table(conn, name, df, keys, indexes)
+
+    col_list = ', '.join(f'"{col}"' for col in columns)
+    key_pos = [columns.index(key) for key in keys]
+    old = {tuple(row[pos] for pos in key_pos): row
+           for row in conn.execute(f'SELECT {col_list} FROM {name}')}
+    new = {tuple(row[pos] for pos in key_pos): row
+           for row in df.rows()}
+
+    changed = [row for key, row in new.items() if old.get(key) != row]
+    removed = [key for key in old if key not in new]
+
+    conn.executemany(
+        f'INSERT OR REPLACE INTO {name} ({col_list}) '
+        f'VALUES ({", ".join("?" * len(columns))})',
+        changed)
+    conn.executemany(
+        f'DELETE FROM {name} WHERE ' +
+        ' AND '.join(f'"{key}" = ?' for key in keys),
+        removed)
+    return len(changed) + len(removed)
+
+
+def table_columns(conn, name):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({name})')]
+
+
+def create_table(conn, name, df, keys, indexes):
+    '''
+        drop any table name, create it with the columns of df
+        and its indexes
+    '''
+
+    sql_types = [('REAL' if dtype.is_float() else
+                  'INTEGER' if dtype.is_integer() else
+                  'TEXT')
+                 for dtype in df.dtypes]
+    conn.execute(f'DROP TABLE IF EXISTS {name}')
+    conn.execute(
+        f'CREATE TABLE {name} (' +
+        ', '.join(f'"{col}" {sql_type}'
+                  for col, sql_type in zip(df.columns, sql_types)) +
+        f', PRIMARY KEY ({", ".join(keys)}))')
+    for index in indexes:
+        conn.execute(f'CREATE INDEX {name}_{"_".join(index)} '
+                     f'ON {name} ({", ".join(index)})')
+    return
+
+
+def actuals_df(address):
+    return pl.read_parquet(address)\
+             .drop('date_right', strict= False)\
+             .rename(COLUMN_RENAME, strict= False)\
+             .with_columns(cs.date().dt.to_string())
+
+
+def industry_df(address):
+    '''
+        one row for each year and industry
+        cols: year, industry, op_eps, op_pe, rep_eps, rep_pe
+    '''
+    df = pl.read_parquet(address)
+    measures = ['op_eps', 'op_pe', 'rep_eps', 'rep_pe']
+    industries = [col.removesuffix('_op_eps') for col in df.columns
+                  if col.endswith('_op_eps')]
+    return pl.concat(
+        [df.select(pl.col('year'),
+                   pl.lit(ind).alias('industry'),
+                   *[pl.col(f'{ind}_{measure}').alias(measure)
+                     for measure in measures])
+         for ind in industries],
+        how= 'vertical')
+
+
+def industry_stats_df(address):
+    '''
+        the stats file, actual as 0 or 1
+    '''
+    return pl.read_parquet(address)\
+             .with_columns(cs.boolean().cast(pl.Int8))
+
+
+def projections_df(address):
+    '''
+        one row for each proj_yr_qtr and projected yr_qtr
+    '''
+    df = pl.read_parquet(address)
+    return pl.concat(
+        [df.select(pl.col(key).struct.unnest())
+           .drop_nulls(subset= 'yr_qtr')
+           .with_columns(pl.lit(key).alias('proj_yr_qtr'))
+         for key in df.columns],
+        how= 'vertical_relaxed')\
+             .rename(COLUMN_RENAME, strict= False)\
+             .with_columns(cs.date().dt.to_string())
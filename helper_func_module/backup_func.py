@@ -0,0 +1,132 @@
+'''
+   these are functions that snapshot and replace the project's
+   output files without decoding or re-encoding their contents
+
+   snapshot() makes a backup of a file using the cheapest method
+   that the filesystem supports:
+        1) reflink, a copy-on-write clone (APFS, Btrfs, XFS)
+        2) hardlink, a second name for the same inode
+        3) streaming byte copy
+
+   NB a hardlinked backup shares its inode with the output file
+        the output file therefore must never be rewritten in place
+        write_replace() writes a new inode and renames it over the
+        output, leaving the backup's inode untouched
+
+   access these functions in other modules by
+        from helper_func_module import backup_func as bf
+'''
+import os
+import sys
+import shutil
+
+# Linux ioctl request number for a copy-on-write clone of a file
+FICLONE = 0x40049409
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def snapshot(src, dst):
+    '''
+        src and dst are Path() instances
+        make dst a backup of src, replacing any existing dst
+        return the name of the method used:
+            'reflink', 'hardlink', or 'copy'
+    '''
+
+    tmp = tmp_address(dst)
+    tmp.unlink(missing_ok= True)
+
+    # rename is a no-op when tmp and dst are links to one inode,
+    # which would leave tmp behind
+    if dst.exists() and os.path.samefile(src, dst):
+        return 'hardlink'
+
+    for method, func in (('reflink', reflink),
+                         ('hardlink', os.link),
+                         ('copy', stream_copy)):
+        try:
+            func(src, tmp)
+        except OSError:
+            tmp.unlink(missing_ok= True)
+            continue
+        os.replace(tmp, dst)
+        return method
+
+    print('\n============================================')
+    print('In backup_func.py, snapshot(src, dst):')
+    print(f'Could not write a backup of: \n{src}')
+    print(f'to: \n{dst}')
+    print('============================================\n')
+    sys.exit()
+
+
+def reflink(src, dst):
+    '''
+        clone src to dst, sharing the data blocks until
+        one of them is modified
+        raise OSError if the filesystem does not support clones
+    '''
+
+    if sys.platform == 'darwin':
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno= True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            raise OSError(ctypes.get_errno(), 'clonefile failed')
+        return
+
+    try:
+        import fcntl
+    except ImportError:
+        # Windows has no ioctl, snapshot() falls back to a hardlink
+        raise OSError(f'no reflink on {sys.platform}') from None
+    with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+        fcntl.ioctl(f_dst.fileno(), FICLONE, f_src.fileno())
+    return
+
+
+def stream_copy(src, dst):
+    '''
+        copy src to dst in fixed-size blocks
+        fsync dst before returning
+    '''
+
+    with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+        shutil.copyfileobj(f_src, f_dst, COPY_BUFFER_SIZE)
+        f_dst.flush()
+        os.fsync(f_dst.fileno())
+    shutil.copystat(src, dst)
+    return
+
+
+def write_replace(address, write_func, mode= 'wb'):
+    '''
+        write_func receives an open file object
+        write to a temporary file next to address,
+        fsync it, then rename it over address
+        readers see either the old file or the new one,
+        never a partially written file
+    '''
+
+    tmp = tmp_address(address)
+    with tmp.open(mode) as f:
+        write_func(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, address)
+    return
+
+
+def fsync(address):
+    '''
+        flush the file at address to disk
+    '''
+    with open(address, 'rb') as f:
+        os.fsync(f.fileno())
+    return
+
+
+def tmp_address(address):
+    '''
+        return a hidden temporary address in the dir of address
+    '''
+    return address.with_name(f'.{address.name}.tmp')
@@ -0,0 +1,119 @@
+'''
+   these are functions that find the regimes of a series, the
+   segments between changes in its mean, pages 2 and 3
+
+   pelt() is the pruned exact linear time search of Killick,
+   Fearnhead, and Eckley (2012): it minimizes the sum of squared
+   deviations from each segment's mean, plus a penalty for each
+   change; each segment's cost is a difference of cumulative sums,
+   and pruning drops every candidate start that cannot begin the
+   last segment of a later optimum, so that the time rises about
+   linearly with the length of the series, quarterly or daily
+   the penalty is PENALTY * variance * log(n), the variance of the
+   noise estimated from the median absolute first difference
+
+   access these functions in other modules by
+        from helper_func_module import changepoint_func as cp
+'''
+import numpy as np
+import polars as pl
+
+
+PENALTY = 10.
+MIN_SIZE = 4
+
+
+def noise_variance(x):
+    '''
+        return robust estimate of the variance of the noise in x,
+        from the median absolute deviation of its first differences
+    '''
+    diffs = np.diff(x)
+    if len(diffs) == 0:
+        return 0.
+    mad = np.median(np.abs(diffs - np.median(diffs)))
+    return (mad / 0.6745) ** 2 / 2
+
+
+def pelt(x, penalty, min_size= MIN_SIZE):
+    '''
+        x: array without nan
+        return list of the ends of the segments, the last is len(x)
+    '''
+    n = len(x)
+    if n < 2 * min_size:
+        return [n]
+    sum1 = np.concatenate(([0.], np.cumsum(x)))
+    sum2 = np.concatenate(([0.], np.cumsum(x * x)))
+
+    def cost(starts, end):
+        # sum of squared deviations from the mean, x[starts:end]
+        return sum2[end] - sum2[starts] - \
+               (sum1[end] - sum1[starts]) ** 2 / (end - starts)
+
+    best = np.zeros(n + 1)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype= np.int64)
+    starts = np.array([0])
+    for end in range(min_size, n + 1):
+        # a start s with best[s] + cost(s, t) above best[t] never
+        # begins the last segment of an optimum that ends min_size
+        # or more after t
+        t = end - min_size
+        if t >= min_size:
+            prior = starts < t
+            keep = best[starts[prior]] + cost(starts[prior], t) <= best[t]
+            starts = np.concatenate((starts[prior][keep], starts[~prior]))
+        costs = best[starts] + cost(starts, end)
+        idx = np.argmin(costs)
+        best[end] = costs[idx] + penalty
+        last[end] = starts[idx]
+        if end + 1 - min_size >= min_size:
+            starts = np.append(starts, end + 1 - min_size)
+
+    ends = [n]
+    while last[ends[0]] > 0:
+        ends.insert(0, last[ends[0]])
+    return ends
+
+
+def segment_means(series):
+    '''
+        series: pl.Series, sorted by date, nulls ignored
+        return pl.Series, each value replaced by the mean of its
+        segment, see pelt(), null where series is null
+    '''
+    values = series.cast(pl.Float64).to_numpy()
+    valid = np.isfinite(values)
+    x = values[valid]
+    means = np.full(len(values), np.nan)
+    if len(x):
+        ends = pelt(x, PENALTY * noise_variance(x) * np.log(len(x)))
+        fitted = np.empty(len(x))
+        for start, end in zip([0] + ends[:-1], ends):
+            fitted[start:end] = x[start:end].mean()
+        means[valid] = fitted
+    return pl.Series(series.name, means, nan_to_null= True)\
+             .cast(pl.Float32)
+
+
+def segments(df, cols):
+    '''
+        df: yr_qtr, and the segment means of cols,
+            see segment_means(), sorted by yr_qtr
+        return df, one row for each segment of each col
+        cols: series, first, last (yr_qtrs), n, mean
+    '''
+    return pl.concat(
+        [df.select('yr_qtr', pl.col(col).alias('mean'))
+           .drop_nulls()
+           .with_columns(pl.col('mean').rle_id().alias('segment'))
+           .group_by('segment', maintain_order= True)
+           .agg(pl.col('yr_qtr').first().alias('first'),
+                pl.col('yr_qtr').last().alias('last'),
+                pl.len().alias('n'),
+                pl.col('mean').first())
+           .select(pl.lit(col).alias('series'),
+                   'first', 'last', 'n', 'mean')
+         for col in cols],
+        how= 'vertical')
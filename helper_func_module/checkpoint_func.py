@@ -0,0 +1,156 @@
+'''
+   these are functions that record the progress of update_data.py
+   so that an update that stops partway can resume where it stopped
+
+   update_data.py runs in named stages, see STAGES
+   each stage writes its outputs to the staging dir of the new
+   generation (see publish_func.py) or to checkpoint_dir/, then
+   records its name in checkpoint_dir/checkpoint.json
+   a rerun skips the stages that are recorded
+
+   checkpoint.json
+        gen_id          the generation being staged
+        src_gen_id      HEAD when the update began
+        new_files       input files not previously seen
+        files_to_read   input files that contain projections to read
+        latest_used_file
+        parsed          input file: yr_qtr, for each projection read,
+                        the projections are in checkpoint_dir/proj/
+        failures        input files that could not be read
+        done            names of the completed stages
+
+   the checkpoint is discarded if HEAD has moved, or if the staging
+   dir has been removed, before the update was published
+   if HEAD has moved to the checkpoint's own generation, the update
+   was published, and it resumes at 'archive'
+
+   access these functions in other modules by
+        from helper_func_module import checkpoint_func as ck
+'''
+import json
+import shutil
+
+import polars as pl
+
+from helper_func_module import backup_func as bf
+from helper_func_module import snapshot_func as sf
+
+
+STAGES = ('record', 'history', 'projections', 'derived', 'publish',
+          'archive', 'export')
+
+
+def new(env, gen_id, src_gen_id, new_files_set, files_to_read_set,
+        latest_used_file):
+    '''
+        start a checkpoint for generation gen_id
+        remove the outputs of any previous checkpoint
+    '''
+    clear(env)
+    env.CHECKPOINT_PROJ_DIR.mkdir(parents= True)
+    checkpoint = {'gen_id': gen_id,
+                  'src_gen_id': src_gen_id,
+                  'new_files': sorted(new_files_set),
+                  'files_to_read': sorted(files_to_read_set),
+                  'latest_used_file': latest_used_file,
+                  'parsed': dict(),
+                  'failures': [],
+                  'done': []}
+    save(env, checkpoint)
+    return checkpoint
+
+
+def save(env, checkpoint):
+    bf.write_replace(env.CHECKPOINT_ADDR,
+                     lambda f: json.dump(checkpoint, f, indent= 4),
+                     mode= 'w')
+    return
+
+
+def resume(env):
+    '''
+        return the checkpoint of an unfinished update,
+        None if there is none or if it can not be resumed
+    '''
+    if not env.CHECKPOINT_ADDR.exists():
+        return None
+    with env.CHECKPOINT_ADDR.open('r') as f:
+        checkpoint = json.load(f)
+
+    # an update that stopped before its first stage starts over
+    if 'record' not in checkpoint['done']:
+        clear(env)
+        return None
+
+    # an update that stopped after HEAD moved to its generation,
+    # but before it recorded 'publish', was published
+    if ('publish' not in checkpoint['done'] and
+        sf.head(env) == checkpoint['gen_id']):
+        sf.mirror(env, checkpoint['gen_id'])
+        mark_done(env, checkpoint, 'publish')
+
+    if 'publish' not in checkpoint['done']:
+        staging_dir = bf.tmp_address(env.SNAPSHOT_GEN_DIR /
+                                     checkpoint['gen_id'])
+        if (sf.head(env) != checkpoint['src_gen_id'] or
+            not staging_dir.is_dir()):
+            print('\n============================================')
+            print('Discarded the checkpoint of an unfinished update')
+            print(f'for generation {checkpoint["gen_id"]}')
+            print('HEAD has moved or the staging dir is gone')
+            print('============================================\n')
+            clear(env)
+            return None
+
+    print('\n============================================')
+    print(f'Resuming the update for generation {checkpoint["gen_id"]}')
+    print(f'completed stages: {checkpoint["done"]}')
+    print('============================================\n')
+    return checkpoint
+
+
+def is_done(checkpoint, stage):
+    return stage in checkpoint['done']
+
+
+def mark_done(env, checkpoint, stage):
+    checkpoint['done'].append(stage)
+    save(env, checkpoint)
+    return
+
+
+def proj_address(env, file):
+    '''
+        return the address of the projections read from file
+    '''
+    return env.CHECKPOINT_PROJ_DIR / f'{file}.parquet'
+
+
+def save_proj(env, checkpoint, file, year_quarter, proj_date_df):
+    '''
+        keep the projections read from file, so that
+        a rerun does not parse file again
+    '''
+    bf.write_replace(proj_address(env, file),
+                     proj_date_df.write_parquet)
+    checkpoint['parsed'][file] = year_quarter
+    save(env, checkpoint)
+    return
+
+
+def load_proj(env, file):
+    return pl.read_parquet(proj_address(env, file))
+
+
+def save_failure(env, checkpoint, file):
+    checkpoint['failures'].append(file)
+    save(env, checkpoint)
+    return
+
+
+def clear(env):
+    '''
+        remove the checkpoint and its outputs
+    '''
+    shutil.rmtree(env.CHECKPOINT_DIR, ignore_errors= True)
+    return
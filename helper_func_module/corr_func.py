@@ -0,0 +1,226 @@
+'''
+   these are functions for the rolling correlations among the
+   industries, page 12
+
+   two panels of annual data, one col for each industry, for the
+   years of actual earnings
+        pe      operating p/e
+        eps     percent change of operating eps from the year before
+   for each panel and each window of WINDOW years, the correlations
+   among the industries, from the running sums of the window
+        s1      sum of each industry's values, k
+        s2      sum of the products of each pair of industries, k x k
+   the next window adds the products of its last year and subtracts
+   those of the year it drops, so that each window costs k x k
+   operations, however long the window
+
+   correlations file, one row for each panel and the last year of
+   each window: panel, year, s1, s2, corr (k x k arrays)
+   the file's metadata holds the industries, in the order of the
+   rows and cols of the arrays, and WINDOW
+   update() keeps the windows that end before the first year that is
+   new or revised, and resumes the running sums from the last window
+   kept
+
+   access these functions in other modules by
+        from helper_func_module import corr_func as cr
+'''
+import json
+
+import numpy as np
+import polars as pl
+
+from helper_func_module import backup_func as bf
+
+
+WINDOW = 8
+PANELS = ['pe', 'eps']
+
+
+def panels(ind_df):
+    '''
+        ind_df: the industry file
+        return industries, the industries with values in every
+            year of actual earnings, and
+        dict, for each panel: (list of years, array year x industry)
+    '''
+    actual_df = ind_df.filter(pl.col('SP500_rep_eps').is_not_null())\
+                      .sort(by= 'year')
+    industries = [name.removesuffix('_op_pe')
+                  for name in actual_df.columns
+                  if name.endswith('_op_pe') and
+                     not name.startswith('SP500')]
+    industries = [ind for ind in industries
+                  if actual_df.select(f'{ind}_op_pe', f'{ind}_op_eps')
+                              .null_count().sum_horizontal().item() == 0]
+
+    years = actual_df['year'].to_list()
+    pe = actual_df.select([f'{ind}_op_pe' for ind in industries])\
+                  .to_numpy().astype(np.float64)
+    eps = actual_df.select([f'{ind}_op_eps' for ind in industries])\
+                   .to_numpy().astype(np.float64)
+    growth = (eps[1:] - eps[:-1]) * 100 / np.abs(eps[:-1])
+    return industries, {'pe': (years, pe),
+                        'eps': (years[1:], growth)}
+
+
+def rolling_sums(x, window, first= None, state= None):
+    '''
+        x: array year x industry
+        state: (s1, s2) of the window that ends in year first - 1,
+            or None to begin with the first window
+        return two arrays, s1 and s2 for the windows that end
+        in years first, ..., the last year of x
+    '''
+    n_years, k = x.shape
+    if state is None:
+        first = window - 1
+        if n_years < window:
+            return np.empty((0, k)), np.empty((0, k, k))
+        s1 = x[:window].sum(axis= 0)
+        s2 = x[:window].T @ x[:window]
+        start = first + 1
+    else:
+        s1, s2 = state
+        start = first
+
+    sums1 = [] if state is not None else [s1]
+    sums2 = [] if state is not None else [s2]
+    for year in range(start, n_years):
+        add, drop = x[year], x[year - window]
+        s1 = s1 + add - drop
+        s2 = s2 + np.outer(add, add) - np.outer(drop, drop)
+        sums1.append(s1)
+        sums2.append(s2)
+    if not sums1:
+        return np.empty((0, k)), np.empty((0, k, k))
+    return np.stack(sums1), np.stack(sums2)
+
+
+def correlations(s1, s2, window):
+    '''
+        s1, s2: arrays of windows, see rolling_sums()
+        return array window x industry x industry
+    '''
+    cov = s2 - s1[:, :, np.newaxis] * s1[:, np.newaxis, :] / window
+    sd = np.sqrt(np.diagonal(cov, axis1= 1, axis2= 2))
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        return cov / (sd[:, :, np.newaxis] * sd[:, np.newaxis, :])
+
+
+def corr_df(panel, years, s1, s2, window):
+    '''
+        return df of the windows of panel that end in years
+    '''
+    return pl.DataFrame(
+        {'panel': [panel] * len(years),
+         'year': years,
+         's1': s1,
+         's2': s2,
+         'corr': correlations(s1, s2, window).astype(np.float32)})
+
+
+def compute(ind_df, window= WINDOW):
+    '''
+        return df of the correlations file, and industries,
+        computed from the industry file
+    '''
+    industries, data = panels(ind_df)
+    dfs = []
+    for panel in PANELS:
+        years, x = data[panel]
+        s1, s2 = rolling_sums(x, window)
+        dfs.append(corr_df(panel, years[window - 1:], s1, s2, window))
+    return pl.concat(dfs, how= 'vertical')\
+             .sort(by= ['panel', 'year']), industries
+
+
+def update(src, dst, window= WINDOW):
+    '''
+        src: Generation of the published files
+        dst: Generation whose industry file is complete,
+             ordinarily the staged generation
+        write the correlations of dst to dst.OUTPUT_IND_CORR_ADDR,
+        computing only the windows that include a year new to
+        or revised in dst, if src has a correlations file
+    '''
+    industries, data = panels(pl.read_parquet(dst.OUTPUT_IND_ADDR))
+    metadata = {'industries': json.dumps(industries),
+                'window': str(window)}
+
+    known_df = None
+    if (src.OUTPUT_IND_CORR_ADDR.exists() and
+        src.OUTPUT_IND_ADDR.exists() and
+        all(pl.read_parquet_metadata(src.OUTPUT_IND_CORR_ADDR).get(key) ==
+            value for key, value in metadata.items())):
+        known_df = pl.read_parquet(src.OUTPUT_IND_CORR_ADDR)
+        _, known_data = panels(pl.read_parquet(src.OUTPUT_IND_ADDR))
+
+    dfs = []
+    n_new = 0
+    for panel in PANELS:
+        years, x = data[panel]
+        first, state = window - 1, None
+        if known_df is not None:
+            known_years, known_x = known_data[panel]
+            # the first year that is new or revised
+            same = 0
+            while (same < min(len(years), len(known_years)) and
+                   years[same] == known_years[same] and
+                   np.array_equal(x[same], known_x[same])):
+                same += 1
+            # keep the windows that end before it, if any
+            if same > window - 1:
+                dfs.append(known_df.filter(pl.col('panel') == panel,
+                                           pl.col('year')
+                                             .is_in(years[:same])))
+                last_df = dfs[-1].filter(pl.col('year') == years[same - 1])
+                first = same
+                state = (last_df['s1'].to_numpy()[0],
+                         last_df['s2'].to_numpy()[0])
+        s1, s2 = rolling_sums(x, window, first, state)
+        n_new += len(s1)
+        dfs.append(corr_df(panel, years[len(years) - len(s1):],
+                           s1, s2, window))
+
+    corr_all_df = pl.concat(dfs, how= 'vertical')\
+                    .sort(by= ['panel', 'year'])
+    bf.write_replace(dst.OUTPUT_IND_CORR_ADDR,
+                     lambda f: corr_all_df.write_parquet(
+                         f, metadata= metadata))
+
+    print('\n============================================')
+    print(f'Wrote industry correlations, {n_new} windows new, '
+          f'{corr_all_df.height} in all, to: '
+          f'\n{dst.OUTPUT_IND_CORR_ADDR}')
+    print('============================================\n')
+    return
+
+
+def read(src):
+    '''
+        return df of the correlations file of src, and industries,
+        computed from the industry file if src has none
+    '''
+    address = src.OUTPUT_IND_CORR_ADDR
+    if address.exists():
+        metadata = pl.read_parquet_metadata(address)
+        return pl.read_parquet(address), \
+               json.loads(metadata['industries'])
+    return compute(pl.read_parquet(src.OUTPUT_IND_ADDR))
+
+
+def mean_corr(df):
+    '''
+        return df, one row for each year, and for each panel,
+        the mean correlation among distinct industries
+    '''
+    corr = df['corr'].to_numpy()
+    k = corr.shape[-1]
+    off_diag = ~np.eye(k, dtype= bool)
+    return df.select('panel', 'year')\
+             .with_columns(pl.Series('mean',
+                                     np.nanmean(corr[:, off_diag],
+                                                axis= 1)))\
+             .pivot(on= 'panel', index= 'year', values= 'mean')\
+             .sort(by= 'year')
@@ -0,0 +1,129 @@
+'''
+   these are functions that attribute the changes in the industries'
+   total operating earnings, and in their aggregate P/E, to each
+   industry, page 13
+
+   for the industries i in year t
+        e       operating eps, 0 before an industry enters the file
+        pe      operating P/E, 0 where e is 0
+        E       total eps, sum_i e
+        w       weight, e / E
+        PE      aggregate P/E, sum_i w pe, the industries' price
+                over their total eps
+   the change of E from t-1 to t, in percent of E at t-1,
+        sum_i 100 (e_t - e_t-1) / E_t-1         eps_contrib
+   the change of PE, exactly, with the means of t-1 and t
+        sum_i mean(w) (pe_t - pe_t-1)           pe_valuation
+            + mean(pe) (w_t - w_t-1)            pe_mix
+   contributions() computes every term for every year and industry
+   at once, as operations over the array year x industry
+
+   decomposition file, one row for each year after the first and
+   each industry, sorted by year and industry
+        year, actual, industry, eps, weight,
+        eps_contrib, pe_valuation, pe_mix, pe_contrib
+        total_eps, agg_pe                   E and PE in year
+        prev_total_eps, prev_agg_pe         E and PE in the year before
+
+   access these functions in other modules by
+        from helper_func_module import decomp_func as dc
+'''
+import numpy as np
+import polars as pl
+import polars.selectors as cs
+
+from helper_func_module import backup_func as bf
+
+
+def arrays(ind_df):
+    '''
+        ind_df: the industry file
+        return years, actual (lists), industries, and arrays
+        year x industry of eps and pe, sorted by year
+    '''
+    ind_df = ind_df.sort(by= 'year')
+    industries = [name.removesuffix('_op_eps')
+                  for name in ind_df.columns
+                  if name.endswith('_op_eps') and
+                     not name.startswith('SP500')]
+    eps = ind_df.select([f'{ind}_op_eps' for ind in industries])\
+                .fill_null(0.)\
+                .to_numpy().astype(np.float64)
+    pe = ind_df.select([f'{ind}_op_pe' for ind in industries])\
+               .fill_null(0.)\
+               .to_numpy().astype(np.float64)
+    pe[eps == 0] = 0.
+    return ind_df['year'].to_list(), \
+           ind_df['SP500_rep_eps'].is_not_null().to_list(), \
+           industries, eps, pe
+
+
+def contributions(eps, pe):
+    '''
+        eps, pe: arrays year x industry
+        return dict of arrays year x industry, see above,
+        one row fewer than eps, for the years after the first
+    '''
+    total = eps.sum(axis= 1, keepdims= True)
+    weight = eps / total
+    agg_pe = (weight * pe).sum(axis= 1, keepdims= True)
+
+    def mean(x):
+        return (x[1:] + x[:-1]) / 2
+
+    pe_valuation = mean(weight) * np.diff(pe, axis= 0)
+    pe_mix = mean(pe) * np.diff(weight, axis= 0)
+    shape = pe_mix.shape
+    return {'eps': eps[1:],
+            'weight': weight[1:],
+            'eps_contrib': 100 * np.diff(eps, axis= 0) / total[:-1],
+            'pe_valuation': pe_valuation,
+            'pe_mix': pe_mix,
+            'pe_contrib': pe_valuation + pe_mix,
+            'total_eps': np.broadcast_to(total[1:], shape),
+            'agg_pe': np.broadcast_to(agg_pe[1:], shape),
+            'prev_total_eps': np.broadcast_to(total[:-1], shape),
+            'prev_agg_pe': np.broadcast_to(agg_pe[:-1], shape)}
+
+
+def decomp_df(ind_df):
+    '''
+        return df of the decomposition file, see above
+    '''
+    years, actual, industries, eps, pe = arrays(ind_df)
+    terms = contributions(eps, pe)
+    k = len(industries)
+    return pl.DataFrame(
+        {'year': np.repeat(years[1:], k),
+         'actual': np.repeat(actual[1:], k),
+         'industry': np.tile(industries, len(years) - 1),
+         **{name: array.ravel()
+            for name, array in terms.items()}})\
+             .sort(by= ['year', 'industry'])\
+             .cast({cs.float(): pl.Float32})
+
+
+def write(src):
+    '''
+        src: Generation whose industry file is complete,
+             ordinarily the staged generation
+        write the decomposition of src to src.OUTPUT_IND_DECOMP_ADDR
+    '''
+    df = decomp_df(pl.read_parquet(src.OUTPUT_IND_ADDR))
+    bf.write_replace(src.OUTPUT_IND_DECOMP_ADDR, df.write_parquet)
+
+    print('\n============================================')
+    print(f'Wrote industry contributions, {df.height} rows, to: '
+          f'\n{src.OUTPUT_IND_DECOMP_ADDR}')
+    print('============================================\n')
+    return
+
+
+def read(src):
+    '''
+        return df of the decomposition file of src,
+        computed from the industry file if src has none
+    '''
+    if src.OUTPUT_IND_DECOMP_ADDR.exists():
+        return pl.read_parquet(src.OUTPUT_IND_DECOMP_ADDR)
+    return decomp_df(pl.read_parquet(src.OUTPUT_IND_ADDR))
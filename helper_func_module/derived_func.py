@@ -0,0 +1,189 @@
+'''
+   these are functions for the derived-metrics file, the measures
+   that the display pages compute from the history and projections
+   files, computed once by update_data.py
+
+   cols, one row for each yr_qtr in the history file
+        yr_qtr, date, price, 12m_op_eps, 12m_rep_eps, real_int_rate
+        op_pe_12m, rep_pe_12m   price / 12m trailing eps (page 1)
+        margin                  100 * op_margin (page 2)
+        quality                 100 * 12m rep eps / 12m op eps (page 2)
+        premium                 100 * 12m rep eps / price,
+                                less real_int_rate (page 2)
+        fwd_12mproj_op_eps,     eps projected in yr_qtr for the
+        fwd_12mproj_rep_eps     next 4 quarters (page 3)
+        fwd_op_yield,           100 * fwd eps / price (page 3)
+        fwd_rep_yield
+        fwd_op_premium,         fwd yield, less real_int_rate (page 3)
+        fwd_rep_premium
+        op_eps, rep_eps         quarterly eps
+        div_ps                  quarterly dividends per share
+        12m_div_ps              dividends over the trailing 4 quarters
+        sales_ps, bk_val_ps,    quarterly sales, book value, capex
+        capex_ps, divisor       per share, and the index divisor
+        div_yield, payout_op, payout_rep, price_to_book,
+        capex_intensity, share_growth, div_premium, ...
+                                the fundamentals, see
+                                fundamentals_func.py (page 15)
+        {col}_regime            for each col of REGIME_COLS, the mean
+                                of its segment between change points,
+                                see changepoint_func.py (pages 2, 3)
+        windowed eps, p/e, and earnings yield for the windows of
+        window_func.WINDOWS quarters, op_eps_40q, pe_op_eps_40q, ...
+        see window_func.py, all nominal
+
+   the file's parquet metadata holds the sha256 of its inputs and
+   DERIVED_VERSION; read() recomputes the measures if either differs,
+   so that a reader never uses measures that are out of date
+   change DERIVED_VERSION whenever a definition changes
+
+   access these functions in other modules by
+        from helper_func_module import derived_func as dv
+'''
+import sys
+import hashlib
+
+import polars as pl
+
+from helper_func_module import backup_func as bf
+from helper_func_module import snapshot_func as sf
+from helper_func_module import display_helper_func as dh
+from helper_func_module import display_read_proj_dict
+from helper_func_module import window_func as wn
+from helper_func_module import changepoint_func as cp
+from helper_func_module import fundamentals_func as fd
+
+
+DERIVED_VERSION = '5'
+
+HIST_COLS = ['yr_qtr', 'date', 'price', '12m_op_eps', '12m_rep_eps',
+             'op_margin', 'real_int_rate', 'op_eps', 'rep_eps', 'div_ps',
+             *fd.FUNDAMENTAL_COLS]
+
+# the series whose regimes are found, over the full history
+REGIME_COLS = ['margin', 'premium', 'op_pe_12m', 'rep_pe_12m',
+               'fwd_op_premium', 'fwd_rep_premium']
+
+
+def input_hash(src):
+    '''
+        src: Generation
+        return the sha256 of DERIVED_VERSION and of the contents
+        of the history and projections files of src
+    '''
+    h = hashlib.sha256(DERIVED_VERSION.encode())
+    for address in (src.OUTPUT_HIST_ADDR, src.OUTPUT_PROJ_ADDR):
+        h.update(sf.file_hash(address).encode())
+    return h.hexdigest()
+
+
+def derived_lf(hist_lf, proj_lf):
+    '''
+        hist_lf: LazyFrame of the history file
+        proj_lf: projections for all yr_qtrs, see dh.proj_lf()
+        return LazyFrame of the derived measures, sorted by yr_qtr
+    '''
+    lf = hist_lf.select(HIST_COLS)\
+                .sort(by= 'yr_qtr')\
+                .with_columns(
+                    (pl.col('price') / pl.col('12m_op_eps'))
+                        .alias('op_pe_12m'),
+                    (pl.col('price') / pl.col('12m_rep_eps'))
+                        .alias('rep_pe_12m'),
+                    (pl.col('op_margin') * 100).alias('margin'),
+                    (pl.col('12m_rep_eps') /
+                     pl.col('12m_op_eps') * 100)
+                        .cast(pl.Int8)
+                        .alias('quality'),
+                    ((pl.col('12m_rep_eps') /
+                      pl.col('price')) * 100 -
+                      pl.col('real_int_rate'))
+                        .alias('premium'),
+                    pl.col('div_ps').rolling_sum(4)
+                        .alias('12m_div_ps'))\
+                .drop('op_margin')
+    lf = fd.fundamentals(lf)
+    # every window in one pass over the full history
+    lf = wn.windowed_eps(lf, ['op_eps', 'rep_eps'])
+
+    for eps in ['op', 'rep']:
+        name_proj = f'fwd_12mproj_{eps}_eps'
+        lf = dh.contemp_12m_fwd_proj(lf, proj_lf, f'{eps}_eps', name_proj)\
+               .with_columns((pl.col(name_proj) * 100 /
+                              pl.col('price'))
+                                .alias(f'fwd_{eps}_yield'))\
+               .with_columns((pl.col(f'fwd_{eps}_yield') -
+                              pl.col('real_int_rate'))
+                                .alias(f'fwd_{eps}_premium'))
+    
+    # one change-point search for each series, in date order
+    return lf.sort(by= 'yr_qtr')\
+             .with_columns([pl.col(col)
+                              .map_batches(cp.segment_means,
+                                           return_dtype= pl.Float32)
+                              .alias(f'{col}_regime')
+                            for col in REGIME_COLS])
+
+
+def compute(src, proj_dict= None):
+    '''
+        return LazyFrame of the derived measures,
+        computed from the history and projections files of src
+        proj_dict: the projections file of src, see
+            display_read_proj_dict.to_proj_dict(), if already read
+    '''
+    if proj_dict is None:
+        proj_dict = display_read_proj_dict.to_proj_dict(
+            pl.read_parquet(src.OUTPUT_PROJ_ADDR))
+    return derived_lf(pl.scan_parquet(src.OUTPUT_HIST_ADDR),
+                      dh.proj_lf(proj_dict))
+
+
+def write(src):
+    '''
+        src: Generation whose history and projections files
+             are complete, ordinarily the staged generation
+        write the derived measures to src.OUTPUT_DERIVED_ADDR,
+        with the sha256 of the inputs in the file's metadata
+    '''
+    df = compute(src).collect()
+    metadata = {'input_sha256': input_hash(src),
+                'derived_version': DERIVED_VERSION}
+    bf.write_replace(src.OUTPUT_DERIVED_ADDR,
+                     lambda f: df.write_parquet(f, metadata= metadata))
+
+    print('\n============================================')
+    print(f'Wrote derived measures, {df.height} rows, to: '
+          f'\n{src.OUTPUT_DERIVED_ADDR}')
+    print('============================================\n')
+    return
+
+
+def read(src, proj_dict= None):
+    '''
+        return LazyFrame of the derived measures for src
+        scan the derived file if it matches the files of src,
+        else compute the measures from the files of src
+    '''
+    if not src.OUTPUT_HIST_ADDR.exists():
+        print('\n============================================')
+        print(f'No data history in: \n{src.OUTPUT_HIST_ADDR.name}')
+        print(f'at: \n{src.OUTPUT_HIST_ADDR}')
+        print('Processing ended')
+        print('============================================\n')
+        sys.exit()
+    
+    address = src.OUTPUT_DERIVED_ADDR
+    if (address.exists() and
+        pl.read_parquet_metadata(address).get('input_sha256') ==
+            input_hash(src)):
+        print('\n============================================')
+        print(f'Scan derived measures from: \n{address}')
+        print('============================================\n')
+        return pl.scan_parquet(address)
+
+    print('\n============================================')
+    print(f'Derived measures missing or out of date: \n{address}')
+    print('computing them from the history and projections files')
+    print('============================================\n')
+    return compute(src, proj_dict)
@@ -1,169 +1,151 @@
-from copy import deepcopy
-import gc
-import sys
-
 import polars as pl
 
-from helper_func_module import helper_func as hp
+
+def proj_lf(p_dict):
+    '''
+        return one LazyFrame with the rows of all proj_dfs in p_dict
+        col proj_yr_qtr contains the key of each row's proj_df,
+        the yr_qtr in which the projection was made
+    '''
+    return pl.concat([p_df.lazy()
+                          .with_columns(pl.lit(key).alias('proj_yr_qtr'))
+                      for key, p_df in p_dict.items()],
+                     how= 'vertical')
 
 
-def contemp_12m_fwd_proj(df, p_dict, eps, name_proj):
+def contemp_12m_fwd_proj(lf, p_lf, eps, name_proj):
     '''
-        add col to df that contains
+        p_lf: projections for all yr_qtrs, see proj_lf()
+        add col to lf that contains
         projected E over the next 4 quarters
-        return df
+        return lf
     '''
-    # put 12m fwd projection in new col name_proj
-    # for all qtrs in df
-    df = df.with_columns(pl.Series(
-                    [fwd_12m_ern(eps, p_dict[yrqtr])
-                     for yrqtr in df['yr_qtr']])
-                         .alias(name_proj))\
-           .cast({name_proj: pl.Float32})
-    return df
+    # for each proj_yr_qtr, sum eps over the first 4 projected qtrs,
+    # in ascending order, from the current 'yr_qtr'
+    # a projection with fewer than 4 qtrs has no 12m fwd E: null
+    fwd_lf = p_lf.group_by('proj_yr_qtr')\
+                 .agg(pl.when(pl.len() >= 4)
+                        .then(pl.col(eps)
+                                .sort_by('yr_qtr')
+                                .head(4)
+                                .cast(pl.Float64)
+                                .sum())
+                        .otherwise(None)
+                        .cast(pl.Float32)
+                        .alias(name_proj))\
+                 .rename({'proj_yr_qtr': 'yr_qtr'})
+    return lf.join(fwd_lf,
+                   on= 'yr_qtr',
+                   how= 'left',
+                   coalesce= True)
 
 
-def fwd_12m_ern(name, p_df):
+def missing_proj_keys(keys):
     '''
-        calculate "contemporaneous" projection 
-        of next 4 qtrs of earnings
-        return float
+        keys: yr_qtrs of the projections, 'yyyy-Qq'
+        return sorted list of the yr_qtrs between the first and
+        the last key that are not keys
     '''
-    # ensure the yr_qtrs are ascending to sum down the rows
-    # from the current 'yr_qtr'
-    p_df = p_df.sort(by= 'yr_qtr')
-    fwd_e = sum((p_df.item(id, name)
-                 for id in range(4)))
-    del p_df
-    gc.collect()
-    return fwd_e
+    keys = set(keys)
+    first, last = min(keys), max(keys)
+    span = [f'{year}-Q{qtr}'
+            for year in range(int(first[:4]), int(last[:4]) + 1)
+            for qtr in range(1, 5)]
+    return [yq for yq in span
+            if first <= yq <= last and yq not in keys]
 
 
-def page0_df(df, p_dict, p_dict_columns, name_act):
+def page0_df(lf, p_lf, name_act):
     '''
-        return df with data to be plotted on page 0
-        input df has actual earn (history)
-        input p_dict has projections
+        return lf with data to be plotted on page 0, in long form,
+        see page0_pivot()
+        input lf has actual earn (history)
+        input p_lf has projections, see proj_lf()
     '''
     
     # create hf with 2cols 
     #   yr_qtr and actual 12m eps
     #   which appears only in the 4th qtr, otherwise null
-    hf = df.select(pl.col(name_act),
-                   pl.col('yr_qtr'))\
-                .filter(pl.col('yr_qtr')
-                        .map_batches(hp.is_quarter_4))\
-                .join(df,
-                      how= 'right',
-                      on= 'yr_qtr',
-                      coalesce= True)\
-                .select(pl.col(name_act),
-                        pl.col('yr_qtr'))
-
-    # for each yr_qtr in df (hf), fetch its proj_df from p_dict
-    # filter to select 12m proj for future Q4s
-    # join with df on yr_qtr
+    hf = lf.select(pl.col('yr_qtr'),
+                   pl.when(pl.col('yr_qtr').str.ends_with('4'))
+                     .then(pl.col(name_act))
+                     .alias(name_act))
 
-    df = df.sort(by='yr_qtr')
-    for idx, yrqtr in enumerate(df['yr_qtr']):
-        # target yr_qtr, place in col for filtered pro_df
-        
-        if yrqtr not in p_dict.keys():
-            print('\n========================================================================')
-            print('In display_helper_func.page0_df():')
-            print(f"{yrqtr} from df['yr_qtr'] is not in p_dict's keys")
-            print('=> update_data.py likely failed to write all files properly')
-            print('check record_dict.json latest_used_file vs')
-            print('prev_used_files and files listed for other record_dict keys')
-            print('========================================================================\n')
-            sys.exit()
-        
-        # use only full year projections (in 12-m for Q4) and
-        # Q4s for years >= year of current projection date (yrqtr)
-        pro_df = p_dict[yrqtr]\
-                    .select(p_dict_columns)\
-                    .filter(pl.col('yr_qtr')
-                            .map_batches(hp.is_quarter_4))\
-                    .with_columns(pl.col('yr_qtr')
-                                      .map_batches(hp.yrqtr_to_yr)
-                                      .alias('year'),
-                                  pl.lit(yrqtr).alias('yr_qtr'))\
-                    .filter((pl.col('year') >= yrqtr[:4]))
-        
-        # accumulate rows for the projection DF for each yr_qtr  
-        if idx == 0:
-            p_df = deepcopy(pro_df)
-        else:
-            p_df = pl.concat([p_df, pro_df],
-                             how= 'vertical')
+    # from the projections made in each yr_qtr, in one pass,
+    # use only full year projections (in 12-m for Q4) and
+    # Q4s for years >= year of current projection date (proj_yr_qtr)
+    p_long = p_lf.filter(pl.col('yr_qtr').str.ends_with('4'))\
+                 .select(pl.col('proj_yr_qtr').alias('yr_qtr'),
+                         pl.col('yr_qtr').str.slice(0, 4).alias('year'),
+                         pl.col(name_act).alias('projection'))\
+                 .filter(pl.col('year') >= pl.col('yr_qtr').str.slice(0, 4))
     
-    # pivot years into column names for each yr_qtr
-    p_df = p_df.pivot(index= 'yr_qtr',
-                      columns= 'year')\
-               .sort(by= 'yr_qtr')\
-    
-    # build DF with data to plot
-    p_df = hf.select(['yr_qtr', 
-                      name_act])\
-             .join(p_df,
+    # one row for each yr_qtr and projected year
+    # yr_qtrs without projections have one row, with null year
+    return hf.join(p_long,
                    on= 'yr_qtr',
                    how= 'left',
                    coalesce= True)
-    del hf
-    del pro_df
-    gc.collect()
-    return p_df
 
 
-def  page1_df(df, p_df, eps, ROGQ):
+def page0_pivot(df, name_act):
     '''
-        return df with data to be plotted on page 1
+        df: collected page0_df()
+        pivot years into column names for each yr_qtr, once
+        return df: yr_qtr, actual, and a col for each year
+    '''
+    return df.pivot(on= 'year',
+                    index= ['yr_qtr', name_act],
+                    values= 'projection')\
+             .drop('null', strict= False)\
+             .rename({name_act: 'actual'})\
+             .sort(by= 'yr_qtr')
+
+
+def page1_df(lf, p_lf, eps, ROGQ):
+    '''
+        return lf with data to be plotted on page 1
+        input lf has price, eps, and pe, the trailing p/e
     '''
     
-    # find most recent price from projection df
-    df = df.with_columns((pl.col('price') / pl.col(eps))
-                            .alias('pe'))\
-           .sort(by= 'yr_qtr')
-    base_price = \
-        df.filter(pl.col(eps).is_not_null())[-1, 'price']
+    # find most recent price from history
+    lf = lf.sort(by= 'yr_qtr')
+    base_lf = lf.filter(pl.col(eps).is_not_null())\
+                .select(pl.col('price')
+                          .last()
+                          .cast(pl.Float64)
+                          .alias('fixed_price'))
 
-    # build projected df for graph from df and p_df
-    p_df = p_df.with_columns(pl.lit(base_price)
-                               .alias('fixed_price'))\
+    # build projected lf for graph from lf and p_lf
+    p_lf = p_lf.join(base_lf, how= 'cross')\
                .sort(by= 'yr_qtr')\
-               .with_columns(pl.Series(
-                                    [base_price * ROGQ**idx
-                                     for idx in range(len(p_df))])
+               .with_columns((pl.col('fixed_price') *
+                              pl.lit(ROGQ) ** pl.int_range(pl.len()))
                                 .alias('incr_price'))\
                .with_columns((pl.col('fixed_price') / pl.col(eps))
                                 .alias('fix_proj_p/e'),
                              (pl.col('incr_price') / pl.col(eps))
                                 .alias('incr_proj_p/e'))                      
-    df = df.join(p_df,
-                 on= 'yr_qtr',
-                 how= 'full',
-                 coalesce= True)\
-           .sort(by= 'yr_qtr')\
-           .select(['yr_qtr', 'pe',
-                    'fix_proj_p/e', 'incr_proj_p/e'])
-    return df
+    return lf.join(p_lf,
+                   on= 'yr_qtr',
+                   how= 'full',
+                   coalesce= True)\
+             .sort(by= 'yr_qtr')\
+             .select(['yr_qtr', 'pe',
+                      'fix_proj_p/e', 'incr_proj_p/e'])
 
-def page3_df(df, name_12m_fwd_eps):
+def page3_df(lf, eps):
     '''
-        return df with data to be plotted on page 3
+        lf: the derived measures, see derived_func.py
+        eps: 'op' or 'rep'
+        return lf with data to be plotted on page 3
     '''
     
-    hf = df.with_columns((pl.col(name_12m_fwd_eps) * 100 /
-                          pl.col('price'))
-           .alias('earnings / price'))\
-           .with_columns((
-               pl.col('earnings / price') -
-               pl.col('real_int_rate'))
-           .alias('equity premium'))\
-           .rename({'real_int_rate': '10-year TIPS rate'})\
-           .select('yr_qtr', 
-                   'earnings / price', 
-                   'equity premium',
-                   '10-year TIPS rate')\
-           .sort(by= 'yr_qtr')
-    return hf 
+    return lf.select('yr_qtr',
+                     pl.col(f'fwd_{eps}_yield')
+                       .alias('earnings / price'),
+                     pl.col(f'fwd_{eps}_premium')
+                       .alias('equity premium'),
+                     pl.col('real_int_rate')
+                       .alias('10-year TIPS rate'))\
+             .sort(by= 'yr_qtr')
@@ -2,25 +2,38 @@ import json
 import sys
 
 from helper_func_module import helper_func as hp
+from helper_func_module import manifest_func as mf
 
-def read(env):
-    if env.RECORD_DICT_ADDR.exists():
-        with env.RECORD_DICT_ADDR.open('r') as f:
-            record_dict = json.load(f)
+def read(src):
+    # the manifest answers with one indexed query
+    # record_dict.json is read only if there is no manifest
+    if src.MANIFEST_ADDR.exists():
+        conn = mf.open_read(src.MANIFEST_ADDR)
+        latest_used_file = mf.latest_used_file(conn)
+        conn.close()
         print('\n============================================')
-        print(f'Read record_dict from: \n{env.RECORD_DICT_ADDR}')
+        print(f'Read manifest from: \n{src.MANIFEST_ADDR}')
+        print('============================================\n')
+    elif src.RECORD_DICT_ADDR.exists():
+        with src.RECORD_DICT_ADDR.open('r') as f:
+            latest_used_file = json.load(f)['latest_used_file']
+        print('\n============================================')
+        print(f'Read record_dict from: \n{src.RECORD_DICT_ADDR}')
         print('============================================\n')
     else:
+        latest_used_file = None
+        
+    if not latest_used_file:
         print('\n============================================')
-        print(f'No record_dict in \n{env.RECORD_DICT_ADDR.name}')
-        print(f'at: \n{env.RECORD_DICT_ADDR}')
+        print(f'No manifest in \n{src.MANIFEST_ADDR.name}')
+        print(f'at: \n{src.MANIFEST_ADDR}')
         print('Processing ended')
         print('============================================\n')
         sys.exit()
         
     # returns proj's date, a polars series with one date element
     date_this_projn = \
-        hp.string_to_date([record_dict['latest_used_file']])
+        hp.string_to_date([latest_used_file])
     # returns yr_qrt, a polar series with one str element
     # then, extract the str
     yr_qtr_current_projn = \
@@ -28,4 +41,4 @@ def read(env):
     # extract the datetime.date 
     date_this_projn = date_this_projn.to_list()[0]
     
-    return record_dict, date_this_projn, yr_qtr_current_projn
+    return date_this_projn, yr_qtr_current_projn
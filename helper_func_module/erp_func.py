@@ -0,0 +1,133 @@
+'''
+   these are functions for the implied equity premium, page 11
+
+   for each yr_qtr, the implied real return r equates price to the
+   present value of dividends, in real terms
+        d0              12m trailing dividends per share
+        g1              real growth of dividends for the first n years,
+                        the growth of the 12m eps projected in yr_qtr
+                        over the 12m trailing eps, less inflation;
+                        the terminal growth if there is no projection
+        g_t             real growth of dividends after n years
+        price = sum_k d0 (1 + g1)^k / (1 + r)^k,    k = 1, ..., n
+                + d0 (1 + g1)^n (1 + g_t) / ((r - g_t) (1 + r)^n)
+   the implied equity premium is r less real_int_rate
+
+   implied_return() solves for r in every yr_qtr at once, by Newton's
+   method over numpy arrays, each step kept within a bracket of the
+   root, halving the bracket when a step would leave it
+   the present value falls as r rises, from infinity at r = g_t,
+   so that each yr_qtr has one root above g_t
+
+   access these functions in other modules by
+        from helper_func_module import erp_func as ep
+'''
+import numpy as np
+import polars as pl
+
+
+# highest implied return, the top of the bracket of every root
+MAX_RETURN = 1.
+TOLERANCE = 1e-10
+MAX_ITER = 100
+
+
+def stage1_growth(fwd_eps, eps, g_t, inflation, bounds):
+    '''
+        fwd_eps, eps: arrays of 12m projected and trailing eps
+        return array of real growth for the first years,
+        within bounds, g_t where there is no projection
+    '''
+    growth = np.asarray(fwd_eps, dtype= np.float64) / \
+             np.asarray(eps, dtype= np.float64) / \
+             (1. + inflation) - 1.
+    growth = np.clip(growth, *bounds)
+    return np.where(np.isfinite(growth), growth, g_t)
+
+
+def present_value(r, d0, g1, g_t, years):
+    '''
+        r, d0, g1: arrays, one value per yr_qtr
+        return two arrays, the present value of dividends
+        and its derivative with respect to r
+    '''
+    k = np.arange(1, years + 1)
+    dividends = d0[:, np.newaxis] * \
+                (1. + g1[:, np.newaxis]) ** k
+    discount = (1. + r[:, np.newaxis]) ** -k
+    terminal = dividends[:, -1] * (1. + g_t) / (r - g_t) * \
+               discount[:, -1]
+
+    value = (dividends * discount).sum(axis= 1) + terminal
+    slope = -(k * dividends * discount).sum(axis= 1) / (1. + r) - \
+            terminal * (1. / (r - g_t) + years / (1. + r))
+    return value, slope
+
+
+def implied_return(price, d0, g1, g_t, years):
+    '''
+        price, d0, g1: arrays, one value per yr_qtr
+        return array of the implied real returns,
+        nan where an input is missing or r exceeds MAX_RETURN
+    '''
+    price = np.asarray(price, dtype= np.float64)
+    d0 = np.asarray(d0, dtype= np.float64)
+    g1 = np.asarray(g1, dtype= np.float64)
+    valid = np.isfinite(price) & np.isfinite(d0) & np.isfinite(g1) & \
+            (price > 0) & (d0 > 0)
+    # placeholders for the invalid yr_qtrs, replaced by nan below
+    price = np.where(valid, price, 1.)
+    d0 = np.where(valid, d0, 1.)
+    g1 = np.where(valid, g1, g_t)
+
+    low = np.full(price.shape, g_t + 1e-9)
+    high = np.full(price.shape, MAX_RETURN)
+    # the Gordon model, first year's dividend / price + g_t
+    r = np.clip(d0 * (1. + g1) / price + g_t, low, high)
+    for _ in range(MAX_ITER):
+        value, slope = present_value(r, d0, g1, g_t, years)
+        error = value - price
+        if np.all(np.abs(error) <= TOLERANCE * price):
+            break
+        # the root is above r if value exceeds price
+        low = np.where(error > 0, r, low)
+        high = np.where(error > 0, high, r)
+        step = r - error / slope
+        r = np.where((step > low) & (step < high),
+                     step,
+                     (low + high) / 2)
+
+    # no root below MAX_RETURN, or no convergence
+    value, _ = present_value(r, d0, g1, g_t, years)
+    solved = valid & (np.abs(value - price) <= 1e-6 * price)
+    return np.where(solved, r, np.nan)
+
+
+def erp_df(df, eps, years, g_t, inflation, bounds):
+    '''
+        df: derived measures, see derived_func.py, sorted by yr_qtr
+            cols: yr_qtr, price, 12m_div_ps, real_int_rate,
+            12m_{eps}_eps, fwd_12mproj_{eps}_eps
+        return df, cols: yr_qtr, and in percent,
+            {eps}_growth        real growth for the first years
+            {eps}_return        implied real return
+            {eps}_erp           implied equity premium
+    '''
+    # the latest quarters may not yet report dividends or eps
+    df = df.with_columns(pl.col('12m_div_ps', f'12m_{eps}_eps')
+                           .forward_fill())
+    g1 = stage1_growth(df[f'fwd_12mproj_{eps}_eps'].to_numpy(),
+                       df[f'12m_{eps}_eps'].to_numpy(),
+                       g_t, inflation, bounds)
+    r = implied_return(df['price'].to_numpy(),
+                       df['12m_div_ps'].to_numpy(),
+                       g1, g_t, years)
+    return pl.DataFrame(
+        {'yr_qtr': df['yr_qtr'],
+         f'{eps}_growth': 100 * g1,
+         f'{eps}_return': 100 * r},
+        nan_to_null= True)\
+             .with_columns((pl.col(f'{eps}_return') -
+                            df['real_int_rate'])
+                              .alias(f'{eps}_erp'))\
+             .cast({pl.Float64: pl.Float32})
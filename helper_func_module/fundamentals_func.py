@@ -0,0 +1,57 @@
+'''
+   these are functions for the fundamentals of the S&P 500, from the
+   quarterly dividends, sales, book value, capital expenditures, and
+   divisor of the history file, page 15
+
+   cols, for each yr_qtr
+        12m_sales_ps, 12m_capex_ps  sums over the trailing 4 quarters
+        div_yield           100 * 12m_div_ps / price
+        div_premium         div_yield, less real_int_rate
+        payout_op,          100 * 12m_div_ps / 12m eps
+        payout_rep
+        price_to_book       price / bk_val_ps
+        capex_intensity     100 * 12m_capex_ps / 12m_sales_ps
+        share_growth        100 * change of the divisor over 4 quarters,
+                            in percent, a proxy for the growth of the
+                            number of shares, net of buybacks
+   a col is null where the history lacks an input, sales and book
+   value begin in 2000, capex in 2010
+
+   access these functions in other modules by
+        from helper_func_module import fundamentals_func as fd
+'''
+import polars as pl
+
+
+FUNDAMENTAL_COLS = ['sales_ps', 'bk_val_ps', 'capex_ps', 'divisor']
+
+
+def fundamentals(lf):
+    '''
+        lf: history, one row per quarter, sorted by yr_qtr, with
+            price, real_int_rate, 12m_op_eps, 12m_rep_eps,
+            12m_div_ps, and FUNDAMENTAL_COLS
+        return lf with the cols described above added
+    '''
+    return lf.with_columns(pl.col('sales_ps').rolling_sum(4)
+                             .alias('12m_sales_ps'),
+                           pl.col('capex_ps').rolling_sum(4)
+                             .alias('12m_capex_ps'),
+                           (pl.col('12m_div_ps') * 100 /
+                            pl.col('price'))
+                             .alias('div_yield'),
+                           *[(pl.col('12m_div_ps') * 100 /
+                              pl.col(f'12m_{eps}_eps'))
+                               .alias(f'payout_{eps}')
+                             for eps in ['op', 'rep']],
+                           (pl.col('price') / pl.col('bk_val_ps'))
+                             .alias('price_to_book'),
+                           ((pl.col('divisor') /
+                             pl.col('divisor').shift(4) - 1) * 100)
+                             .alias('share_growth'))\
+             .with_columns((pl.col('div_yield') -
+                            pl.col('real_int_rate'))
+                             .alias('div_premium'),
+                           (pl.col('12m_capex_ps') * 100 /
+                            pl.col('12m_sales_ps'))
+                             .alias('capex_intensity'))
@@ -8,7 +8,6 @@
 import sys
 from datetime import datetime
 
-import openpyxl.utils.cell as ut_cell
 import polars as pl
 
 
@@ -161,6 +160,9 @@ def find_key_col(wksht, search_row, start_col= 1, key_value= None):
             col A is 1, not 0.
         return number of col: col.value matches key_value
     '''
+    # imported here, the date functions of this module
+    # do not load openpyxl, see nowcast_data.py
+    import openpyxl.utils.cell as ut_cell
     
     # cap the number of rows to read
     max_to_read = wksht.max_column
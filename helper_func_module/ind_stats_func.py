@@ -0,0 +1,155 @@
+'''
+   these are functions for the cross-sectional statistics of the
+   industries' P/Es, page 4
+
+   stats file, one row for each measure, year, and industry
+        measure             op_pe or rep_pe
+        year, actual        actual is false for years of estimates
+        industry, pe
+      the cross section of the industries in year
+        median, q1, q3, iqr
+        dispersion          iqr / |median|
+      the industry against its own history, all years in the file
+        z                   (pe - mean) / standard deviation
+        pct                 percentile rank, as PERCENT_RANK in sqlite,
+                            null for an industry with one year
+      the industry against the S&P 500
+        sp500_pe            the S&P 500's pe in year
+        rel_pe              pe / sp500_pe
+        rel_z, rel_pct      z and pct of rel_pe
+
+   stats_lf() computes every col in one lazy plan, windows over
+   (measure, year) and (measure, industry) of one tall frame,
+   collected once at update time; the displays and analytics.sqlite
+   read the stats file
+
+   access these functions in other modules by
+        from helper_func_module import ind_stats_func as xs
+'''
+import polars as pl
+import polars.selectors as cs
+
+from helper_func_module import backup_func as bf
+
+
+MEASURES = ['op_pe', 'rep_pe']
+KEYS = ['measure', 'year', 'industry']
+
+
+def history(col, over):
+    '''
+        return exprs, z and percentile rank of col within over
+    '''
+    count = pl.col(col).count().over(over)
+    # null, not nan, for an industry with one year
+    return ((pl.col(col) - pl.col(col).mean().over(over)) /
+            pl.col(col).std().over(over),
+            pl.when(count > 1)
+              .then((pl.col(col).rank('min').over(over) - 1) * 100 /
+                    (count - 1)))
+
+
+def cross_section(lf, over):
+    '''
+        return lf with median, q1, q3, iqr, and dispersion
+        of pe within over
+    '''
+    return lf.with_columns(pl.col('pe').median().over(over)
+                             .alias('median'),
+                           pl.col('pe').quantile(0.25, 'linear')
+                             .over(over)
+                             .alias('q1'),
+                           pl.col('pe').quantile(0.75, 'linear')
+                             .over(over)
+                             .alias('q3'))\
+             .with_columns((pl.col('q3') - pl.col('q1'))
+                             .alias('iqr'))\
+             .with_columns((pl.col('iqr') / pl.col('median').abs())
+                             .alias('dispersion'))
+
+
+def stats_lf(ind_lf):
+    '''
+        ind_lf: the industry file
+        return LazyFrame of the stats file
+    '''
+    by_year = ['measure', 'year']
+    by_ind = ['measure', 'industry']
+    z, pct = history('pe', by_ind)
+    rel_z, rel_pct = history('rel_pe', by_ind)
+
+    return ind_lf.select('year',
+                         pl.col('SP500_rep_eps').is_not_null()
+                           .alias('actual'),
+                         cs.ends_with(*[f'_{measure}'
+                                        for measure in MEASURES]))\
+                 .unpivot(index= ['year', 'actual'],
+                          value_name= 'pe')\
+                 .with_columns(pl.col('variable')
+                                 .str.extract_groups(
+                                     r'^(?<industry>.+)_(?<measure>(?:' +
+                                     '|'.join(MEASURES) + r'))$')
+                                 .struct.unnest())\
+                 .with_columns(pl.col('pe')
+                                 .filter(pl.col('industry') == 'SP500')
+                                 .first()
+                                 .over(by_year)
+                                 .alias('sp500_pe'))\
+                 .filter(pl.col('industry') != 'SP500',
+                         pl.col('pe').is_not_null())\
+                 .with_columns((pl.col('pe') / pl.col('sp500_pe'))
+                                 .alias('rel_pe'),
+                               z.alias('z'),
+                               pct.alias('pct'))\
+                 .pipe(cross_section, by_year)\
+                 .with_columns(rel_z.alias('rel_z'),
+                               rel_pct.alias('rel_pct'))\
+                 .select(*KEYS, 'actual', 'pe',
+                         'median', 'q1', 'q3', 'iqr', 'dispersion',
+                         'z', 'pct',
+                         'sp500_pe', 'rel_pe', 'rel_z', 'rel_pct')\
+                 .sort(by= KEYS)\
+                 .cast({cs.float(): pl.Float32})
+
+
+def write(src):
+    '''
+        src: Generation whose industry file is complete,
+             ordinarily the staged generation
+        write the stats of src to src.OUTPUT_IND_STATS_ADDR
+    '''
+    df = stats_lf(pl.scan_parquet(src.OUTPUT_IND_ADDR)).collect()
+    bf.write_replace(src.OUTPUT_IND_STATS_ADDR, df.write_parquet)
+
+    print('\n============================================')
+    print(f'Wrote industry statistics, {df.height} rows, to: '
+          f'\n{src.OUTPUT_IND_STATS_ADDR}')
+    print('============================================\n')
+    return
+
+
+def read(src):
+    '''
+        return LazyFrame of the stats file of src,
+        computed from the industry file if src has none
+    '''
+    if src.OUTPUT_IND_STATS_ADDR.exists():
+        return pl.scan_parquet(src.OUTPUT_IND_STATS_ADDR)
+    return stats_lf(pl.scan_parquet(src.OUTPUT_IND_ADDR))
+
+
+def by_year(stats_lf, measure, industries= None):
+    '''
+        return LazyFrame, one row for each year, sorted by year
+        cols: year, actual, median, q1, q3, iqr, dispersion
+        industries: list, the cross section of these industries
+            instead of all in the file, or None
+    '''
+    lf = stats_lf.filter(pl.col('measure') == measure)
+    if industries is not None:
+        lf = lf.filter(pl.col('industry').is_in(industries))\
+               .pipe(cross_section, 'year')
+    return lf.group_by('year')\
+             .agg(pl.col('actual', 'median', 'q1', 'q3',
+                         'iqr', 'dispersion').first())\
+             .sort(by= 'year')
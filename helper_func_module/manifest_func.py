@@ -0,0 +1,200 @@
+'''
+   these are functions for the file manifest, an embedded sqlite
+   database that records every S&P input file that update_data.py
+   has seen, replacing the lists in record_dict.json
+
+   table files: one row per input file, rows are only inserted
+        file    name of the workbook (primary key)
+        date    date in the file's name, 'yyyy-mm-dd'
+        yr_qtr  quarter of date, 'yyyy-Qq'
+   indexes on date and on (yr_qtr, date) make membership,
+        latest-per-quarter, and latest-file queries O(log n)
+   table sources: urls of the S&P and FRED data
+
+   the files "used" for projections are the latest file
+   in each quarter, prev_used_files in record_dict.json
+
+   export_record_dict() recreates the format of record_dict.json
+
+   access these functions in other modules by
+        from helper_func_module import manifest_func as mf
+'''
+import json
+import sqlite3
+
+from helper_func_module import helper_func as hp
+from helper_func_module import backup_func as bf
+
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS files (
+        file    TEXT PRIMARY KEY,
+        date    TEXT NOT NULL,
+        yr_qtr  TEXT NOT NULL);
+    CREATE INDEX IF NOT EXISTS files_date ON files (date);
+    CREATE INDEX IF NOT EXISTS files_yr_qtr_date ON files (yr_qtr, date);
+    CREATE TABLE IF NOT EXISTS sources (
+        name    TEXT PRIMARY KEY,
+        url     TEXT NOT NULL);
+'''
+
+
+def new():
+    '''
+        return an empty manifest, held in memory
+    '''
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def open_read(address):
+    '''
+        return a read-only connection to the manifest at address
+    '''
+    return sqlite3.connect(f'{address.as_uri()}?mode=ro', uri= True)
+
+
+def load(address):
+    '''
+        return a copy, held in memory, of the manifest at address
+    '''
+    conn = new()
+    f = open_read(address)
+    f.backup(conn)
+    f.close()
+    return conn
+
+
+def save(conn, address):
+    '''
+        write the manifest to a new file at address
+    '''
+    # backup() waits while conn holds an open transaction
+    conn.commit()
+    address.unlink(missing_ok= True)
+    f = sqlite3.connect(address)
+    conn.backup(f)
+    f.close()
+    return
+
+
+def from_record_dict(record_dict):
+    '''
+        return a manifest that contains the files listed in
+        record_dict, the format of record_dict.json
+    '''
+    conn = new()
+    add_files(conn, record_dict['prev_files'])
+    set_sources(conn, record_dict['sources'])
+    return conn
+
+
+def migrate(env):
+    '''
+        if there is no manifest, but there is a record_dict.json
+        written before the manifest existed, create the manifest
+        from record_dict.json
+    '''
+    if env.MANIFEST_ADDR.exists() or not env.RECORD_DICT_ADDR.exists():
+        return
+    with open(env.RECORD_DICT_ADDR, 'r') as f:
+        save(from_record_dict(json.load(f)), env.MANIFEST_ADDR)
+    print('\n============================================')
+    print(f'Converted record_dict from: \n{env.RECORD_DICT_ADDR}')
+    print(f'to manifest: \n{env.MANIFEST_ADDR}')
+    print('============================================\n')
+    return
+
+
+def add_files(conn, files):
+    '''
+        insert the files not yet in the manifest
+    '''
+    files = list(files)
+    dates = hp.string_to_date(files)
+    yr_qtrs = hp.date_to_year_qtr(dates)
+    conn.executemany('INSERT OR IGNORE INTO files VALUES (?, ?, ?)',
+                     zip(files,
+                         [str(date) for date in dates],
+                         yr_qtrs))
+    return
+
+
+def set_sources(conn, sources):
+    conn.executemany('INSERT OR REPLACE INTO sources VALUES (?, ?)',
+                     sources.items())
+    return
+
+
+def known_files(conn, files):
+    '''
+        return the subset of files that are in the manifest
+    '''
+    return {row[0] for row in
+            conn.execute('SELECT file FROM files WHERE file IN '
+                         '(SELECT value FROM json_each(?))',
+                         (json.dumps(list(files)),))}
+
+
+def latest_files(conn, yr_qtrs= None):
+    '''
+        return list of dicts, newest first,
+            keys: 'yr_qtr', 'file', 'date'
+        one dict for the latest file in each quarter
+        restrict to quarters in yr_qtrs if it is not None
+    '''
+    query = '''
+        SELECT yr_qtr, file, MAX(date) FROM files
+        {where}
+        GROUP BY yr_qtr
+        ORDER BY yr_qtr DESC'''
+    if yr_qtrs is None:
+        rows = conn.execute(query.format(where= ''))
+    else:
+        rows = conn.execute(
+            query.format(where= 'WHERE yr_qtr IN '
+                                '(SELECT value FROM json_each(?))'),
+            (json.dumps(list(yr_qtrs)),))
+    return [{'yr_qtr': yr_qtr, 'file': file, 'date': date}
+            for yr_qtr, file, date in rows]
+
+
+def all_files(conn):
+    '''
+        return list of the names of all files, oldest first
+    '''
+    return [row[0] for row in conn.execute(
+        'SELECT file FROM files ORDER BY date')]
+
+
+def latest_used_file(conn):
+    '''
+        return the name of the latest file, None if there is none
+    '''
+    row = conn.execute(
+        'SELECT file FROM files ORDER BY date DESC LIMIT 1').fetchone()
+    return None if row is None else row[0]
+
+
+def export_record_dict(conn):
+    '''
+        return dict in the format of record_dict.json
+    '''
+    return {'sources': dict(conn.execute(
+                'SELECT name, url FROM sources ORDER BY name')),
+            'latest_used_file': latest_used_file(conn) or "",
+            'prev_used_files': latest_files(conn),
+            'prev_files': [row[0] for row in conn.execute(
+                'SELECT file FROM files ORDER BY file DESC')]}
+
+
+def export_json(conn, address):
+    '''
+        write the manifest to address in the format of record_dict.json
+    '''
+    record_dict = export_record_dict(conn)
+    bf.write_replace(address,
+                     lambda f: json.dump(record_dict, f, indent= 4),
+                     mode= 'w')
+    return
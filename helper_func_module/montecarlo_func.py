@@ -0,0 +1,97 @@
+'''
+   these are functions for the simulated distribution of the
+   forward equity premium, page 8
+
+   for each yr_qtr, the forward equity premium of page 3 is
+        100 * fwd eps / price - real_int_rate
+   a draw replaces
+        fwd eps         with fwd eps * exp(error), error drawn from
+                        the log errors of past projections, the
+                        12m eps realized over the 4 quarters projected
+                        relative to the projection
+        real_int_rate   with real_int_rate + change, change drawn
+                        from the changes of real_int_rate over 4
+                        quarters in the history
+   the same draws apply to every yr_qtr, so that all yr_qtrs are
+   computed at once, as numpy arrays, yr_qtr x draw
+
+   access these functions in other modules by
+        from helper_func_module import montecarlo_func as mc
+'''
+import numpy as np
+import polars as pl
+
+
+def projection_errors(df, eps):
+    '''
+        df: derived measures for all yr_qtrs, sorted by yr_qtr,
+            see derived_func.py
+        eps: 'op' or 'rep'
+        return array, log of realized 12m eps relative to the
+        12m fwd eps projected in each yr_qtr, for the yr_qtrs
+        whose 4 projected quarters are in the history
+    '''
+    # the 12m eps 3 quarters after yr_qtr sums yr_qtr's 4 projected qtrs
+    return df.select((pl.col(f'12m_{eps}_eps').shift(-3) /
+                      pl.col(f'fwd_12mproj_{eps}_eps'))
+                       .cast(pl.Float64)
+                       .log()
+                       .alias('error'))\
+             .drop_nulls()\
+             .filter(pl.col('error').is_finite())\
+             .to_series()\
+             .to_numpy()
+
+
+def rate_changes(df, horizon= 4):
+    '''
+        df: history, sorted by yr_qtr
+        return array of the changes in real_int_rate
+        over horizon quarters
+    '''
+    return df.select((pl.col('real_int_rate').shift(-horizon) -
+                      pl.col('real_int_rate'))
+                       .cast(pl.Float64)
+                       .alias('change'))\
+             .drop_nulls()\
+             .to_series()\
+             .to_numpy()
+
+
+def premium_draws(fwd_eps, price, real_rate, errors, changes,
+                  n_draws, rng):
+    '''
+        fwd_eps, price, real_rate: arrays, one value per yr_qtr
+        errors, changes: arrays, see projection_errors()
+            and rate_changes()
+        rng: numpy Generator
+        return array of draws of the forward equity premium,
+        yr_qtr x draw
+    '''
+    # with no history of errors or changes, draw 0
+    errors = errors if len(errors) else np.zeros(1)
+    changes = changes if len(changes) else np.zeros(1)
+    eps_factor = np.exp(rng.choice(errors, size= n_draws))\
+                   .astype(np.float32)
+    rate_draw = rng.choice(changes, size= n_draws)\
+                   .astype(np.float32)
+
+    yld = (100 * np.asarray(fwd_eps, dtype= np.float32) /
+                 np.asarray(price, dtype= np.float32))
+    rate = np.asarray(real_rate, dtype= np.float32)
+    return yld[:, np.newaxis] * eps_factor - \
+           (rate[:, np.newaxis] + rate_draw)
+
+
+def quantile_df(yr_qtrs, draws, quantiles):
+    '''
+        draws: yr_qtr x draw, see premium_draws()
+        return df, cols: yr_qtr, and a col for each quantile,
+        named 'q05' for 0.05
+    '''
+    bands = np.quantile(draws, quantiles, axis= 1)
+    return pl.DataFrame(
+        {'yr_qtr': list(yr_qtrs),
+         **{f'q{round(q * 100):02d}': band
+            for q, band in zip(quantiles, bands)}})\
+             .cast({pl.Float64: pl.Float32})
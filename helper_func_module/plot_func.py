@@ -1,3 +1,4 @@
+import numpy as np
 import polars as pl
 
 def plots_page0(ax, df,
@@ -148,10 +149,13 @@ def plots_page2(ax, df,
                 title = None,
                 xlabl = None,
                 ylabl = None,
-                hrzntl_vals = None):
+                hrzntl_vals = None,
+                regime = None):
     """
         show simple line plots
         with dotted, light lines at specified hrzntl_vals
+        regime: df, yr_qtr and the segment means of the series,
+            shown as steps, or None
     """
     
     # create the title and labels for the plot
@@ -165,6 +169,8 @@ def plots_page2(ax, df,
     # series name and plot it
     name = list(df.columns)[-1:]
     ax.plot(yq, df.select(name))
+    if regime is not None:
+        plot_regime(ax, regime)
                 
     # axis titles, tick labels, and legend
     ax.set_ylim(ylim)
@@ -196,10 +202,13 @@ def plots_page3(ax, df,
                 title = None,
                 xlabl = None,
                 ylabl = None,
-                hrzntl_vals = None):
+                hrzntl_vals = None,
+                regime = None):
     """
         show simple line plots
         with dotted, light lines at specified hrzntl_vals
+        regime: df, yr_qtr and the segment means of a series,
+            shown as steps, or None
     """
     
      # create the title and labels for the plot
@@ -223,6 +232,142 @@ def plots_page3(ax, df,
             ax.plot(yq, df.select(name),
                     label= name,
                     linestyle= 'dotted')
+    if regime is not None:
+        plot_regime(ax, regime)
+                
+    # axis titles, tick labels, and legend
+    ax.set_ylim(ylim)
+
+    # the 1st arg gets locs for the labels
+    # the 2nd arg specs the labels for these locs             
+    ax.set_yticks(ax.get_yticks(), ax.get_yticklabels(), 
+                  fontsize= 8)
+    ax.set_xticks(ax.get_xticks(), x_tick_labels, 
+                  rotation= 90, fontsize= 8)
+    
+    ax0 = ax.twinx()
+    ax0.set_ylim(ax.get_ylim())
+    ax0.set_yticks(ax.get_yticks(), ax.get_yticklabels(),
+                   fontsize= 8)
+    ax0.set_ylabel(' ') #creates a space on the right side
+    
+    ax.legend(fontsize= 9,
+              loc= 'upper right')
+    
+    for val in hrzntl_vals:
+        ax.hlines(y=val, color='lightgray',
+              xmin= min(yq),
+              xmax= max(yq),
+              linestyle= 'dotted')
+    return ax
+
+
+def plot_regime(ax, regime):
+    '''
+        show the segment means in the 2nd col of regime as steps,
+        against the yr_qtrs in its first col
+    '''
+    ax.plot(regime['yr_qtr'].to_list(), regime[:, 1],
+            color= 'tab:red',
+            linewidth= 1,
+            drawstyle= 'steps-mid',
+            label= 'mean of regime')
+    ax.legend(fontsize= 9,
+              loc= 'upper right')
+    return ax
+
+
+def plots_page7(ax, df,
+                title = None,
+                xlabl = None,
+                ylabl = None,
+                cbar_labl = None,
+                contour_vals = None,
+                hrzntl_vals = None):
+    """
+        show a heatmap, with contours at contour_vals
+        the y axis values are the growth rates in the first col of df
+        the x axis labels are the names of the subsequent cols of df
+        with dotted, light lines at specified hrzntl_vals
+    """
+    
+    # create the title and labels for the plot
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    yq = list(df.columns)[1:]
+    x_tick_labels = [item if item[-1:] == '1' else item[-2:]
+                     for item in yq]
+    x = np.arange(len(yq))
+    y = df[:, 0].to_numpy() * 100
+    values = df.select(yq).to_numpy()
+    
+    mesh = ax.pcolormesh(x, y, values,
+                         shading= 'nearest',
+                         cmap= 'viridis')
+    ax.figure.colorbar(mesh, ax= ax, label= cbar_labl)
+    if contour_vals:
+        lines = ax.contour(x, y, values,
+                           levels= contour_vals,
+                           colors= 'white',
+                           linewidths= 0.8)
+        ax.clabel(lines, fontsize= 7, fmt= '%g')
+    
+    ax.set_yticks(ax.get_yticks(), ax.get_yticklabels(), 
+                  fontsize= 8)
+    ax.set_ylim(y.min(), y.max())
+    ax.set_xticks(x, x_tick_labels, 
+                  rotation= 90, fontsize= 8)
+    
+    for val in hrzntl_vals or []:
+        ax.hlines(y= val, color= 'lightgray',
+                  xmin= x.min(),
+                  xmax= x.max(),
+                  linestyle= 'dotted')
+    return ax
+
+
+def plots_page8(ax, df,
+                ylim= (None, None),
+                title = None,
+                xlabl = None,
+                ylabl = None,
+                hrzntl_vals = None):
+    """
+        show the quantile bands of a distribution
+        the x axis labels are strings in the first col of df
+        the 2nd col is the point estimate, a dashed line
+        the remaining cols are quantiles, in ascending order,
+        shaded in pairs from the outside in, the middle col is a line
+        with dotted, light lines at specified hrzntl_vals
+    """
+    
+    # create the title and labels for the plot
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    # prepare labels for the horizontal axis
+    [yq, x_tick_labels] = yq_and_ticklabels(df)
+    
+    point = list(df.columns)[1]
+    bands = list(df.columns)[2:]
+    for idx in range(len(bands) // 2):
+        low, high = bands[idx], bands[-idx - 1]
+        ax.fill_between(yq, df[low], df[high],
+                        color= 'tab:blue',
+                        alpha= 0.2 + 0.2 * idx,
+                        linewidth= 0,
+                        label= f'{low} to {high}')
+    if len(bands) % 2:
+        ax.plot(yq, df.select(bands[len(bands) // 2]),
+                color= 'tab:blue',
+                label= bands[len(bands) // 2])
+    ax.plot(yq, df.select(point),
+            color= 'black',
+            linestyle= 'dashed',
+            label= point)
                 
     # axis titles, tick labels, and legend
     ax.set_ylim(ylim)
@@ -251,6 +396,201 @@ def plots_page3(ax, df,
     return ax
 
 
+def plots_page9_horizon(ax, df,
+                        title = None,
+                        xlabl = None,
+                        ylabl = None):
+    """
+        show grouped bars
+        the groups are the values in the first col of df
+        the bars of each group are the subsequent cols of df
+    """
+    
+    # create the title and labels for the plot
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    groups = df[:, 0].to_list()
+    names = list(df.columns)[1:]
+    x = np.arange(len(groups))
+    width = 0.8 / len(names)
+    for idx, name in enumerate(names):
+        ax.bar(x + (idx - (len(names) - 1) / 2) * width,
+               df[name],
+               width= width,
+               label= name)
+    
+    ax.set_yticks(ax.get_yticks(), ax.get_yticklabels(), 
+                  fontsize= 8)
+    ax.set_xticks(x, groups, fontsize= 8)
+    ax.axhline(y= 0, color= 'gray', linewidth= 0.8)
+    
+    ax.legend(fontsize= 8,
+              loc= 'upper right')
+    return ax
+
+
+def plots_page9_rolling(ax, df,
+                        ylim= (None, None),
+                        title = None,
+                        xlabl = None,
+                        ylabl = None):
+    """
+        show a line plot for each col of df after the first
+        the x axis labels are strings in the first col of df
+    """
+    
+    # create the title and labels for the plot
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    # prepare labels for the horizontal axis
+    [yq, x_tick_labels] = yq_and_ticklabels(df)
+    
+    for name in list(df.columns)[1:]:
+        ax.plot(yq, df.select(name),
+                label= name)
+                
+    # axis titles, tick labels, and legend
+    ax.set_ylim(ylim)
+
+    # the 1st arg gets locs for the labels
+    # the 2nd arg specs the labels for these locs             
+    ax.set_yticks(ax.get_yticks(), ax.get_yticklabels(), 
+                  fontsize= 8)
+    ax.set_xticks(ax.get_xticks(), x_tick_labels, 
+                  rotation= 90, fontsize= 8)
+    
+    ax0 = ax.twinx()
+    ax0.set_ylim(ax.get_ylim())
+    ax0.set_yticks(ax.get_yticks(), ax.get_yticklabels(),
+                   fontsize= 8)
+    ax0.set_ylabel(' ') #creates a space on the right side
+    
+    ax.legend(fontsize= 8,
+              loc= 'upper right')
+    return ax
+
+
+def plots_page10(ax, df,
+                  title = None,
+                  xlabl = None,
+                  ylabl = None,
+                  hrzntl_vals = None):
+    """
+        show a line plot for each col of df after the first
+        the x axis is the dates in the first col of df
+        with dotted, light lines at specified hrzntl_vals
+    """
+    
+    # create the title and labels for the plot
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    dates = df[:, 0].to_list()
+    for name in list(df.columns)[1:]:
+        ax.plot(dates, df[name],
+                marker= '.' if len(dates) < 20 else None,
+                label= name)
+    
+    ax.tick_params(axis= 'both', labelsize= 8)
+    ax.tick_params(axis= 'x', labelrotation= 90)
+    
+    ax.legend(fontsize= 8,
+              loc= 'upper left')
+    
+    for val in hrzntl_vals or []:
+        ax.axhline(y= val, color= 'lightgray',
+                   linestyle= 'dotted')
+    return ax
+
+
+def plots_page11(ax, df,
+                  title = None,
+                  xlabl = None,
+                  ylabl = None,
+                  hrzntl_vals = None):
+    """
+        show a line plot for each col of df after the first
+        the x axis labels are strings in the first col of df,
+        the years of the first quarters
+        with dotted, light lines at specified hrzntl_vals
+    """
+    
+    # create the title and labels for the plot
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    yq = df['yr_qtr'].to_list()
+    for name in list(df.columns)[1:]:
+        ax.plot(yq, df.select(name),
+                label= name)
+    
+    # before the twin axis copies the limits of ax
+    for val in hrzntl_vals or []:
+        ax.hlines(y=val, color='lightgray',
+              xmin= 0,
+              xmax= len(yq) - 1,
+              linestyle= 'dotted')
+    
+    ticks = [idx for idx, item in enumerate(yq)
+             if item[-1:] == '1']
+    ax.tick_params(axis= 'y', labelsize= 8)
+    ax.set_xticks(ticks, [yq[idx][:4] for idx in ticks], 
+                  rotation= 90, fontsize= 8)
+    
+    ax0 = ax.twinx()
+    ax0.set_ylim(ax.get_ylim())
+    ax0.tick_params(axis= 'y', labelsize= 8)
+    ax0.set_ylabel(' ') #creates a space on the right side
+    
+    ax.legend(fontsize= 8,
+              loc= 'upper right')
+    return ax
+
+
+def plots_page14(ax, values, windows, yq,
+                 title = None,
+                 xlabl = None,
+                 ylabl = None,
+                 cbar_labl = None):
+    """
+        show values, an array window x quarter, as a heatmap
+        centered at 0, the rows are windows, the cols are yq
+        nan, a window that is not full, is blank
+    """
+    
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_xlabel(xlabl, fontweight= 'bold')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    limit = np.nanmax(np.abs(values))
+    image = ax.imshow(values,
+                      cmap= 'RdBu',
+                      vmin= -limit, vmax= limit,
+                      aspect= 'auto',
+                      origin= 'lower',
+                      interpolation= 'nearest')
+    
+    ticks = [idx for idx, item in enumerate(yq)
+             if item[-1:] == '1']
+    ax.set_xticks(ticks, [yq[idx][:4] for idx in ticks], 
+                  rotation= 90, fontsize= 8)
+    rows = [idx for idx, window in enumerate(windows)
+            if window % 10 == 0]
+    ax.set_yticks(rows, [windows[idx] for idx in rows], 
+                  fontsize= 8)
+    
+    cbar = ax.figure.colorbar(image, ax= ax, shrink= 0.8)
+    cbar.ax.tick_params(labelsize= 8)
+    cbar.set_label(cbar_labl, fontsize= 8)
+    return ax
+
+
 def yq_and_ticklabels(df):
     '''
         input a series of str in col yr_qtr of df
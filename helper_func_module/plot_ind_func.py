@@ -1,3 +1,4 @@
+import numpy as np
 import polars as pl
 
 def plots_page4(ax, df,
@@ -86,3 +87,58 @@ def plots_page4(ax, df,
     '''
     
     return ax
+
+
+def plots_page13(ax, start, steps, labels,
+                 title= None,
+                 start_label= None,
+                 end_label= None,
+                 ylabl= None,
+                 fmt= '{:.1f}'):
+    '''
+        A helper function to show a waterfall
+        the first bar is start, each of steps is a bar that
+            begins where the one before ends,
+            green if it rises, red if it falls,
+            the last bar is start plus the sum of steps
+        the y axis shows the range of the levels, not 0
+        labels: the names of steps
+    '''
+    
+    ax.set_title(title, fontweight= 'bold', loc= 'left')
+    ax.set_ylabel(ylabl, fontweight= 'bold')
+    
+    ends = start + np.cumsum(steps)
+    bottoms = np.concatenate(([start], ends[:-1]))
+    end = ends[-1] if len(ends) else start
+    names = [start_label] + list(labels) + [end_label]
+    positions = np.arange(len(names))
+    
+    ax.bar(positions[0], start, color= 'grey', width= 0.6)
+    ax.bar(positions[1:-1], steps, bottom= bottoms,
+           color= np.where(np.asarray(steps) >= 0, 
+                           'tab:green', 'tab:red'),
+           width= 0.6)
+    ax.bar(positions[-1], end, color= 'grey', width= 0.6)
+    
+    # connect the top of each bar to the next bar
+    levels = np.concatenate(([start], ends))
+    ax.hlines(levels, positions[:-1] - 0.3, positions[1:] + 0.3,
+              color= 'lightgrey', linestyle= 'dotted', linewidth= 1)
+    
+    for pos, value, top in zip(positions,
+                               [start, *steps, end],
+                               [start, *np.maximum(bottoms, ends), end]):
+        ax.annotate(fmt.format(value), (pos, top),
+                    xytext= (0, 2), textcoords= 'offset points',
+                    ha= 'center', fontsize= 7)
+    
+    # the changes are small relative to the levels: show the
+    # range of the levels, not the bars' full height from 0
+    low, high = levels.min(), levels.max()
+    pad = max(high - low, abs(high) * 0.01) * 0.4
+    ax.set_ylim(low - pad, high + pad)
+    ax.set_xticks(positions, names, rotation= 45, ha= 'right',
+                  fontsize= 8)
+    
+    return ax
@@ -0,0 +1,123 @@
+'''
+   these are functions that stage and publish the outputs of an update
+   and that resolve which outputs the display scripts read
+
+   update_data.py writes its outputs to a new, hidden staging dir
+   in snapshot_dir/generations/ (see snapshot_func.py), then
+   publishes the whole set with one atomic rename of HEAD
+   a reader resolves HEAD once per run and reads every file
+   from that generation, so it never sees a missing, partly
+   written, or mismatched set of files, without using locks
+
+   the files in output_dir/ and the file manifest are refreshed
+   from HEAD after each publish or rollback, for other programs
+
+   access these functions in other modules by
+        from helper_func_module import publish_func as pb
+'''
+from pathlib import Path
+from dataclasses import dataclass
+
+from helper_func_module import backup_func as bf
+from helper_func_module import snapshot_func as sf
+
+
+@dataclass(frozen= True)
+class Generation:
+    # addresses of the files in one generation
+    # GEN_ID is None for the files in output_dir/ when
+    # snapshot_dir/ has no HEAD
+    GEN_ID: str | None
+    MANIFEST_ADDR: Path
+    # record_dict.json, read only if there is no manifest
+    RECORD_DICT_ADDR: Path
+    OUTPUT_HIST_ADDR: Path
+    OUTPUT_IND_ADDR: Path
+    OUTPUT_PROJ_ADDR: Path
+    OUTPUT_DERIVED_ADDR: Path
+    OUTPUT_ACCURACY_ADDR: Path
+    OUTPUT_VINTAGE_ADDR: Path
+    OUTPUT_IND_CORR_ADDR: Path
+    OUTPUT_IND_STATS_ADDR: Path
+    OUTPUT_IND_DECOMP_ADDR: Path
+
+
+def locations(env, gen_id, gen_dir):
+    return Generation(GEN_ID= gen_id,
+                      MANIFEST_ADDR= gen_dir / env.MANIFEST_FILE,
+                      RECORD_DICT_ADDR= gen_dir / env.RECORD_DICT_FILE,
+                      OUTPUT_HIST_ADDR= gen_dir / env.OUTPUT_HIST_FILE,
+                      OUTPUT_IND_ADDR= gen_dir / env.OUTPUT_IND_FILE,
+                      OUTPUT_PROJ_ADDR= gen_dir / env.OUTPUT_PROJ_FILE,
+                      OUTPUT_DERIVED_ADDR= gen_dir / env.OUTPUT_DERIVED_FILE,
+                      OUTPUT_ACCURACY_ADDR= gen_dir / env.OUTPUT_ACCURACY_FILE,
+                      OUTPUT_VINTAGE_ADDR= gen_dir / env.OUTPUT_VINTAGE_FILE,
+                      OUTPUT_IND_CORR_ADDR= gen_dir / env.OUTPUT_IND_CORR_FILE,
+                      OUTPUT_IND_STATS_ADDR= gen_dir / env.OUTPUT_IND_STATS_FILE,
+                      OUTPUT_IND_DECOMP_ADDR= gen_dir / env.OUTPUT_IND_DECOMP_FILE)
+
+
+def resolve(env):
+    '''
+        return Generation for HEAD
+        if there is no HEAD, return Generation for the files
+        in output_dir/ and the file manifest
+    '''
+
+    gen_id = sf.head(env)
+    if gen_id is None:
+        return Generation(GEN_ID= None,
+                          MANIFEST_ADDR= env.MANIFEST_ADDR,
+                          RECORD_DICT_ADDR= env.RECORD_DICT_ADDR,
+                          OUTPUT_HIST_ADDR= env.OUTPUT_HIST_ADDR,
+                          OUTPUT_IND_ADDR= env.OUTPUT_IND_ADDR,
+                          OUTPUT_PROJ_ADDR= env.OUTPUT_PROJ_ADDR,
+                          OUTPUT_DERIVED_ADDR= env.OUTPUT_DERIVED_ADDR,
+                          OUTPUT_ACCURACY_ADDR= env.OUTPUT_ACCURACY_ADDR,
+                          OUTPUT_VINTAGE_ADDR= env.OUTPUT_VINTAGE_ADDR,
+                          OUTPUT_IND_CORR_ADDR= env.OUTPUT_IND_CORR_ADDR,
+                          OUTPUT_IND_STATS_ADDR= env.OUTPUT_IND_STATS_ADDR,
+                          OUTPUT_IND_DECOMP_ADDR= env.OUTPUT_IND_DECOMP_ADDR)
+    return locations(env, gen_id, env.SNAPSHOT_GEN_DIR / gen_id)
+
+
+def stage(env):
+    '''
+        return Generation for a new, empty staging dir
+        no reader can see the staged files until publish()
+    '''
+
+    gen_id = sf.new_gen_id()
+    return locations(env, gen_id, sf.staging_dir(env, gen_id))
+
+
+def restage(env, gen_id):
+    '''
+        return Generation for the existing staging dir of gen_id,
+        to resume an update that stopped before publish()
+    '''
+
+    return locations(env, gen_id,
+                     bf.tmp_address(env.SNAPSHOT_GEN_DIR / gen_id))
+
+
+def publish(env, staged, src, label= ''):
+    '''
+        staged: Generation returned by stage()
+        src: Generation returned by resolve() before the update
+        the update has fsynced the files that it staged
+        carry forward from src any file the update did not stage,
+        and fsync it, make the files the HEAD generation,
+        then refresh the files in output_dir/
+    '''
+
+    for name in ('MANIFEST_ADDR', 'OUTPUT_HIST_ADDR',
+                 'OUTPUT_IND_ADDR', 'OUTPUT_PROJ_ADDR'):
+        new, old = getattr(staged, name), getattr(src, name)
+        if not new.exists() and old.exists():
+            bf.snapshot(old, new)
+            bf.fsync(new)
+
+    sf.add_generation(env, staged.GEN_ID, label)
+    sf.mirror(env, staged.GEN_ID)
+    return
@@ -0,0 +1,116 @@
+'''
+   these are functions for the rolling regressions of the earnings
+   yields on the TIPS rate, page 14
+        yield = alpha + beta * real_int_rate + residual
+   over each window of n quarters that ends in yr_qtr, for every n
+   in the windows at once
+
+   each sum the regression needs, of x, y, x * x, x * y, and y * y,
+   over a window is the difference of two cumulative sums, so that
+   each window of each length costs a few operations over arrays
+   window x quarter, however long the window
+        beta    (n Sxy - Sx Sy) / (n Sxx - Sx Sx)
+        alpha   (Sy - beta Sx) / n
+        r2      the squared correlation of x and y
+        resid   y - alpha - beta x, in the last quarter of the window
+   a window with a missing value in either series is nan
+
+   access these functions in other modules by
+        from helper_func_module import regression_func as rg
+'''
+import numpy as np
+import polars as pl
+
+
+def window_sums(v, windows):
+    '''
+        v: array, one value per quarter
+        windows: array of window lengths
+        return array window x quarter, the sum of v over the
+        window that ends in each quarter, nan for the quarters
+        before the window is full
+    '''
+    total = np.concatenate(([0.], np.cumsum(v)))
+    ends = np.arange(1, len(v) + 1)
+    starts = ends - windows[:, np.newaxis]
+    sums = total[ends] - total[np.maximum(starts, 0)]
+    return np.where(starts >= 0, sums, np.nan)
+
+
+def rolling_ols(x, y, windows):
+    '''
+        x, y: arrays, one value per quarter, nan where missing
+        windows: array of window lengths
+        return dict of arrays window x quarter: alpha, beta, r2, resid
+    '''
+    windows = np.asarray(windows)
+    valid = np.isfinite(x) & np.isfinite(y)
+    # centered, for the precision of the differences of the sums
+    x_mean, y_mean = x[valid].mean(), y[valid].mean()
+    x = np.where(valid, x - x_mean, 0.)
+    y = np.where(valid, y - y_mean, 0.)
+
+    n = windows[:, np.newaxis].astype(np.float64)
+    full = window_sums(valid.astype(np.float64), windows) == n
+    sx, sy = window_sums(x, windows), window_sums(y, windows)
+    sxx, syy = window_sums(x * x, windows), window_sums(y * y, windows)
+    sxy = window_sums(x * y, windows)
+
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        vxx = n * sxx - sx * sx
+        vyy = n * syy - sy * sy
+        vxy = n * sxy - sx * sy
+        beta = vxy / vxx
+        alpha = (sy - beta * sx) / n
+        r2 = vxy * vxy / (vxx * vyy)
+        resid = y - alpha - beta * x
+
+    # the intercept of the series before they were centered
+    alpha = alpha + y_mean - beta * x_mean
+    return {name: np.where(full, value, np.nan)
+            for name, value in [('alpha', alpha),
+                                ('beta', beta),
+                                ('r2', r2),
+                                ('resid', resid)]}
+
+
+def regression_df(df, series, windows):
+    '''
+        df: yr_qtr, real_int_rate, and the cols of series,
+            sorted by yr_qtr
+        return df, one row for each series, window, and yr_qtr
+        with a full window
+        cols: series, window, yr_qtr, alpha, beta, r2, resid
+    '''
+    windows = np.asarray(windows)
+    x = df['real_int_rate'].cast(pl.Float64).to_numpy()
+    yr_qtrs = np.tile(df['yr_qtr'].to_numpy(), len(windows))
+    dfs = []
+    for name in series:
+        result = rolling_ols(x, df[name].cast(pl.Float64).to_numpy(),
+                             windows)
+        dfs.append(pl.DataFrame(
+            {'series': name,
+             'window': np.repeat(windows, df.height).astype(np.int16),
+             'yr_qtr': yr_qtrs,
+             **{key: value.ravel() for key, value in result.items()}},
+            nan_to_null= True))
+    return pl.concat(dfs, how= 'vertical')\
+             .drop_nulls(subset= 'beta')\
+             .cast({pl.Float64: pl.Float32})
+
+
+def pivot(df, series, col):
+    '''
+        df: regression_df()
+        return array window x quarter of col for series,
+        nan where the window is not full, the sorted windows,
+        and the sorted yr_qtrs
+    '''
+    wide = df.filter(pl.col('series') == series)\
+             .pivot(on= 'yr_qtr', index= 'window', values= col,
+                    sort_columns= True)\
+             .sort(by= 'window')
+    return wide.drop('window').to_numpy().astype(np.float64), \
+           wide['window'].to_list(), \
+           wide.drop('window').columns
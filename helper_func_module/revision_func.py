@@ -0,0 +1,249 @@
+'''
+   these are functions for the weekly revisions of the projections
+   of earnings, page 10
+
+   each input workbook is a weekly vintage of S&P's projections
+   vintages file, one row for each workbook and quarter projected
+        file, date      the workbook and the date of its data
+        yr_qtr          quarter projected
+        op_eps, rep_eps, 12m_op_eps, 12m_rep_eps
+
+   update() reads only the workbooks that are not in the published
+   vintages file, from input_dir/ or ARCHIVE_DIR, on a pool of
+   processes; extract() streams the rows of the estimates sheet
+   once, through the last row of projections, and reads no other
+   sheet
+
+   weekly_lf() computes, for each vintage,
+        {eps}_fwd           12m eps projected for the next calendar
+                            year, in the year of the vintage
+        {eps}_revision      percent change of {eps}_fwd from the
+                            previous vintage, null when the next
+                            calendar year changes
+        {eps}_momentum      mean of the latest MOMENTUM_WEEKS revisions
+        {eps}_breadth       percent of the quarters projected in both
+                            vintages that were revised up, less
+                            the percent revised down
+
+   access these functions in other modules by
+        from helper_func_module import revision_func as rv
+'''
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+import polars.selectors as cs
+import openpyxl.utils.cell as ut_cell
+from openpyxl import load_workbook
+
+from helper_func_module import helper_func as hp
+from helper_func_module import backup_func as bf
+from helper_func_module import manifest_func as mf
+
+
+MOMENTUM_WEEKS = 4
+
+EPS_COLS = ['op_eps', 'rep_eps', '12m_op_eps', '12m_rep_eps']
+
+
+def extract(address, sht_name, date_params, proj_params):
+    '''
+        date_params, proj_params: as for rd.read_sp_date()
+            and rd.sp_loader(), see update_data.py
+        return df of the projections in the workbook at address,
+        None if the workbook lacks its date or projections
+    '''
+    last_col = ut_cell.column_index_from_string(proj_params['last_col'])
+    date_col = ut_cell.column_index_from_string(
+        date_params['value_col_1']) - 1
+    skip_cols = proj_params['skip_cols']
+
+    workbook = load_workbook(filename= address,
+                             read_only= True,
+                             data_only= True)
+    name_date = None
+    is_proj = False
+    data = []
+    for row in workbook[sht_name].iter_rows(max_col= last_col,
+                                            values_only= True):
+        if is_proj:
+            # the first empty row or end key ends the projections
+            if (hp.item_matches_key(row[0], None) or
+                hp.item_matches_key(row[0], proj_params['end_key'])):
+                break
+            data.append([value for idx, value in enumerate(row)
+                         if idx not in skip_cols])
+        elif hp.item_matches_key(row[0], proj_params['act_key']):
+            is_proj = True
+        if (name_date is None and
+            hp.item_matches_key(row[0], date_params['date_keys'])):
+            name_date = hp.dt_str_to_date(row[date_col])
+    workbook.close()
+
+    if name_date is None or not data:
+        return None
+    for row in data:
+        row[0] = hp.dt_str_to_date(row[0])
+    if None in [row[0] for row in data]:
+        return None
+
+    return pl.DataFrame(data,
+                        schema= proj_params['column_names'],
+                        orient= 'row')\
+             .cast({cs.datetime(): pl.Date})\
+             .select(pl.lit(address.name).alias('file'),
+                     pl.lit(name_date.date()).alias('date'),
+                     pl.col('date')
+                       .map_batches(hp.date_to_year_qtr)
+                       .alias('yr_qtr'),
+                     # a col of empty cells is null, not float
+                     pl.col(EPS_COLS).cast(pl.Float32))
+
+
+def update(env, loc_env, src, dst):
+    '''
+        src: Generation of the published files
+        dst: Generation of the staged files, with its manifest
+        write the vintages of all the workbooks in the manifest
+        of dst to dst.OUTPUT_VINTAGE_ADDR, extracting only the
+        workbooks not in the vintages file of src
+    '''
+    conn = mf.open_read(dst.MANIFEST_ADDR)
+    files = mf.all_files(conn)
+    conn.close()
+
+    if src.OUTPUT_VINTAGE_ADDR.exists():
+        known_df = pl.read_parquet(src.OUTPUT_VINTAGE_ADDR)
+        known = set(known_df['file'].unique())
+    else:
+        known_df = None
+        known = set()
+
+    # new workbooks are in input_dir until the update is archived
+    addresses = []
+    missing = []
+    for file in files:
+        if file in known:
+            continue
+        for directory in (env.INPUT_DIR, env.ARCHIVE_DIR):
+            if (directory / file).exists():
+                addresses.append(directory / file)
+                break
+        else:
+            missing.append(file)
+
+    dfs = []
+    if addresses:
+        # spawn, polars's threads do not survive a fork
+        with ProcessPoolExecutor(
+                max_workers= min(len(addresses), os.cpu_count()),
+                mp_context= multiprocessing.get_context('spawn')) as pool:
+            dfs = list(pool.map(extract,
+                                addresses,
+                                [loc_env.SHT_EST_NAME] * len(addresses),
+                                [loc_env.SHT_EST_PROJ_DATE_PARAMS] *
+                                    len(addresses),
+                                [loc_env.SHT_EST_PROJ_PARAMS] *
+                                    len(addresses)))
+    failures = [address.name for address, df in zip(addresses, dfs)
+                if df is None]
+    dfs = [df for df in dfs if df is not None]
+
+    if known_df is not None:
+        dfs.insert(0, known_df)
+    if dfs:
+        vintage_df = pl.concat(dfs, how= 'vertical')\
+                       .sort(by= ['date', 'yr_qtr'])
+        bf.write_replace(dst.OUTPUT_VINTAGE_ADDR, vintage_df.write_parquet)
+        height = vintage_df['file'].n_unique()
+    else:
+        height = 0
+
+    print('\n============================================')
+    print(f'Vintages of projections: {len(addresses)} workbooks read, '
+          f'{height} in all')
+    if missing:
+        print(f'{len(missing)} workbooks in neither input_dir nor '
+              f'ARCHIVE_DIR, latest: {missing[-1]}')
+    if failures:
+        print(f'{len(failures)} workbooks not read: {failures}')
+    print(f'{dst.OUTPUT_VINTAGE_ADDR}')
+    print('============================================\n')
+    return
+
+
+def read(src):
+    '''
+        return LazyFrame, see weekly_lf(), for the vintages file
+        of src, None if there is no vintages file
+    '''
+    if not src.OUTPUT_VINTAGE_ADDR.exists():
+        print('\n============================================')
+        print(f'No vintages of projections in: '
+              f'\n{src.OUTPUT_VINTAGE_ADDR}')
+        print('omitted the page of weekly revisions')
+        print('============================================\n')
+        return None
+    return weekly_lf(pl.scan_parquet(src.OUTPUT_VINTAGE_ADDR))
+
+
+def weekly_lf(vintage_lf):
+    '''
+        vintage_lf: the vintages file
+        return LazyFrame, one row for each vintage, sorted by date
+        cols: date, fwd_year, and for op and rep, the cols
+        described above
+    '''
+    vintage_lf = vintage_lf.with_columns(pl.col('date')
+                                           .rank('dense')
+                                           .cast(pl.Int32)
+                                           .alias('vintage'))
+
+    # projections for the next calendar year, in each vintage
+    fwd_lf = vintage_lf.filter(pl.col('yr_qtr') ==
+                               pl.format('{}-Q4',
+                                         pl.col('date').dt.year() + 1))\
+                       .select('date',
+                               (pl.col('date').dt.year() + 1)
+                                 .alias('fwd_year'),
+                               pl.col('12m_op_eps').alias('op_fwd'),
+                               pl.col('12m_rep_eps').alias('rep_fwd'))\
+                       .sort(by= 'date')\
+                       .with_columns(
+                           [pl.when(pl.col('fwd_year') ==
+                                    pl.col('fwd_year').shift(1))
+                              .then((pl.col(f'{eps}_fwd') /
+                                     pl.col(f'{eps}_fwd').shift(1) - 1) *
+                                    100)
+                              .alias(f'{eps}_revision')
+                            for eps in ['op', 'rep']])\
+                       .with_columns(
+                           [pl.col(f'{eps}_revision')
+                              .rolling_mean(MOMENTUM_WEEKS,
+                                            min_samples= 1)
+                              .alias(f'{eps}_momentum')
+                            for eps in ['op', 'rep']])
+
+    # each quarter projected in a vintage and in the vintage before
+    breadth_lf = vintage_lf.join(vintage_lf.select(
+                                     (pl.col('vintage') + 1)
+                                       .alias('vintage'),
+                                     'yr_qtr', 'op_eps', 'rep_eps'),
+                                 on= ['vintage', 'yr_qtr'],
+                                 how= 'inner',
+                                 suffix= '_prev')\
+                           .group_by('date')\
+                           .agg([((pl.col(f'{eps}_eps') -
+                                   pl.col(f'{eps}_eps_prev'))
+                                    .sign()
+                                    .mean() * 100)
+                                    .alias(f'{eps}_breadth')
+                                 for eps in ['op', 'rep']])
+
+    return fwd_lf.join(breadth_lf,
+                       on= 'date',
+                       how= 'left',
+                       coalesce= True)\
+                 .sort(by= 'date')\
+                 .cast({cs.float(): pl.Float32})
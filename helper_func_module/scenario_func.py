@@ -0,0 +1,89 @@
+'''
+   these are functions for the price scenarios of page 7
+   each scenario is an annual growth rate of price and a one-time
+   shock to price, applied to the latest price from the history
+   for each scenario and projected quarter, the forward p/e and
+   earnings yield use the projected 12m trailing earnings
+
+   all scenarios are computed at once, as numpy arrays with one
+   row per scenario and one col per projected quarter, so that
+   hundreds of scenarios take no longer than one
+
+   access these functions in other modules by
+        from helper_func_module import scenario_func as sc
+'''
+import numpy as np
+import polars as pl
+
+
+def growth_grid(low, high, step):
+    '''
+        return array of annual growth rates from low to high,
+        inclusive, in increments of step
+    '''
+    return np.round(np.arange(low, high + step / 2, step), 6)
+
+
+def scenarios(growth, shocks):
+    '''
+        return two arrays, the growth rate and the shock of each
+        scenario, one scenario for each pair of growth and shocks
+    '''
+    g, s = np.meshgrid(np.asarray(growth, dtype= np.float64),
+                       np.asarray(shocks, dtype= np.float64),
+                       indexing= 'ij')
+    return g.ravel(), s.ravel()
+
+
+def paths(base_price, eps, growth, shocks):
+    '''
+        base_price: latest price in the history
+        eps: array of projected 12m eps, one for each quarter
+        growth, shocks: arrays, see scenarios()
+        return dict of arrays, scenario x quarter
+            keys: 'price', 'pe', 'earnings_yield'
+        the price of the first projected quarter is
+        base_price * (1 + shock)
+    '''
+    eps = np.asarray(eps, dtype= np.float64)
+    qtr_growth = (1. + growth) ** (1/4)
+    price = (base_price * (1. + shocks))[:, np.newaxis] * \
+            qtr_growth[:, np.newaxis] ** np.arange(len(eps))
+    return {'price': price,
+            'pe': price / eps,
+            'earnings_yield': 100 * eps / price}
+
+
+def paths_df(yr_qtrs, growth, shocks, path_dict):
+    '''
+        return df in long form, one row per scenario and quarter
+        cols: growth, shock, yr_qtr, and a col for each key
+        of path_dict, see paths()
+    '''
+    n_scen, n_qtrs = path_dict['price'].shape
+    return pl.DataFrame(
+        {'growth': np.repeat(growth, n_qtrs),
+         'shock': np.repeat(shocks, n_qtrs),
+         'yr_qtr': np.tile(np.asarray(yr_qtrs), n_scen),
+         **{name: values.ravel()
+            for name, values in path_dict.items()}})\
+             .cast({'growth': pl.Float32,
+                    'shock': pl.Float32,
+                    'price': pl.Float32,
+                    'pe': pl.Float32,
+                    'earnings_yield': pl.Float32})
+
+
+def heatmap_df(df, measure, shock):
+    '''
+        df: paths_df() for one eps
+        return df for the scenarios with shock
+        cols: growth, then a col of measure for each yr_qtr
+    '''
+    # shock is float32 in df
+    return df.filter((pl.col('shock') - shock).abs() < 1e-6)\
+             .pivot(on= 'yr_qtr',
+                    index= 'growth',
+                    values= measure,
+                    sort_columns= True)\
+             .sort(by= 'growth')
@@ -0,0 +1,251 @@
+'''
+   these are functions for the snapshot store, which holds
+   several generations of the file manifest and the
+   parquet output files
+
+   snapshot_dir/
+        objects/        one file per distinct content, named by sha256
+        generations/    one dir per generation
+            <gen_id>/   manifest.json and a link to the object
+                        for each file in the generation
+        HEAD            name of the current generation
+
+   a file that does not change between generations is stored once
+   rollback swaps HEAD, which the display scripts read first
+   (see publish_func.py), then relinks the files in output_dir/
+   to the chosen generation, it neither reads nor writes any data
+
+   access these functions in other modules by
+        from helper_func_module import snapshot_func as sf
+'''
+import json
+import shutil
+import hashlib
+from datetime import datetime
+
+from helper_func_module import backup_func as bf
+from helper_func_module import manifest_func as mf
+
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def snapshot_files(env):
+    '''
+        return dict
+            key: file name in a generation
+            val: Path() of the file in the project
+    '''
+    return {env.MANIFEST_FILE: env.MANIFEST_ADDR,
+            env.OUTPUT_HIST_FILE: env.OUTPUT_HIST_ADDR,
+            env.OUTPUT_IND_FILE: env.OUTPUT_IND_ADDR,
+            env.OUTPUT_PROJ_FILE: env.OUTPUT_PROJ_ADDR,
+            env.OUTPUT_DERIVED_FILE: env.OUTPUT_DERIVED_ADDR,
+            env.OUTPUT_ACCURACY_FILE: env.OUTPUT_ACCURACY_ADDR,
+            env.OUTPUT_VINTAGE_FILE: env.OUTPUT_VINTAGE_ADDR,
+            env.OUTPUT_IND_CORR_FILE: env.OUTPUT_IND_CORR_ADDR,
+            env.OUTPUT_IND_STATS_FILE: env.OUTPUT_IND_STATS_ADDR,
+            env.OUTPUT_IND_DECOMP_FILE: env.OUTPUT_IND_DECOMP_ADDR}
+
+
+def file_hash(address):
+    '''
+        return the sha256 hex digest of the file at address
+    '''
+    with address.open('rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def commit(env, label= ''):
+    '''
+        add the project's output files to the store as a new generation
+        and point HEAD to it
+        if the files match the HEAD generation, add nothing
+        if the files have been removed, add an empty generation
+        return the id of the HEAD generation
+    '''
+
+    files = {name: address
+             for name, address in snapshot_files(env).items()
+             if address.exists()}
+    head_id = head(env)
+    if not files and head_id is None:
+        return None
+
+    if (head_id is not None and
+        read_manifest(env, head_id)['files'] == 
+            {name: file_hash(address) 
+             for name, address in files.items()}):
+        return head_id
+
+    gen_id = new_gen_id()
+    tmp_dir = staging_dir(env, gen_id)
+    for name, address in files.items():
+        bf.snapshot(address, tmp_dir / name)
+    return add_generation(env, gen_id, label)
+
+
+def new_gen_id():
+    return datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+
+
+def staging_dir(env, gen_id):
+    '''
+        create and return an empty, hidden dir in which to 
+        assemble generation gen_id
+    '''
+    tmp_dir = bf.tmp_address(env.SNAPSHOT_GEN_DIR / gen_id)
+    shutil.rmtree(tmp_dir, ignore_errors= True)
+    tmp_dir.mkdir(parents= True)
+    return tmp_dir
+
+
+def add_generation(env, gen_id, label= ''):
+    '''
+        the staging dir for gen_id holds the files of the generation
+        store each distinct file once in objects/, write the manifest,
+        rename the staging dir into generations/, point HEAD to it,
+        and prune generations beyond env.SNAPSHOT_KEEP
+        return gen_id
+    '''
+
+    tmp_dir = bf.tmp_address(env.SNAPSHOT_GEN_DIR / gen_id)
+    gen_dir = env.SNAPSHOT_GEN_DIR / gen_id
+    env.SNAPSHOT_OBJECTS_DIR.mkdir(parents= True, exist_ok= True)
+
+    hashes = dict()
+    for address in sorted(tmp_dir.iterdir()):
+        digest = file_hash(address)
+        obj = env.SNAPSHOT_OBJECTS_DIR / digest
+        if obj.exists():
+            # share the stored copy, drop the duplicate
+            bf.snapshot(obj, address)
+        else:
+            bf.snapshot(address, obj)
+        hashes[address.name] = digest
+
+    manifest = {'created': datetime.now().isoformat(timespec= 'seconds'),
+                'label': label,
+                'files': hashes}
+    with (tmp_dir / MANIFEST_FILE).open('w') as f:
+        json.dump(manifest, f, indent= 4)
+    tmp_dir.rename(gen_dir)
+
+    set_head(env, gen_id)
+    prune(env, env.SNAPSHOT_KEEP)
+
+    print('\n============================================')
+    print(f'Snapshot generation {gen_id} {label}')
+    print(f'in: \n{env.SNAPSHOT_GEN_DIR}')
+    print('============================================\n')
+    return gen_id
+
+
+def head(env):
+    '''
+        return the id of the HEAD generation, None if there is none
+    '''
+    if not env.SNAPSHOT_HEAD_ADDR.exists():
+        return None
+    return env.SNAPSHOT_HEAD_ADDR.read_text().strip()
+
+
+def set_head(env, gen_id):
+    '''
+        point HEAD to gen_id with one atomic rename
+    '''
+    bf.write_replace(env.SNAPSHOT_HEAD_ADDR,
+                     lambda f: f.write(gen_id),
+                     mode= 'w')
+    return
+
+
+def read_manifest(env, gen_id):
+    with (env.SNAPSHOT_GEN_DIR / gen_id / MANIFEST_FILE).open('r') as f:
+        return json.load(f)
+
+
+def list_generations(env):
+    '''
+        return list of gen_ids, newest first
+    '''
+    if not env.SNAPSHOT_GEN_DIR.exists():
+        return []
+    return sorted((d.name for d in env.SNAPSHOT_GEN_DIR.iterdir()
+                   if d.is_dir() and not d.name.startswith('.')),
+                  reverse= True)
+
+
+def rollback(env, gen_id):
+    '''
+        make gen_id the HEAD generation and
+        relink the project's output files to its objects
+    '''
+
+    gen_dir = env.SNAPSHOT_GEN_DIR / gen_id
+    if not gen_dir.is_dir():
+        print('\n============================================')
+        print(f'No snapshot generation {gen_id}')
+        print(f'in: \n{env.SNAPSHOT_GEN_DIR}')
+        print('Return to menu of actions')
+        print('============================================\n')
+        return
+
+    set_head(env, gen_id)
+    mirror(env, gen_id)
+
+    print('\n============================================')
+    print(f'Rolled back to snapshot generation {gen_id}')
+    print(f'files: {sorted(read_manifest(env, gen_id)["files"].keys())}')
+    print('============================================\n')
+    return
+
+
+def mirror(env, gen_id):
+    '''
+        relink the file manifest and the files in output_dir/
+        to the files of generation gen_id, and remove the files
+        that gen_id does not hold, so that the project's files
+        match gen_id exactly
+        export record_dict.json from the manifest if
+        env.EXPORT_RECORD_DICT_JSON
+    '''
+
+    hashes = read_manifest(env, gen_id)['files']
+    for name, address in snapshot_files(env).items():
+        if name in hashes:
+            bf.snapshot(env.SNAPSHOT_OBJECTS_DIR / hashes[name], address)
+        else:
+            # e.g. a file added after gen_id, after a rollback
+            address.unlink(missing_ok= True)
+    
+    if env.EXPORT_RECORD_DICT_JSON and env.MANIFEST_FILE in hashes:
+        conn = mf.open_read(env.MANIFEST_ADDR)
+        mf.export_json(conn, env.RECORD_DICT_ADDR)
+        conn.close()
+    return
+
+
+def prune(env, keep):
+    '''
+        keep the newest generations, up to keep, plus HEAD
+        remove unfinished staging dirs
+        remove objects that no remaining generation uses
+    '''
+
+    head_id = head(env)
+    gen_ids = list_generations(env)
+    for gen_id in gen_ids[keep:]:
+        if gen_id != head_id:
+            shutil.rmtree(env.SNAPSHOT_GEN_DIR / gen_id)
+    # staging dirs left by updates that did not finish
+    for tmp_dir in env.SNAPSHOT_GEN_DIR.glob('.*.tmp'):
+        shutil.rmtree(tmp_dir)
+
+    used = set()
+    for gen_id in list_generations(env):
+        used |= set(read_manifest(env, gen_id)['files'].values())
+    for obj in env.SNAPSHOT_OBJECTS_DIR.iterdir():
+        if obj.name not in used:
+            obj.unlink()
+    return
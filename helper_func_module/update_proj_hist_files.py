@@ -1,11 +1,13 @@
 import polars as pl
 
+from helper_func_module import backup_func as bf
 
-def update(env):
+
+def update(env, src):
     '''
-        Archive all files in new_files_set
-        Read all files in files_to_read_set
-        Updates proj_dict
+        src: Generation of the published files
+        Snapshots the published proj file to backup_dir
+        Reads proj_dict from the published proj file
         
         Proj_dict contains projections
             key: yr_qtr, in which the proj was made
@@ -17,17 +19,17 @@ def update(env):
             to date (data begins in 2017)
     '''
     
-    proj_address = env.OUTPUT_PROJ_ADDR
+    proj_address = src.OUTPUT_PROJ_ADDR
     backup_proj_address = env.BACKUP_PROJ_ADDR
 
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## ++++ Create proj_dict from proj_hist_df stored in parquet file +++++
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # snapshot the stored file to backup, without re-encoding it
     if proj_address.exists():
+        bf.snapshot(proj_address, backup_proj_address)
         with proj_address.open('rb') as f:
             proj_hist_df = pl.read_parquet(f)
-        with backup_proj_address.open('wb') as f:
-            proj_hist_df.write_parquet(f)
         proj_dict = proj_hist_df.to_dict(as_series= False)
     else:
         proj_dict = dict()
@@ -1,32 +1,31 @@
-import polars as pl
 import json
 
 from helper_func_module import helper_func as hp 
+from helper_func_module import backup_func as bf
+from helper_func_module import manifest_func as mf
 
 
-def update(env, loc_env):
+def update(env, loc_env, src):
     '''
-        Inputs are Path() instances
-        Returns 1 dict and 3 sets
-            record_dict
+        src: Generation of the published files
+        Returns the manifest and 2 sets
+            manifest, held in memory (see manifest_func.py)
             new_files_set
             files_to_read_set
-            files_to remove_set
         
-        Reads record_dict.pkl, writes to backup_record_dict.pkl
+        Reads the manifest, snapshots it to backup_file_manifest.sqlite
+        Adds the names of all new input files to the manifest
         Returns set of names for all new input files
-        Returns set of names of input files to read (pertinent data)
-        Returns set of names of prev used input files 
-            that now contain stale data & to be delisted
+        Returns set of names of input files to read (pertinent data),
+            the new files that are the latest file in their quarter
     '''
     
-    address = env.RECORD_DICT_ADDR
-    backup_address = env.BACKUP_RECORD_DICT_ADDR
+    address = src.MANIFEST_ADDR
+    backup_address = env.BACKUP_MANIFEST_ADDR
     input_sp_dir = env.INPUT_DIR
     input_rr_addr = env.INPUT_RR_ADDR
-    yr_qtr = loc_env.YR_QTR_NAME
     
-    return_empty_objects = [dict(), set(), set()]
+    return_empty_objects = [None, set(), set()]
     
     # READ: load names of new data files, return if none
     input_sp_files_set = \
@@ -48,116 +47,61 @@ def update(env, loc_env):
         print('============================================\n')
         return return_empty_objects
     
-    # READ: record_dict
+    # READ: manifest, and write backup
     if address.exists():
-        with open(address,'r') as f:
-            record_dict = json.load(f)
-            
-    # use blank dict if necessary
-    if (not address.exists()):
-        record_dict = {}
+        manifest = mf.load(address)
+        method = bf.snapshot(address, backup_address)
         print('\n============================================')
-        print(f'No record_dict.json exists at\n{address}')
-        print(f'or record_dict is "falsey"')
-        print(f'Initializing record_dict')
+        print(f'Read manifest from: \n{address}')
+        print(f'Backed up manifest ({method}) to: \n{backup_address}')
         print('============================================\n')
-         
-        record_dict = {'sources': {'s&p': '',
-                                   'tips': ''},
-                       'latest_used_file': "",
-                       'prev_used_files': [],
-                       'prev_files': []}
         
-    # WRITE: if prev record_dict exists, write backup
+    # convert a record_dict.json written before the manifest existed
+    elif src.RECORD_DICT_ADDR.exists():
+        with open(src.RECORD_DICT_ADDR,'r') as f:
+            manifest = mf.from_record_dict(json.load(f))
+        print('\n============================================')
+        print(f'No manifest exists at\n{address}')
+        print(f'Converted record_dict from: \n{src.RECORD_DICT_ADDR}')
+        print('============================================\n')
+        
+    # use blank manifest if necessary
     else:
-        with open(backup_address, 'w') as f:
-            json.dump(record_dict, f, indent= 4)
+        manifest = mf.new()
         print('\n============================================')
-        print(f'Read record_dict from: \n{address}')
-        print(f'Wrote record_dict to: \n{backup_address}')
+        print(f'No manifest exists at\n{address}')
+        print(f'Initializing manifest')
         print('============================================\n')
         
-# create set of new files that were not previously seen
-    prev_files_set = set(record_dict['prev_files'])
-    new_files_set = input_sp_files_set - prev_files_set
-    record_dict['prev_files'] = \
-        sorted(list(prev_files_set | new_files_set), reverse= True)
+# set of new files that were not previously seen
+    new_files_set = input_sp_files_set - \
+        mf.known_files(manifest, input_sp_files_set)
     
 # if nothing new, return up the chain to main
     if not new_files_set:
         print('\n============================================')
         print(f'No previously unseen files at')
-        print(f'{address}')
+        print(f'{input_sp_dir}')
         print('No data files have been written')
         print('============================================\n')
         return return_empty_objects
 
 # ===========================================================
 # NB from here, new_files_set is not empty
-#    values for record_dict's keys may be empty
 # ===========================================================
-   
-    # create df with the names and dates of the new_files
-    data_df = pl.DataFrame(list(new_files_set), 
-                           schema= ["file"],
-                           orient= 'row')\
-                .with_columns(pl.col('file')
-                            .map_batches(hp.string_to_date)
-                            .alias('date'))\
-                .with_columns(pl.col('date')
-                            .map_batches(hp.date_to_year_qtr)
-                            .alias(yr_qtr))
     
-    # fetch used files list from record_dict
-    # prev_used_files_list contains dicts, each with keys
-    # 'file', 'date', loc_env.YR_QTR_NAME
-    # one dict for each prev_used_file
-    prev_used_files_list = record_dict['prev_used_files']
-    if not prev_used_files_list:
-        used_df = data_df
-        prev_used_files_set = set()
-        
-    else:    
-        # col names are the same as the keys for the dicts
-        # contained in prev_used_files_list
-        used_df = pl.DataFrame(prev_used_files_list)  
-        prev_used_files_set = set(
-            pl.Series(used_df['file']).to_list())
+    mf.add_files(manifest, new_files_set)
     
     # new files can update and replace prev files for same year_qtr
-    # (prev_used_files has only one file per quarter)
-    # find the latest new file for each quarter (agg(all.sort_by.last))
-    # in each group, using all cols, sort_by date, select the last row
-    # in new_files_list
-    
-        used_df = pl.concat([used_df.cast({'date': pl.Date}),
-                            data_df.select(used_df.columns)],
-                            how= 'vertical')\
-                    .group_by(yr_qtr)\
-                    .agg(pl.all().sort_by('date').last())\
-                    .sort(by= yr_qtr)
-
-    # and files to be used from the new input files
-    used_files_set = set(pl.Series(used_df['file']).to_list())
-    files_to_read_set = used_files_set - prev_used_files_set
-
-    # update prev_used_files for the new files
-    # update_df['update_used_files']: list of dicts
-    # cast allows json for saving record_dict
-    update_df = used_df.cast({'date': pl.String})\
-                       .select(pl.struct(pl.all())
-                                 .alias('update_used_files'))
-    
-    record_dict['prev_used_files'] = sorted(
-        update_df['update_used_files'],
-        reverse= True,
-        key= lambda x: x['date'])
-    
-    record_dict['latest_used_file'] = \
-        record_dict['prev_used_files'][0]['file']
-    
-    record_dict['sources']['s&p'] = env.SP_SOURCE
-    record_dict['sources']['tips'] = env.REAL_RATE_SOURCE
+    # (only the latest file in each quarter is used)
+    # files to read: new files that are now the latest in their quarter
+    new_yr_qtrs = \
+        hp.date_to_year_qtr(hp.string_to_date(list(new_files_set)))
+    used_files_set = {item['file']
+                      for item in mf.latest_files(manifest, new_yr_qtrs)}
+    files_to_read_set = used_files_set & new_files_set
     
-    return [record_dict, new_files_set, files_to_read_set]
+    mf.set_sources(manifest, {'s&p': env.SP_SOURCE,
+                              'tips': env.REAL_RATE_SOURCE})
     
+    return [manifest, new_files_set, files_to_read_set]
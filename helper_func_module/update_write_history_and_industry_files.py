@@ -1,45 +1,32 @@
-def write(actual_df, ind_df, env):
-         
-## +++++ write history file +++++++++++++++++++++++++++++++++++++++++++
-    # move any existing hist file in output_dir to backup
-    if env.OUTPUT_HIST_ADDR.exists():
-        env.OUTPUT_HIST_ADDR.rename(env.BACKUP_HIST_ADDR)
-        print('\n============================================')
-        print(f'Moved history file from: \n{env.OUTPUT_HIST_ADDR}')
-        print(f'to: \n{env.BACKUP_HIST_ADDR}')
-        print('============================================\n')
-    else:
-        print('\n============================================')
-        print(f'Found no history file at: \n{env.OUTPUT_HIST_ADDR}')
-        print(f'Wrote no history file to: \n{env.BACKUP_HIST_ADDR}')
-        print('============================================\n')
-        
-    # write actual_df, the historical data, into the output_dir
-    with env.OUTPUT_HIST_ADDR.open('w') as f:
-        actual_df.write_parquet(f)
-    print('\n============================================')
-    print(f'Wrote history file to: \n{env.OUTPUT_HIST_ADDR}')
-    print('============================================\n')
-    
-## +++++ write industry file ++++++++++++++++++++++++++++++++++++++++++
-    # move any existing industry file in output_dir to backup
-    if env.OUTPUT_IND_ADDR.exists():
-        env.OUTPUT_IND_ADDR.rename(env.BACKUP_IND_ADDR)
-        print('\n============================================')
-        print(f'Moved industry file from: \n{env.OUTPUT_IND_ADDR}')
-        print(f'to: \n{env.BACKUP_IND_ADDR}')
-        print('============================================\n')
-    else:
-        print('\n============================================')
-        print(f'Found no industry file at: \n{env.OUTPUT_IND_ADDR}')
-        print(f'Wrote no industry file to: \n{env.BACKUP_IND_ADDR}')
-        print('============================================\n')
-        
-    # write ind_df, the industry data, into the output_dir
-    with env.OUTPUT_IND_ADDR.open('w') as f:
-        ind_df.write_parquet(f)
-    print('\n============================================')
-    print(f'Wrote industry file to: \n{env.OUTPUT_IND_ADDR}')
-    print('============================================\n')
-    
+from helper_func_module import backup_func as bf
+
+
+def write(actual_df, ind_df, env, src, dst, writer):
+    '''
+        src: Generation of the published files, read by this update
+        dst: Generation of the staged files, written by this update
+        writer: writer_func.Writer, writes the files concurrently
+        snapshot the published hist and industry files to backup_dir
+        then write actual_df and ind_df to the staging dir
+        the snapshots neither decode nor re-encode the parquet files
+    '''
+
+## +++++ snapshot existing files to backup ++++++++++++++++++++++++++++
+    for name, address, backup_address in (
+            ('history backup', src.OUTPUT_HIST_ADDR, env.BACKUP_HIST_ADDR),
+            ('industry backup', src.OUTPUT_IND_ADDR, env.BACKUP_IND_ADDR)):
+        if address.exists():
+            writer.submit(name, backup_address,
+                          lambda backup, address= address:
+                              bf.snapshot(address, backup))
+        else:
+            print('\n============================================')
+            print(f'Found no file at: \n{address}')
+            print(f'Wrote no file to: \n{backup_address}')
+            print('============================================\n')
+
+## +++++ write history and industry files into the staging dir ++++++++
+    writer.submit('history', dst.OUTPUT_HIST_ADDR, actual_df.write_parquet)
+    writer.submit('industry', dst.OUTPUT_IND_ADDR, ind_df.write_parquet)
+
     return
@@ -1,9 +1,10 @@
 import polars as pl
 
-def write(proj_dict, new_files_set, env):
+def write(proj_dict, dst, writer):
     '''
         proj_dict: keys, year_quarter of projection
-        env: provides the address for storing the data
+        dst: Generation, provides the staging address for the data
+        writer: writer_func.Writer, writes the file concurrently
         
         Writes the projection data for each year_quarter
         to a single parquet file. 
@@ -34,7 +35,7 @@ def write(proj_dict, new_files_set, env):
 ## ++++ Save updated proj_hist_df +++++++++++++++++++++++++++++++++++++
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     
-    proj_address = env.OUTPUT_PROJ_ADDR
+    proj_address = dst.OUTPUT_PROJ_ADDR
 
     # convert proj_dict to df to save with parquet
     # use concat to compensate for diff # of rows in each proj_date_df
@@ -47,9 +48,18 @@ def write(proj_dict, new_files_set, env):
                     for key, value in proj_dict.items()],
             how= "horizontal")
     
-    with proj_address.open('wb') as f:
-        proj_hist_df.write_parquet(f)
+    writer.submit('projections', proj_address, proj_hist_df.write_parquet)
         
+    return
+
+
+def archive(new_files_set, env):
+    '''
+        move all new input files from INPUT_DIR to ARCHIVE_DIR
+        call only after the update has been published
+        skips files already moved by an earlier, unfinished run
+    '''
+    
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## ++++ Archive all new files +++++++++++++++++++++++++++++++++++++++++
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -57,7 +67,8 @@ def write(proj_dict, new_files_set, env):
     for file in new_files_set:
         address = env.INPUT_DIR / file
         new_address = env.ARCHIVE_DIR / file
-        address.rename(new_address)
+        if address.exists():
+            address.rename(new_address)
     print('\n====================================================')
     print('Archived all new input projection files')
     print(f'moved from {env.INPUT_DIR}')
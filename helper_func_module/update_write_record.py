@@ -1,17 +1,17 @@
-import json
+from helper_func_module import manifest_func as mf
+from helper_func_module import backup_func as bf
 
-def write(record_dict, env):
-    with open(env.RECORD_DICT_ADDR, 'w') as f:
-        json.dump(record_dict, f, indent= 4)
+def write(manifest, dst):
+    # dst: Generation, provides the staging address for the manifest
+    mf.save(manifest, dst.MANIFEST_ADDR)
+    bf.fsync(dst.MANIFEST_ADDR)
 
-    record_dict_prev_used_files = \
-        record_dict['prev_used_files'][:4]
+    prev_used_files = mf.latest_files(manifest)[:4]
     print('\n====================================================')
-    print('Saved record_dict to file')
-    print(f'{env.RECORD_DICT_ADDR}')
-    print(f'\nlatest_used_file: {record_dict['latest_used_file']}\n')
-    print(f'prev_files: \n{record_dict['prev_files'][:4]}\n')
-    print(f"record_dict['prev_used_files']: \n{record_dict_prev_used_files}\n")
+    print('Staged manifest in file')
+    print(f'{dst.MANIFEST_ADDR}')
+    print(f'\nlatest_used_file: {mf.latest_used_file(manifest)}\n')
+    print(f"prev_used_files: \n{prev_used_files}\n")
     print('====================================================\n')
     
     return
@@ -0,0 +1,70 @@
+'''
+   these are functions for windowed earnings over the full history,
+   the quarterly op_eps and rep_eps since 1988
+
+   for each window of n quarters and each eps
+        {eps}_{n}q          sum of eps over the trailing n quarters
+        {eps}_avg_{n}q      annual average, 4 * sum / n
+        pe_{eps}_{n}q       price / annual average
+        ey_{eps}_{n}q       100 / pe, the earnings yield
+   all are nominal, the history has no price level to restate the
+   eps in constant prices, so pe_{eps}_40q resembles a cyclically
+   adjusted p/e but is not the CAPE, which averages real earnings
+
+   each eps has one cumulative sum, shared by every window, a
+   window's sum is the difference of two cumulative sums, so that
+   every window is computed in one pass over the history
+   a window that contains a null eps is null
+
+   access these functions in other modules by
+        from helper_func_module import window_func as wn
+'''
+import polars as pl
+import polars.selectors as cs
+
+
+WINDOWS = (4, 20, 40)
+
+
+def windowed_eps(lf, eps_cols, windows= WINDOWS):
+    '''
+        lf: history, one row per quarter, sorted by yr_qtr, with
+            the quarterly eps_cols and price
+        return lf with the cols described above added
+    '''
+    # cumulative sums, and counts of the non-null eps
+    cum_cols = []
+    for eps in eps_cols:
+        cum_cols += [pl.col(eps).cast(pl.Float64)
+                                .fill_null(0.)
+                                .cum_sum()
+                                .alias(f'_sum_{eps}'),
+                     pl.col(eps).is_not_null()
+                                .cum_sum()
+                                .alias(f'_count_{eps}')]
+
+    window_cols = []
+    for eps in eps_cols:
+        total = pl.col(f'_sum_{eps}')
+        count = pl.col(f'_count_{eps}')
+        for n in windows:
+            window_cols.append(
+                pl.when(count - count.shift(n, fill_value= 0) == n)
+                  .then(total - total.shift(n, fill_value= 0.))
+                  .cast(pl.Float32)
+                  .alias(f'{eps}_{n}q'))
+
+    ratio_cols = []
+    for eps in eps_cols:
+        for n in windows:
+            avg = pl.col(f'{eps}_{n}q') * 4 / n
+            ratio_cols += [avg.alias(f'{eps}_avg_{n}q'),
+                           (pl.col('price') / avg)
+                              .alias(f'pe_{eps}_{n}q'),
+                           (avg * 100 / pl.col('price'))
+                              .alias(f'ey_{eps}_{n}q')]
+
+    return lf.with_columns(cum_cols)\
+             .with_columns(window_cols)\
+             .with_columns(ratio_cols)\
+             .drop(cs.starts_with('_sum_', '_count_'))
@@ -0,0 +1,80 @@
+'''
+   these are functions that write the output files of an update
+   concurrently, on a pool of threads
+
+   polars encodes parquet files without holding the GIL, so the
+   history, industry, and projections files and their backups are
+   written at the same time, while update_data.py continues to
+   read the input workbooks
+   finish() waits for every write, fsyncs the written files as
+   a batch, and reports the bytes and latency of each file
+   the update waits for its largest write, not for the sum of them
+
+   access these functions in other modules by
+        from helper_func_module import writer_func as wr
+'''
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from helper_func_module import backup_func as bf
+
+
+MAX_WORKERS = 4
+
+
+class Writer:
+    '''
+        submit() queues a write and returns at once
+        finish() waits for the queued writes, fsyncs them,
+            prints a report, returns list of dicts
+                keys: 'name', 'address', 'bytes', 'seconds'
+    '''
+
+    def __init__(self, max_workers= MAX_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers= max_workers)
+        self.pending = []
+
+    def submit(self, name, address, write_func):
+        '''
+            write_func receives address, and writes the file there
+        '''
+        self.pending.append((name, address,
+                             self.pool.submit(timed, write_func, address)))
+        return
+
+    def finish(self):
+        wait_start = time.perf_counter()
+        # result() raises any exception from its write
+        report = [{'name': name,
+                   'address': address,
+                   'seconds': future.result()}
+                  for name, address, future in self.pending]
+        fsync_start = time.perf_counter()
+        list(self.pool.map(bf.fsync,
+                           [item['address'] for item in report]))
+        self.pool.shutdown()
+        now = time.perf_counter()
+        for item in report:
+            item['bytes'] = item['address'].stat().st_size
+
+        print('\n====================================================')
+        print('Wrote output files')
+        for item in report:
+            print(f'\t{item["name"]:<20} {item["bytes"]:>12,} bytes '
+                  f'{1000 * item["seconds"]:>9.1f} ms')
+        print(f'\t{"fsync, all files":<20} {"":>18} '
+              f'{1000 * (now - fsync_start):>9.1f} ms')
+        print(f'\t{"update waited":<20} {"":>18} '
+              f'{1000 * (now - wait_start):>9.1f} ms')
+        print('====================================================\n')
+        self.pending = []
+        return report
+
+
+def timed(write_func, address):
+    '''
+        return seconds taken by write_func(address)
+    '''
+    start = time.perf_counter()
+    write_func(address)
+    return time.perf_counter() - start
@@ -6,8 +6,9 @@
    paths.py script
 '''
 
-import gc
+import time
 
+import numpy as np
 import polars as pl
 import matplotlib.pyplot as plt
 
@@ -15,8 +16,17 @@ from main_script_module import sp_env as sp
 from helper_func_module import plot_func as pf
 from helper_func_module import display_helper_func as dh
 from helper_func_module import display_read_record_dict
-from helper_func_module import display_read_history
 from helper_func_module import display_read_proj_dict
+from helper_func_module import derived_func as dv
+from helper_func_module import scenario_func as sc
+from helper_func_module import montecarlo_func as mc
+from helper_func_module import accuracy_func as ac
+from helper_func_module import revision_func as rv
+from helper_func_module import erp_func as ep
+from helper_func_module import changepoint_func as cp
+from helper_func_module import regression_func as rg
+from helper_func_module import backup_func as bf
+from helper_func_module import publish_func as pb
 
 
 #=================  Global Parameters  ================================
@@ -30,6 +40,19 @@ class Fixed_values_addresses:
     PAGE2_SUPTITLE = " \nEarnings Margin and Equity Premium for the S&P 500"
     PAGE3_SUPTITLE = \
         " \nS&P 500 Forward Earnings Yield, 10-Year TIPS Rate, and Equity Premium"
+    PAGE7_SUPTITLE = \
+        " \nForward Price-Earnings Ratios for the S&P 500 under Price Scenarios"
+    PAGE8_SUPTITLE = \
+        " \nS&P 500 Forward Equity Premium: Simulated Distribution"
+    PAGE9_SUPTITLE = \
+        " \nAccuracy of the Projections of Quarterly Earnings for the S&P 500"
+    PAGE10_SUPTITLE = \
+        " \nWeekly Revisions of the Projected Earnings for the S&P 500"
+    PAGE11_SUPTITLE = \
+        " \nS&P 500 Implied Equity Premium from a Dividend Discount Model"
+    PAGE14_SUPTITLE = \
+        " \nRolling Regressions of S&P 500 Earnings Yields on the 10-Year TIPS Rate"
+    PAGE15_SUPTITLE = " \nDividends, Book Value, and Investment for the S&P 500"
 
     # str: source footnotes for displays
     E_DATA_SOURCE = \
@@ -43,15 +66,56 @@ class Fixed_values_addresses:
     PAGE1_SOURCE = E_DATA_SOURCE
     PAGE2_SOURCE = E_DATA_SOURCE + '\n\n' + RR_DATA_SOURCE
     PAGE3_SOURCE = E_DATA_SOURCE + '\n\n' + RR_DATA_SOURCE
+    PAGE7_SOURCE = E_DATA_SOURCE
+    PAGE8_SOURCE = E_DATA_SOURCE + '\n\n' + RR_DATA_SOURCE
+    PAGE9_SOURCE = E_DATA_SOURCE
+    PAGE10_SOURCE = E_DATA_SOURCE
+    PAGE11_SOURCE = E_DATA_SOURCE + '\n\n' + RR_DATA_SOURCE
+    PAGE14_SOURCE = E_DATA_SOURCE + '\n\n' + RR_DATA_SOURCE
+    PAGE15_SOURCE = E_DATA_SOURCE + '\n\n' + RR_DATA_SOURCE
 
     # hyopothetical quarterly growth factor future stock prices
     ROG = .05
     ROG_AR = int(ROG * 100)
     ROGQ = (1. + ROG) ** (1/4)
-
-    HIST_COL_NAMES = ['date', 'yr_qtr', 'price', 'op_eps', 'rep_eps',
-                    'op_p/e', 'rep_p/e', '12m_op_eps', '12m_rep_eps',
-                    'op_margin', 'real_int_rate']
+    
+    # price scenarios for page 7 and eps_scenarios.parquet
+    # annual growth rates of price: lowest, highest, step
+    ROG_GRID = (-.10, .15, .005)
+    # one-time changes in price, -.1 is a fall of 10%
+    # page 7 shows the shock closest to 0
+    PRICE_SHOCKS = (0., -.10, -.20)
+    
+    # simulated forward equity premium for page 8
+    # and eps_premium_bands.parquet
+    MC_DRAWS = 100_000
+    MC_SEED = 0
+    MC_QUANTILES = (.05, .25, .50, .75, .95)
+    
+    # accuracy of projections for page 9 and eps_accuracy.parquet
+    # horizons, quarters ahead, and window, quarters, of rolling rmse
+    ACCURACY_HORIZONS = [0, 1, 2, 3]
+    ACCURACY_WINDOW = 8
+    
+    # implied equity premium for page 11 and eps_implied_erp.parquet
+    # real growth of dividends: years of projected growth, bounds
+    # of projected growth, and growth after these years
+    # projected growth is nominal, less ERP_INFLATION
+    ERP_YEARS = 5
+    ERP_GROWTH_BOUNDS = (-.20, .20)
+    ERP_TERMINAL_GROWTH = .02
+    ERP_INFLATION = .02
+    
+    # rolling regressions for page 14 and eps_rate_regression.parquet
+    # earnings yield = alpha + beta * TIPS rate, over every window
+    # of REG_WINDOWS quarters; page 14 shows the lines for REG_WINDOW
+    # yields: col in the derived measures, label for page 14
+    REG_WINDOWS = range(20, 81)
+    REG_WINDOW = 20
+    REG_SERIES = {'op_yield': 'trailing operating',
+                  'rep_yield': 'trailing reported',
+                  'fwd_op_yield': 'forward operating',
+                  'fwd_rep_yield': 'forward reported'}
 
     DATA_COLS_RENAME  = {'op_margin': 'margin',
                         'real_int_rate': 'real_rate'}
@@ -70,19 +134,115 @@ def display():
     
     fixed = Fixed_values_addresses()
     env = sp.params
+    # the published generation, resolved once for this run
+    src = pb.resolve(env)
     
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-## +++++++++ Read record_dict, history, proj_dict +++++++++++++++++++++
+## +++++++++ Read manifest, proj_dict, derived measures ++++++++++++++
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     
-    record_dict, date_this_projn, yr_qtr_current_projn = \
-        display_read_record_dict.read(env)
-    
-    data_df, yr_qtr_set = \
-        display_read_history.read(record_dict, env, fixed)
+    date_this_projn, yr_qtr_current_projn = \
+        display_read_record_dict.read(src)
     
     proj_dict, proj_dict_keys_set = \
-        display_read_proj_dict.read(record_dict, yr_qtr_set, env)
+        display_read_proj_dict.read(src)
+    
+    # LazyFrame, the history with the measures computed by
+    # update_data.py, see derived_func.py
+    derived_lf = dv.read(src, proj_dict)
+    
+    # the page 0 panels need a projection for each yr_qtr
+    missing_keys = dh.missing_proj_keys(proj_dict_keys_set)
+    if missing_keys:
+        print('\n============================================')
+        print('In display_data.display():')
+        print(f'No projections for yr_qtrs: {missing_keys}')
+        print('these yr_qtrs are omitted from the displays')
+        print('=> check the manifest and the archived input files')
+        print('============================================\n')
+    
+    # all projections in one LazyFrame, shared by the pages
+    proj_lf = dh.proj_lf(proj_dict)
+    
+    # proj_dict_keys: the dates for the data (x axis)
+    # data in data_lf should conform
+    data_lf = derived_lf.filter(pl.col("yr_qtr")
+                             .is_in(proj_dict_keys_set))
+    
+## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+## +++++++++ Declare the data for all panels ++++++++++++++++++++++++++
+## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # each panel's data is a LazyFrame built from data_lf
+    # pl.collect_all() computes all of them at once, in parallel,
+    # computing the subplans that they share only once
+    
+    # page 0: projected eps for current cy and future cy
+    # subsets of columns for op eps (top panel), rep eps (bottom)
+    # use rows that match keys for proj_dict
+    lazy_frames = dict()
+    for eps in ['12m_op_eps', '12m_rep_eps']:
+        lazy_frames[f'page0 {eps}'] = \
+            dh.page0_df(data_lf.select(['yr_qtr', eps]),
+                        proj_lf, eps)
+    
+    # page 1: historical 12m trailing pe plus
+    #    forward 12m trailing pe, using current p
+    # new lf with cols for p/e and alt p/e, both using 12m trailing E
+        #   also yr_qtr and actual cy
+        #       0) yr_qtr (from df) 
+        #       1) historical 12m trailing p/e (from df)
+        #       2) alt1 using constant p for proj quarters
+        #       3) alt2 using p growing at ROG for proj quarters
+        #       4) rolling 12m E (hist+proj) for proj quarters
+    denom = 'divided by projected earnings'
+    legend1 = f'price (constant after {date_this_projn})\n{denom}'
+    legend2 = f'price (increases {fixed.ROG_AR}% ar after {date_this_projn})\n{denom}'
+    
+    for eps, pe in [('12m_op_eps', 'op_pe_12m'),
+                    ('12m_rep_eps', 'rep_pe_12m')]:
+        p_lf = proj_dict[yr_qtr_current_projn]\
+                    .select(['yr_qtr', eps])\
+                    .lazy()
+        lazy_frames[f'page1 {eps}'] = \
+            dh.page1_df(data_lf.select('yr_qtr', eps, 'price',
+                                       pl.col(pe).alias('pe')),
+                        p_lf, eps, fixed.ROGQ)\
+              .rename({'pe': 'historical',
+                       'fix_proj_p/e': legend1,
+                       'incr_proj_p/e': legend2})
+    
+    # page 2: historical data for margins and 
+    # historical and current estimates for equity premium
+    # quality, ratio: reported / operating E
+    for name in ['margin', 'quality', 'premium']:
+        lazy_frames[f'page2 {name}'] = data_lf.select('yr_qtr', name)
+    
+    # pages 2 and 3: the regimes
+    lazy_frames |= regimes_lfs(derived_lf)
+    
+    # page 3: components of the equity premium,
+    # using 12m forward projected earnings
+    for eps in ['op', 'rep']:
+        lazy_frames[f'page3 {eps}_eps'] = \
+            dh.page3_df(data_lf, eps)\
+              .rename({'earnings / price': 'projected earnings / price'})
+    
+    # pages 7 to 15, see their functions below
+    lazy_frames |= page7_lfs(data_lf)
+    lazy_frames |= page8_lfs(data_lf, derived_lf)
+    lazy_frames |= page9_lfs(fixed, src, proj_lf)
+    lazy_frames |= page10_lfs(src)
+    lazy_frames |= page11_lfs(derived_lf)
+    lazy_frames |= page14_lfs(derived_lf)
+    lazy_frames |= page15_lfs(derived_lf)
+    
+    frames = dict(zip(lazy_frames.keys(),
+                      pl.collect_all(lazy_frames.values())))
+    # a LazyFrame has no pivot, pivot the page 0 data once collected
+    for eps in ['12m_op_eps', '12m_rep_eps']:
+        frames[f'page0 {eps}'] = \
+            dh.page0_pivot(frames[f'page0 {eps}'], eps)
+    write_regimes(env, frames)
         
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## +++++++++ Display the data +++++++++++++++++++++++++++++++++++++++++
@@ -96,11 +256,6 @@ def display():
 # the projections shown for each quarter are the latest
 # made in the quarter
 
-    # proj_dict_keys: the dates for the data (x axis)
-    # data in data_df should conform
-    data_df = data_df.filter(pl.col("yr_qtr")
-                             .is_in(proj_dict_keys_set))
-
     # create graphs
     fig = plt.figure(figsize=(8.5, 11), 
                      layout="constrained")
@@ -112,34 +267,17 @@ def display():
         fontsize=13,
         fontweight='bold')
     fig.supxlabel(fixed.PAGE0_SOURCE, fontsize= 8)
-
-    # subsets of columns for op eps (top panel)
-    # use rows that match keys for proj_dict
-    df = data_df.select(['yr_qtr', '12m_op_eps'])
-    p_dict_columns = ['12m_op_eps', 'yr_qtr']
-    
-    df = dh.page0_df(df, proj_dict, p_dict_columns, '12m_op_eps')\
-                .rename({'12m_op_eps': 'actual'})\
-                .sort(by= 'yr_qtr')
     
     xlabl = '\ndate of projection\n'
     ylabl = '\nearnings per share\n'
     
-    pf.plots_page0(ax['operating'], df,
+    pf.plots_page0(ax['operating'], frames['page0 12m_op_eps'],
                 title= ' \nProjections of Operating EPS',
                 ylim= (100, None),
                 xlabl= xlabl,
                 ylabl= ylabl)
-    
-    # subsets of columns for rep eps (bottom panel)
-    df = data_df.select(['yr_qtr', '12m_rep_eps'])
-    p_dict_columns = ['12m_rep_eps', 'yr_qtr']
-    
-    df = dh.page0_df(df, proj_dict, p_dict_columns, '12m_rep_eps')\
-                .rename({'12m_rep_eps': 'actual'})\
-                .sort(by= 'yr_qtr')
 
-    pf.plots_page0(ax['reported'], df,
+    pf.plots_page0(ax['reported'], frames['page0 12m_rep_eps'],
                 title= ' \nProjections of Reported EPS',
                 ylim= (75, None),
                 xlabl= xlabl,
@@ -151,9 +289,6 @@ def display():
     print('============================\n')
     fig.savefig(str(env.DISPLAY_0_ADDR))
     
-    del df
-    gc.collect()
-    
 # page one  ======================
 # shows:  historical 12m trailing pe plus
 #    forward 12m trailing pe, using current p
@@ -170,54 +305,19 @@ def display():
         fontweight='bold')
     fig.supxlabel(fixed.PAGE1_SOURCE, fontsize= 8)
     
-    # create the top and bottom graphs for op and rep pe
-    # new DF with cols for p/e and alt p/e, both using 12m trailing E
-        #   also yr_qtr and actual cy
-        #       0) yr_qtr (from df) 
-        #       1) historical 12m trailing p/e (from df)
-        #       2) alt1 using constant p for proj quarters
-        #       3) alt2 using p growing at ROG for proj quarters
-        #       4) rolling 12m E (hist+proj) for proj quarters
-    
     # top panel
-    df = data_df.select(['yr_qtr', '12m_op_eps', 'price'])
-               
-    p_df = proj_dict[yr_qtr_current_projn]\
-                .select(['yr_qtr', '12m_op_eps'])
-    
-    df = dh.page1_df(df, p_df, '12m_op_eps', fixed.ROGQ )
-    
-    denom = 'divided by projected earnings'
-    legend1 = f'price (constant after {date_this_projn})\n{denom}'
-    legend2 = f'price (increases {fixed.ROG_AR}% ar after {date_this_projn})\n{denom}'
-    
-    df = df.rename({'pe': 'historical',
-               'fix_proj_p/e': legend1,
-               'incr_proj_p/e': legend2})
-    
     title = 'Ratio: Price to 12-month Trailing Operating Earnings'
    
-    pf.plots_page1(ax['operating'], df,
+    pf.plots_page1(ax['operating'], frames['page1 12m_op_eps'],
                     ylim= (None, None),
                     title= title,
                     ylabl= ' \n',
                     xlabl= ' \n')
 
     # bottom panel
-    df = data_df.select(['yr_qtr', '12m_rep_eps', 'price'])
-    
-    p_df = proj_dict[yr_qtr_current_projn]\
-               .select(['yr_qtr', '12m_rep_eps'])
-    
-    df = dh.page1_df(df, p_df, '12m_rep_eps', fixed.ROGQ )
-    
-    df = df.rename({'pe': 'historical',
-                    'fix_proj_p/e': legend1,
-                    'incr_proj_p/e': legend2})
-    
     title = 'Ratio: Price to 12-month Trailing Reported Earnings'
     
-    pf.plots_page1(ax['reported'], df,
+    pf.plots_page1(ax['reported'], frames['page1 12m_rep_eps'],
                     ylim= (None, None),
                     title= title,
                     ylabl= ' \n',
@@ -228,9 +328,6 @@ def display():
     print('============================\n')
     fig.savefig(str(env.DISPLAY_1_ADDR))
     
-    del df
-    gc.collect()
-    
 # page two  ======================
 # shows:  historical data for margins and 
 # historical and current estimates for equity premium
@@ -249,64 +346,35 @@ def display():
     fig.supxlabel(fixed.PAGE2_SOURCE, fontsize= 8)
     
     # create the top and bottom graphs for margins and premiums
-    # create working df for op margins (top panel)
-
-    df = data_df.rename({'op_margin' : 'margin'})\
-                .select('yr_qtr', 'margin')\
-                .with_columns((pl.col('margin') * 100)
-                            .alias('margin100'))\
-                .drop('margin')\
-                .rename({'margin100': 'margin'})\
-                .sort(by= 'yr_qtr')
-    
     title = 'Margin: quarterly operating earnings relative to revenue'
     
-    pf.plots_page2(ax['margin'], df,
+    pf.plots_page2(ax['margin'], frames['page2 margin'],
                     ylim= (None, None),
                     title= title,
                     ylabl= ' \npercent\n ',
                     xlabl= ' \n ',
-                    hrzntl_vals= [10.0])
-    
-    # create working df for ratio: reported / operating E
-    df = data_df.rename({'12m_rep_eps': 'reported',
-                         '12m_op_eps': 'operating'})\
-                .select('yr_qtr', 'reported', 'operating')\
-                .with_columns((pl.col('reported') / 
-                               pl.col('operating') * 100)
-                              .cast(pl.Int8)
-                              .alias('quality'))\
-                .drop('reported', 'operating')\
-                .sort(by= 'yr_qtr')
+                    hrzntl_vals= [10.0],
+                    regime= regime(frames, 'page2 margin', 'margin'))
+    
     title = 'Quality of Earnings: ratio of 12-month reported to operating earnings'
     
-    pf.plots_page2(ax['quality'], df,
+    pf.plots_page2(ax['quality'], frames['page2 quality'],
                     ylim= (None, None),
                     title= title,
                     ylabl= ' \npercent\n ',
                     xlabl= ' \n ',
                     hrzntl_vals= [80, 90])
 
-    # create working df for premia (bottom panel)
-    df = data_df.rename({'real_int_rate' : 'real_rate'})\
-                .select('yr_qtr', '12m_rep_eps', 
-                        'real_rate', 'price')\
-                .with_columns(((pl.col('12m_rep_eps') /
-                                pl.col('price')) * 100 -
-                                pl.col('real_rate'))
-                            .alias('premium'))\
-                .drop('12m_rep_eps', 'real_rate', 'price')\
-                .sort(by= 'yr_qtr')
-
     title = 'Equity Premium: \nratio of 12-month trailing reported earnings to price, '
     title += 'less 10-year TIPS rate'
 
-    pf.plots_page2(ax['premium'], df,
+    pf.plots_page2(ax['premium'], frames['page2 premium'],
                     ylim= (None, None),
                     title= title,
                     ylabl= ' \npercent\n ',
                     xlabl= ' \n ',
-                    hrzntl_vals= [2.0, 4.0])
+                    hrzntl_vals= [2.0, 4.0],
+                    regime= regime(frames, 'page2 premium', 'premium'))
     
     print('\n============================')
     print(env.DISPLAY_2_ADDR)
@@ -314,9 +382,6 @@ def display():
     fig.savefig(str(env.DISPLAY_2_ADDR))
     #plt.savefig(f'{output_dir}/eps_page2.pdf', bbox_inches='tight')
     
-    del df
-    gc.collect()
-    
 # page three  ======================
 # shows:  components of the equity premium,
 # using 12m forward projected earnings
@@ -337,46 +402,28 @@ def display():
     ylabl = ' \npercent\n '
     
     # create the top and bottom graphs for premiums
-
-    # create working df for op premium (top panel)
-    # add a col: proj eps over the next 4 qtrs
-    df = data_df.select('yr_qtr', 'price', 'real_int_rate',
-                        'op_eps')
-    df = dh.contemp_12m_fwd_proj(data_df, proj_dict,
-                                 'op_eps', 'fwd_12mproj_op_eps')
-    
-    df = dh.page3_df(df, 'fwd_12mproj_op_eps')
-    
-    df = df.rename({'earnings / price': 'projected earnings / price'})
-    
     title = 'Operating Earnings: projected over next 4 quarters'
 
-    pf.plots_page3(ax['operating'], df,
+    pf.plots_page3(ax['operating'], frames['page3 op_eps'],
                 ylim= (None, 9),
                 title= title,
                 ylabl= ylabl,
                 xlabl= xlabl,
-                hrzntl_vals= [2.0, 4.0])
+                hrzntl_vals= [2.0, 4.0],
+                regime= regime(frames, 'page3 op_eps',
+                               'fwd_op_premium'))
     
     # bottom panel
-    df = data_df.select('yr_qtr', 'price', 'real_int_rate',
-                        'rep_eps')
-    
-    # add a col : proj eps over the next 4 qtrs
-    df = dh.contemp_12m_fwd_proj(data_df, proj_dict,
-                                 'rep_eps', 'fwd_12mproj_rep_eps')
-    df = dh.page3_df(df, 'fwd_12mproj_rep_eps')
-    
-    df = df.rename({'earnings / price': 'projected earnings / price'})
-    
     title = 'Reported Earnings: projected over next 4 quarters'
 
-    pf.plots_page3(ax['reported'], df,
+    pf.plots_page3(ax['reported'], frames['page3 rep_eps'],
                 ylim= (None, 9),
                 title= title,
                 ylabl= ylabl,
                 xlabl= xlabl,
-                hrzntl_vals= [2.0, 4.0])
+                hrzntl_vals= [2.0, 4.0],
+                regime= regime(frames, 'page3 rep_eps',
+                               'fwd_rep_premium'))
     
     print('\n============================')
     print(env.DISPLAY_3_ADDR)
@@ -384,7 +431,629 @@ def display():
     fig.savefig(str(env.DISPLAY_3_ADDR))
     #plt.savefig(f'{output_dir}/eps_page3.pdf', bbox_inches='tight')
     
-    del df
-    gc.collect()
+    page7(env, fixed, frames, proj_dict[yr_qtr_current_projn],
+          date_this_projn)
+    page8(env, fixed, frames, date_this_projn)
+    page9(env, fixed, frames, date_this_projn)
+    page10(env, fixed, frames, date_this_projn)
+    page11(env, fixed, frames, date_this_projn)
+    page14(env, fixed, frames, date_this_projn)
+    page15(env, fixed, frames, date_this_projn)
     
     return
+
+
+# ================  PAGES =============================================+
+# each page after page three has two functions
+#   pageN_lfs() returns a dict of the LazyFrames that the page needs,
+#       display() collects the LazyFrames of all pages at once
+#   pageN() computes the page's measures from the collected frames,
+#       writes its table to display_dir, and saves the page
+
+def regimes_lfs(derived_lf):
+    '''
+        pages 2 and 3: the segment means between change points,
+        over the full history, see changepoint_func.py
+    '''
+    regime_cols = [f'{col}_regime' for col in dv.REGIME_COLS]
+    return {'regimes': derived_lf.select('yr_qtr', *regime_cols)
+                                 .sort(by= 'yr_qtr')}
+
+
+def write_regimes(env, frames):
+    '''
+        write the segments of the regimes to env.REGIME_ADDR
+    '''
+    regime_cols = [f'{col}_regime' for col in dv.REGIME_COLS]
+    bf.write_replace(env.REGIME_ADDR,
+                     cp.segments(frames['regimes'], regime_cols)
+                       .write_parquet)
+    print('\n============================')
+    print(env.REGIME_ADDR)
+    print('============================\n')
+    return
+
+
+def regime(frames, key, col):
+    '''
+        return df, the segment means of col
+        for the yr_qtrs of frames[key]
+    '''
+    return frames[key].select('yr_qtr')\
+                      .join(frames['regimes']
+                              .select('yr_qtr', f'{col}_regime'),
+                            on= 'yr_qtr',
+                            how= 'left')
+
+
+# page seven  ======================
+# shows:  forward p/e for each growth rate of price,
+# using the projections of 12m trailing earnings
+
+def page7_lfs(data_lf):
+    '''
+        latest price with 12m trailing E, for the price scenarios
+    '''
+    return {'page7 base':
+                data_lf.select('yr_qtr', 'price',
+                               '12m_op_eps', '12m_rep_eps')
+                       .sort(by= 'yr_qtr')}
+
+
+def page7(env, fixed, frames, p_df, date_this_projn):
+    '''
+        p_df: the projections of the current yr_qtr
+        every price scenario at once, scenario x quarter
+    '''
+    growth, shocks = sc.scenarios(sc.growth_grid(*fixed.ROG_GRID),
+                                  fixed.PRICE_SHOCKS)
+    shock = min(fixed.PRICE_SHOCKS, key= abs)
+    heatmap_dfs = dict()
+    scenario_dfs = []
+    for eps in ['12m_op_eps', '12m_rep_eps']:
+        base_price = frames['page7 base']\
+                        .filter(pl.col(eps).is_not_null())['price'][-1]
+        eps_df = p_df.select('yr_qtr', eps)\
+                     .sort(by= 'yr_qtr')
+        scenario_df = sc.paths_df(eps_df['yr_qtr'], growth, shocks,
+                                  sc.paths(base_price, eps_df[eps],
+                                           growth, shocks))
+        heatmap_dfs[eps] = sc.heatmap_df(scenario_df, 'pe', shock)
+        scenario_dfs.append(scenario_df.select(pl.lit(eps).alias('eps'),
+                                               pl.all()))
+    bf.write_replace(env.SCENARIO_ADDR,
+                     pl.concat(scenario_dfs).write_parquet)
+    print('\n============================')
+    print(env.SCENARIO_ADDR)
+    print('============================\n')
+
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    # upper and lower plots
+    ax = fig.subplot_mosaic([['operating'],
+                             ['reported']])
+    fig.suptitle(
+        f'{fixed.PAGE7_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE7_SOURCE, fontsize= 8)
+
+    xlabl = '\nprojected quarter\n'
+    ylabl = f'\nannual growth of price after {date_this_projn}\n'
+    if shock:
+        ylabl += f'following a {shock:+.0%} change in price\n'
+    ylabl += 'percent\n'
+
+    title = 'Price to 12-month Trailing Projected Operating Earnings'
+
+    pf.plots_page7(ax['operating'], heatmap_dfs['12m_op_eps'],
+                   title= title,
+                   xlabl= xlabl,
+                   ylabl= ylabl,
+                   cbar_labl= 'p/e',
+                   contour_vals= [15, 17.5, 20, 22.5, 25, 27.5, 30],
+                   hrzntl_vals= [0., fixed.ROG * 100])
+
+    title = 'Price to 12-month Trailing Projected Reported Earnings'
+
+    pf.plots_page7(ax['reported'], heatmap_dfs['12m_rep_eps'],
+                   title= title,
+                   xlabl= xlabl,
+                   ylabl= ylabl,
+                   cbar_labl= 'p/e',
+                   contour_vals= [15, 17.5, 20, 22.5, 25, 27.5, 30],
+                   hrzntl_vals= [0., fixed.ROG * 100])
+
+    print('\n============================')
+    print(env.DISPLAY_7_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_7_ADDR))
+    return
+
+
+# page eight  ======================
+# shows:  the distribution of the forward equity premium of page 3,
+# drawing errors of projected earnings and changes in the TIPS rate
+# from their histories
+
+def page8_lfs(data_lf, derived_lf):
+    '''
+        the forward equity premium of page 3, and the full history,
+        for the errors of projections and the changes in the TIPS rate
+    '''
+    lazy_frames = dict()
+    for eps in ['op', 'rep']:
+        lazy_frames[f'page8 {eps}_eps'] = \
+            data_lf.select('yr_qtr', f'fwd_12mproj_{eps}_eps',
+                           'price', 'real_int_rate',
+                           f'fwd_{eps}_premium')\
+                   .drop_nulls(subset= f'fwd_12mproj_{eps}_eps')\
+                   .sort(by= 'yr_qtr')
+    lazy_frames['page8 history'] = derived_lf.sort(by= 'yr_qtr')
+    return lazy_frames
+
+
+def page8(env, fixed, frames, date_this_projn):
+    '''
+        quantiles of the simulated forward equity premium,
+        all yr_qtrs and draws at once, yr_qtr x draw
+    '''
+    start = time.perf_counter()
+    rng = np.random.default_rng(fixed.MC_SEED)
+    changes = mc.rate_changes(frames['page8 history'])
+    band_dfs = dict()
+    for eps in ['op', 'rep']:
+        df = frames[f'page8 {eps}_eps']
+        draws = mc.premium_draws(df[f'fwd_12mproj_{eps}_eps'],
+                                 df['price'],
+                                 df['real_int_rate'],
+                                 mc.projection_errors(
+                                     frames['page8 history'], eps),
+                                 changes,
+                                 fixed.MC_DRAWS, rng)
+        band_dfs[eps] = \
+            mc.quantile_df(df['yr_qtr'], draws, fixed.MC_QUANTILES)\
+              .insert_column(1, df[f'fwd_{eps}_premium']
+                                  .alias('projected premium'))
+    bf.write_replace(env.PREMIUM_BANDS_ADDR,
+                     pl.concat([df.select(pl.lit(f'{eps}_eps')
+                                            .alias('eps'),
+                                          pl.all())
+                                for eps, df in band_dfs.items()])
+                       .write_parquet)
+    print('\n============================')
+    print(env.PREMIUM_BANDS_ADDR)
+    print(f'{fixed.MC_DRAWS:,} draws for each quarter, '
+          f'{1000 * (time.perf_counter() - start):.1f} ms')
+    print('============================\n')
+
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    # upper and lower plots
+    ax = fig.subplot_mosaic([['operating'],
+                             ['reported']])
+    fig.suptitle(
+        f'{fixed.PAGE8_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE8_SOURCE, fontsize= 8)
+
+    xlabl = '\nquarter of projection, price, and TIPS rate\n\n'
+    ylabl = ' \npercent\n '
+
+    title = 'Operating Earnings: projected over next 4 quarters,\n'
+    title += f'quantiles of {fixed.MC_DRAWS:,} draws'
+
+    pf.plots_page8(ax['operating'], band_dfs['op'],
+                   title= title,
+                   ylabl= ylabl,
+                   xlabl= xlabl,
+                   hrzntl_vals= [2.0, 4.0])
+
+    title = 'Reported Earnings: projected over next 4 quarters,\n'
+    title += f'quantiles of {fixed.MC_DRAWS:,} draws'
+
+    pf.plots_page8(ax['reported'], band_dfs['rep'],
+                   title= title,
+                   ylabl= ylabl,
+                   xlabl= xlabl,
+                   hrzntl_vals= [2.0, 4.0])
+
+    print('\n============================')
+    print(env.DISPLAY_8_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_8_ADDR))
+    return
+
+
+# page nine  ======================
+# shows:  errors of the projections of quarterly eps, relative to
+# the eps realized, by the number of quarters projected ahead
+
+def page9_lfs(fixed, src, proj_lf):
+    '''
+        accuracy of the projections, each projection joined
+        with the eps realized, see accuracy_func.py
+    '''
+    pairs_lf = ac.read(src, proj_lf)
+    lazy_frames = {'page9 horizon': ac.by_horizon(pairs_lf)}
+    for eps in ['op', 'rep']:
+        lazy_frames[f'page9 {eps}_eps'] = \
+            ac.rolling_rmse(pairs_lf, eps,
+                            fixed.ACCURACY_HORIZONS,
+                            fixed.ACCURACY_WINDOW)
+    return lazy_frames
+
+
+def page9(env, fixed, frames, date_this_projn):
+    '''
+        errors by horizon, and the rolling rmse of each horizon
+    '''
+    bf.write_replace(env.ACCURACY_ADDR,
+                     frames['page9 horizon'].write_parquet)
+    print('\n============================')
+    print(env.ACCURACY_ADDR)
+    print('============================\n')
+
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    ax = fig.subplot_mosaic([['op_horizon', 'rep_horizon'],
+                             ['op_rolling', 'op_rolling'],
+                             ['rep_rolling', 'rep_rolling']])
+    fig.suptitle(
+        f'{fixed.PAGE9_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE9_SOURCE, fontsize= 8)
+
+    xlabl = '\nquarters ahead of the projection\n'
+    ylabl = ' \npercent of realized eps\n '
+    for eps, name in [('op', 'Operating'), ('rep', 'Reported')]:
+        pf.plots_page9_horizon(
+            ax[f'{eps}_horizon'],
+            frames['page9 horizon']
+                .select('horizon',
+                        pl.col(f'{eps}_bias').alias('bias'),
+                        pl.col(f'{eps}_mae').alias('mean abs error'),
+                        pl.col(f'{eps}_rmse').alias('rmse')),
+            title= f'{name} EPS',
+            xlabl= xlabl,
+            ylabl= ylabl)
+
+    xlabl = '\nquarter projected\n'
+    for eps, name in [('op', 'Operating'), ('rep', 'Reported')]:
+        title = f'{name} EPS: rmse of the projections for the '
+        title += f'latest {fixed.ACCURACY_WINDOW} quarters'
+        # a LazyFrame has no pivot, pivot once collected
+        pf.plots_page9_rolling(ax[f'{eps}_rolling'],
+                               ac.rolling_pivot(frames[f'page9 {eps}_eps']),
+                               title= title,
+                               xlabl= xlabl,
+                               ylabl= ylabl)
+
+    print('\n============================')
+    print(env.DISPLAY_9_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_9_ADDR))
+    return
+
+
+# page ten  ======================
+# shows:  the 12m eps projected for the next calendar year in each
+# input file, the weekly revisions of it, and the breadth of revisions
+
+def page10_lfs(src):
+    '''
+        weekly revisions, from the projections in every input file,
+        see revision_func.py, none if src has no vintages
+    '''
+    revision_lf = rv.read(src)
+    if revision_lf is None:
+        return dict()
+    return {'page10': revision_lf}
+
+
+def page10(env, fixed, frames, date_this_projn):
+    '''
+        levels, momentum, and breadth of the revisions
+    '''
+    if 'page10' not in frames:
+        return
+    df = frames['page10']
+    bf.write_replace(env.REVISION_ADDR, df.write_parquet)
+    print('\n============================')
+    print(env.REVISION_ADDR)
+    print('============================\n')
+
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    ax = fig.subplot_mosaic([['level'],
+                             ['momentum'],
+                             ['breadth']])
+    fig.suptitle(
+        f'{fixed.PAGE10_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE10_SOURCE, fontsize= 8)
+
+    xlabl = '\ndate of the projections\n'
+    pf.plots_page10(ax['level'],
+                    df.select('date',
+                              pl.col('op_fwd').alias('operating'),
+                              pl.col('rep_fwd').alias('reported')),
+                    title= '12-month EPS projected for the next year',
+                    xlabl= xlabl,
+                    ylabl= ' \nearnings per share\n ')
+    pf.plots_page10(ax['momentum'],
+                    df.select('date',
+                              pl.col('op_momentum').alias('operating'),
+                              pl.col('rep_momentum').alias('reported')),
+                    title= 'Revision momentum: mean of the latest '
+                           f'{rv.MOMENTUM_WEEKS} weekly revisions',
+                    xlabl= xlabl,
+                    ylabl= ' \npercent\n ',
+                    hrzntl_vals= [0])
+    pf.plots_page10(ax['breadth'],
+                    df.select('date',
+                              pl.col('op_breadth').alias('operating'),
+                              pl.col('rep_breadth').alias('reported')),
+                    title= 'Revision breadth: quarters revised up '
+                           'less quarters revised down',
+                    xlabl= xlabl,
+                    ylabl= ' \npercent of quarters\n ',
+                    hrzntl_vals= [0])
+
+    print('\n============================')
+    print(env.DISPLAY_10_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_10_ADDR))
+    return
+
+
+# page eleven  ======================
+# shows:  the equity premium implied by price, dividends, and projected
+# earnings, with the premium of page three, for the quarters with a
+# TIPS rate
+
+def page11_lfs(derived_lf):
+    '''
+        all quarters since 1988, for the implied premium
+    '''
+    return {'page11':
+                derived_lf.select('yr_qtr', 'price', '12m_div_ps',
+                                  'real_int_rate',
+                                  '12m_op_eps', 'fwd_12mproj_op_eps',
+                                  '12m_rep_eps', 'fwd_12mproj_rep_eps',
+                                  'fwd_op_premium', 'fwd_rep_premium')
+                          .sort(by= 'yr_qtr')}
+
+
+def page11(env, fixed, frames, date_this_projn):
+    '''
+        the implied return in every quarter at once, see erp_func.py
+    '''
+    erp_df = frames['page11'].select('yr_qtr', 'real_int_rate',
+                                     'fwd_op_premium', 'fwd_rep_premium')
+    for eps in ['op', 'rep']:
+        erp_df = erp_df.join(
+            ep.erp_df(frames['page11'], eps,
+                      fixed.ERP_YEARS,
+                      fixed.ERP_TERMINAL_GROWTH,
+                      fixed.ERP_INFLATION,
+                      fixed.ERP_GROWTH_BOUNDS),
+            on= 'yr_qtr',
+            how= 'left')
+    bf.write_replace(env.IMPLIED_ERP_ADDR, erp_df.write_parquet)
+    print('\n============================')
+    print(env.IMPLIED_ERP_ADDR)
+    print('============================\n')
+
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    ax = fig.subplot_mosaic([['op'],
+                             ['rep'],
+                             ['return']])
+    fig.suptitle(
+        f'{fixed.PAGE11_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE11_SOURCE, fontsize= 8)
+
+    df = erp_df.drop_nulls(subset= 'real_int_rate')
+    xlabl = '\nyear\n'
+    ylabl = ' \npercent\n '
+    for eps, name in [('op', 'Operating'), ('rep', 'Reported')]:
+        pf.plots_page11(ax[eps],
+                        df.select('yr_qtr',
+                                  pl.col(f'{eps}_erp')
+                                    .alias('implied premium'),
+                                  pl.col(f'fwd_{eps}_premium')
+                                    .alias('fwd yield less TIPS')),
+                        title= f'{name} EPS: dividends growing at the '
+                               f'projected rate for {fixed.ERP_YEARS} '
+                               f'years, then '
+                               f'{fixed.ERP_TERMINAL_GROWTH:.1%}',
+                        xlabl= xlabl,
+                        ylabl= ylabl,
+                        hrzntl_vals= [0])
+    pf.plots_page11(ax['return'],
+                    df.select('yr_qtr',
+                              pl.col('op_return')
+                                .alias('implied return, op'),
+                              pl.col('rep_return')
+                                .alias('implied return, rep'),
+                              pl.col('real_int_rate')
+                                .alias('10-year TIPS')),
+                    title= 'Implied real return and the TIPS rate',
+                    xlabl= xlabl,
+                    ylabl= ylabl,
+                    hrzntl_vals= [0])
+
+    print('\n============================')
+    print(env.DISPLAY_11_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_11_ADDR))
+    return
+
+
+# page fourteen  ======================
+# shows:  the rolling regressions of the earnings yields on the TIPS
+# rate, the slope and fit for the windows of REG_WINDOW quarters,
+# and the slope of the trailing reported yield for every window
+
+def page14_lfs(derived_lf):
+    '''
+        the earnings yields and the TIPS rate, all quarters
+    '''
+    return {'page14':
+                derived_lf.select('yr_qtr', 'real_int_rate',
+                                  *[(pl.col(f'12m_{eps}_eps') * 100 /
+                                     pl.col('price'))
+                                      .alias(f'{eps}_yield')
+                                    for eps in ['op', 'rep']],
+                                  'fwd_op_yield', 'fwd_rep_yield')
+                          .sort(by= 'yr_qtr')}
+
+
+def page14(env, fixed, frames, date_this_projn):
+    '''
+        every window length at once, from cumulative sums,
+        see regression_func.py
+    '''
+    reg_df = rg.regression_df(frames['page14'],
+                              list(fixed.REG_SERIES),
+                              fixed.REG_WINDOWS)
+    bf.write_replace(env.REGRESSION_ADDR, reg_df.write_parquet)
+    print('\n============================')
+    print(env.REGRESSION_ADDR)
+    print('============================\n')
+
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    ax = fig.subplot_mosaic([['beta'],
+                             ['r2'],
+                             ['windows']])
+    fig.suptitle(
+        f'{fixed.PAGE14_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE14_SOURCE, fontsize= 8)
+
+    xlabl = '\nlast quarter of the window\n'
+    window_df = reg_df.filter(pl.col('window') == fixed.REG_WINDOW)
+    for col, title, ylabl in [
+            ('beta', 'Slope: change of the yield per point '
+                     'of TIPS',
+             ' \npercentage points\n '),
+            ('r2', 'Fit: R\u00b2 of the regression',
+             ' \nshare of variance\n ')]:
+        df = window_df.pivot(on= 'series', index= 'yr_qtr', values= col)\
+                      .sort(by= 'yr_qtr')
+        pf.plots_page11(ax[col],
+                        df.select('yr_qtr',
+                                  *[pl.col(name).alias(label)
+                                    for name, label
+                                    in fixed.REG_SERIES.items()
+                                    if name in df.columns]),
+                        title= f'{title}, windows of '
+                               f'{fixed.REG_WINDOW} quarters',
+                        xlabl= xlabl,
+                        ylabl= ylabl,
+                        hrzntl_vals= [0])
+
+    values, windows, yq = rg.pivot(reg_df, 'rep_yield', 'beta')
+    pf.plots_page14(ax['windows'], values, windows, yq,
+                    title= 'Slope for the trailing reported yield, '
+                           'every window',
+                    xlabl= xlabl,
+                    ylabl= ' \nquarters in the window\n ',
+                    cbar_labl= 'slope')
+
+    print('\n============================')
+    print(env.DISPLAY_14_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_14_ADDR))
+    return
+
+
+# page fifteen  ======================
+# shows:  the fundamentals of the S&P 500 from the quarterly
+# dividends, sales, book value, capex, and divisor
+
+def page15_lfs(derived_lf):
+    '''
+        the fundamentals, all quarters since 1988,
+        see fundamentals_func.py
+    '''
+    return {'page15':
+                derived_lf.select('yr_qtr', 'real_int_rate',
+                                  'div_yield', 'div_premium',
+                                  'payout_op', 'payout_rep',
+                                  'price_to_book',
+                                  'capex_intensity', 'share_growth')
+                          .sort(by= 'yr_qtr')}
+
+
+def page15(env, fixed, frames, date_this_projn):
+    '''
+        dividends, payout, price-to-book, and investment
+    '''
+    # create graphs
+    fig = plt.figure(figsize=(8.5, 11),
+                     layout="constrained")
+    ax = fig.subplot_mosaic([['dividends'],
+                             ['payout'],
+                             ['book'],
+                             ['capex']])
+    fig.suptitle(
+        f'{fixed.PAGE15_SUPTITLE}\n{date_this_projn}\n',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE15_SOURCE, fontsize= 8)
+
+    xlabl = '\nyear\n'
+    ylabl = ' \npercent\n '
+    # key: title, ylabl, cols: labels
+    panels = {
+        'dividends': ('Dividend yield, trailing 4 quarters, '
+                      'and the TIPS rate',
+                      ylabl,
+                      {'div_yield': 'dividend yield',
+                       'real_int_rate': '10-year TIPS',
+                       'div_premium': 'dividend yield less TIPS'}),
+        'payout': ('Payout ratio: dividends / earnings, '
+                   'trailing 4 quarters',
+                   ylabl,
+                   {'payout_op': 'operating',
+                    'payout_rep': 'reported'}),
+        'book': ('Price-to-book ratio',
+                 ' \nratio\n ',
+                 {'price_to_book': 'price / book value'}),
+        'capex': ('Capital expenditures / sales, and the growth '
+                  'of the index divisor',
+                  ylabl,
+                  {'capex_intensity': 'capex / sales, 4 quarters',
+                   'share_growth': 'divisor, change over 4 quarters'})}
+    for key, (title, ylabl_, cols) in panels.items():
+        df = frames['page15']\
+                .select('yr_qtr', *[pl.col(col).alias(label)
+                                    for col, label in cols.items()])\
+                .filter(pl.any_horizontal(pl.exclude('yr_qtr')
+                                            .is_not_null()))
+        pf.plots_page11(ax[key], df,
+                        title= title,
+                        xlabl= xlabl,
+                        ylabl= ylabl_,
+                        hrzntl_vals= [0] if key != 'book' else None)
+
+    print('\n============================')
+    print(env.DISPLAY_15_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_15_ADDR))
+    return
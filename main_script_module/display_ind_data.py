@@ -11,6 +11,11 @@ import numpy as np
 
 from main_script_module import sp_env as sp
 from helper_func_module import display_ind_data_read_df
+from helper_func_module import publish_func as pb
+from helper_func_module import corr_func as cr
+from helper_func_module import ind_stats_func as xs
+from helper_func_module import decomp_func as dc
+from helper_func_module import plot_ind_func as pf
 
 @dataclass(frozen= True)
 class Fixed_values:
@@ -22,6 +27,12 @@ class Fixed_values:
         "the Industries Within the S&P 500"
     PAGE6_SUPTITLE = \
         "\nEach Industry's Share of Total Earnings for the Industries in the S&P 500"
+    PAGE12_SUPTITLE = \
+        "\nRolling Correlations among the Industries Within the S&P 500"
+    PAGE13_SUPTITLE = \
+        "\nEach Industry's Contribution to the Changes in Total " +\
+        "Operating Earnings\nand in the Aggregate P/E " +\
+        "for the Industries in the S&P 500"
 
     # str: source footnotes for displays
     E_DATA_SOURCE = \
@@ -38,6 +49,11 @@ class Fixed_values:
         "earnings for the industries. The S&P 500's P/E is not the " +\
         "average of the industries' P/Es.\n "
     PAGE5_SOURCE = '\n' + E_DATA_SOURCE
+    PAGE13_SOURCE = '\n' + E_DATA_SOURCE + '\n' +\
+        "the aggregate P/E is the sum of the industries' P/Es, " +\
+        "each weighted by its share of total earnings\n" +\
+        "the change of the P/E is the sum of each industry's " +\
+        "change of P/E (valuation) and change of weight (mix)\n "
 
     XLABL = 'end of year'
 
@@ -47,13 +63,23 @@ def display_ind():
     
     fixed = Fixed_values()
     env = sp.params
+    # the published generation, resolved once for this run
+    src = pb.resolve(env)
     
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## ++++++ Read Industry data ++++++++++++++++++++++++++++++++++++++++++
 ## ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
     ind_df, op_e_df, year, DATE_THIS_PROJECTION = \
-        display_ind_data_read_df.read(env, fixed)
+        display_ind_data_read_df.read(src, fixed)
+    
+    # cross-sectional statistics, precomputed at update time,
+    # see ind_stats_func.py, of the industries in ind_df,
+    # the same as the dots of page 4
+    industries = [name.removesuffix('_op_pe') for name in ind_df.columns
+                  if name.endswith('_op_pe') and
+                     not name.startswith('SP500')]
+    stats_df = xs.by_year(xs.read(src), 'op_pe', industries).collect()
     
     '''
 # SCATTER PLOTS ++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -137,6 +163,23 @@ def display_ind():
                    label= 'SP500',
                    marker="|", s=4, linewidth=25
 )
+    
+    # the years of op_e_df and stats_df are in the same order,
+    # positions 0, 1, ... on the categorical x axis
+    positions = range(stats_df.height)
+    ax.fill_between(positions, stats_df['q1'], stats_df['q3'],
+                    color= 'grey', alpha= 0.15, zorder= 0,
+                    label= 'interquartile range')
+    ax.plot(positions, stats_df['median'],
+            color= 'black', linewidth= 1, linestyle= '--',
+            label= 'median')
+    for pos, dispersion in zip(positions, stats_df['dispersion']):
+        ax.annotate(f'{dispersion:.2f}', (pos, 60),
+                    xytext= (0, -10), textcoords= 'offset points',
+                    ha= 'center', fontsize= 7)
+    ax.annotate('dispersion, IQR / median', (0, 60),
+                xytext= (0, -20), textcoords= 'offset points',
+                fontsize= 7)
     plt.xticks(rotation = 30)
     ax.set_ylim(ymin= -50, ymax= 60)
     ax.set_xlabel(fixed.XLABL, fontweight= 'bold')
@@ -326,6 +369,137 @@ def display_ind():
     print(env.DISPLAY_6_ADDR)
     print('============================\n')
     fig.savefig(str(env.DISPLAY_6_ADDR))
+    
+    del fig
+    del ax
+    gc.collect()
+    
+# ROLLING CORRELATIONS ++++++++++++++++++++++++++++++++++++++++++++++++
+    # PAGE 12
+    # the correlations for each window of cr.WINDOW years,
+    # precomputed at update time, see corr_func.py
+    
+    corr_df, industries = cr.read(src)
+    ind_labels = [name.replace("_", " ") for name in industries]
+    panel_names = {'pe': 'operating P/E',
+                   'eps': 'growth of operating EPS'}
+    
+    fig = plt.figure(figsize=(8.5, 11), 
+                     layout="constrained")
+    ax = fig.subplot_mosaic([['mean', 'mean'],
+                             ['pe first', 'pe last'],
+                             ['eps first', 'eps last']],
+                            height_ratios= [1, 1.4, 1.4])
+    fig.suptitle(
+        '\n' + fixed.PAGE12_SUPTITLE + 
+        f'\nwindows of {cr.WINDOW} years',
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE5_SOURCE + '\n ', fontsize= 8)
+    
+    # mean correlation among distinct industries, each window
+    mean_df = cr.mean_corr(corr_df)
+    for panel in cr.PANELS:
+        ax['mean'].plot(mean_df['year'], mean_df[panel],
+                        marker= '.',
+                        label= panel_names[panel])
+    ax['mean'].set_title('Mean correlation between industries',
+                         fontweight= 'bold', loc= 'left')
+    ax['mean'].set_xlabel('last year of window', fontweight= 'bold')
+    ax['mean'].tick_params(labelsize= 8)
+    ax['mean'].legend(fontsize= 8, loc= 'upper left')
+    
+    # the first and latest windows of each panel
+    for panel in cr.PANELS:
+        panel_df = corr_df.filter(pl.col('panel') == panel)\
+                          .sort(by= 'year')
+        for key, row in [('first', 0), ('last', -1)]:
+            axis = ax[f'{panel} {key}']
+            image = axis.imshow(panel_df['corr'].to_numpy()[row],
+                                cmap= 'RdYlGn',
+                                vmin= -1, vmax= 1)
+            year = panel_df['year'][row]
+            axis.set_title(f'{panel_names[panel]}, '
+                           f'{int(year) - cr.WINDOW + 1}-{year}',
+                           fontweight= 'bold', loc= 'left',
+                           fontsize= 9)
+            axis.set_xticks(range(len(ind_labels)), ind_labels,
+                            rotation= 90, fontsize= 7)
+            axis.set_yticks(range(len(ind_labels)), ind_labels,
+                            fontsize= 7)
+    fig.colorbar(image, ax= [ax['eps first'], ax['eps last']],
+                 location= 'bottom', shrink= 0.5)
+    
+    print('\n============================')
+    print(env.DISPLAY_12_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_12_ADDR))
+    
+    del fig
+    del ax
+    gc.collect()
+    
+# CONTRIBUTIONS TO THE CHANGES IN EARNINGS AND P/E ++++++++++++++++++++
+    # PAGE 13
+    # waterfalls for the latest year of actual earnings and the
+    # year after, precomputed at update time, see decomp_func.py
+    
+    decomp_df = dc.read(src)
+    latest = decomp_df.filter(pl.col('actual'))['year'].max()
+    decomp_years = [yr for yr in sorted(decomp_df['year'].unique())
+                    if yr >= latest][:2]
+    
+    fig = plt.figure(figsize=(11, 8.5), 
+                     layout="constrained")
+    ax = fig.subplot_mosaic([[f'eps {yr}', f'pe {yr}']
+                             for yr in decomp_years])
+    fig.suptitle(
+        '\n' + fixed.PAGE13_SUPTITLE,
+        fontsize=13,
+        fontweight='bold')
+    fig.supxlabel(fixed.PAGE13_SOURCE, fontsize= 8)
+    
+    for yr in decomp_years:
+        year_df = decomp_df.filter(pl.col('year') == yr)
+        prev = str(int(yr) - 1)
+        label = yr if year_df['actual'][0] else f'{yr}E'
+        
+        # eps, largest contributions first
+        eps_df = year_df.with_columns(
+                            (pl.col('eps_contrib') *
+                             pl.col('prev_total_eps') / 100)
+                              .alias('change'))\
+                        .sort(by= 'change', descending= True)
+        pf.plots_page13(ax[f'eps {yr}'],
+                        eps_df['prev_total_eps'][0],
+                        eps_df['change'].to_numpy(),
+                        [name.replace("_", " ")
+                         for name in eps_df['industry']],
+                        title= f'Total operating earnings, {label}, '
+                               f'{eps_df["eps_contrib"].sum():+.1f}%',
+                        start_label= prev,
+                        end_label= label,
+                        ylabl= 'sum of industry eps')
+        
+        pe_df = year_df.sort(by= 'pe_contrib', descending= True)
+        pf.plots_page13(ax[f'pe {yr}'],
+                        pe_df['prev_agg_pe'][0],
+                        pe_df['pe_contrib'].to_numpy(),
+                        [name.replace("_", " ")
+                         for name in pe_df['industry']],
+                        title= f'Aggregate P/E, {label}: '
+                               f'valuation '
+                               f'{pe_df["pe_valuation"].sum():+.2f}, '
+                               f'mix {pe_df["pe_mix"].sum():+.2f}',
+                        start_label= prev,
+                        end_label= label,
+                        ylabl= 'aggregate P/E',
+                        fmt= '{:.2f}')
+    
+    print('\n============================')
+    print(env.DISPLAY_13_ADDR)
+    print('============================\n')
+    fig.savefig(str(env.DISPLAY_13_ADDR))
 
     return
     
\ No newline at end of file
@@ -0,0 +1,168 @@
+'''This program nowcasts the current P/Es, earnings yields, and
+   premiums of the S&P 500 from a new price, and optionally a new
+   10-year TIPS rate, without waiting for the next S&P workbook
+
+   It combines the price with the published trailing earnings and the
+   latest projections, the same 12m trailing and 12m forward eps as
+   the display pages, and computes the measures in memory.
+   It reads two parquet files, never a workbook, and writes no file.
+
+   from the command line:
+        python -m main_script_module.nowcast_data 6000
+        python -m main_script_module.nowcast_data 6000 --tips 1.9
+        python -m main_script_module.nowcast_data --file nowcast.json
+   the file holds {"price": 6000, "real_int_rate": 1.9},
+   real_int_rate is optional
+   if there is no TIPS rate, it uses the latest in the history
+'''
+
+import sys
+import json
+import math
+import time
+import argparse
+
+import polars as pl
+
+from main_script_module import sp_env as sp
+from helper_func_module import publish_func as pb
+from helper_func_module import display_helper_func as dh
+from helper_func_module import display_read_proj_dict
+
+
+def nowcast(price, real_int_rate= None):
+    '''
+        price: the new level of the S&P 500
+        real_int_rate: the new TIPS rate, in percent, or None
+        return df, one row for op and for rep eps
+        cols: eps, yr_qtr of the trailing eps, proj_yr_qtr of the
+            forward eps, price, real_int_rate, and for the 12m
+            trailing and 12m forward eps: eps, pe, yield, premium
+        None if price is not a number > 0
+    '''
+    start = time.perf_counter()
+    if not (isinstance(price, (int, float)) and
+            math.isfinite(price) and price > 0):
+        print('\n============================================')
+        print('In nowcast_data.py, nowcast(price, real_int_rate):')
+        print(f'price {price} is not a number > 0')
+        print('Stop nowcast and return to menu of actions')
+        print('============================================\n')
+        return None
+    env = sp.params
+    src = pb.resolve(env)
+
+    # the latest projections, the last col of the projections file
+    proj_yr_qtr = max(pl.read_parquet_schema(src.OUTPUT_PROJ_ADDR))
+    p_df = display_read_proj_dict.to_proj_dict(
+        pl.read_parquet(src.OUTPUT_PROJ_ADDR,
+                        columns= [proj_yr_qtr]))[proj_yr_qtr]
+    fwd_lf = pl.LazyFrame({'yr_qtr': [proj_yr_qtr]})
+    for eps in ['op', 'rep']:
+        fwd_lf = dh.contemp_12m_fwd_proj(fwd_lf,
+                                         dh.proj_lf({proj_yr_qtr: p_df}),
+                                         f'{eps}_eps',
+                                         f'fwd_{eps}_eps')
+
+    # the latest trailing eps and TIPS rate in the history
+    hist_lf = pl.scan_parquet(src.OUTPUT_HIST_ADDR)\
+                .select('yr_qtr', '12m_op_eps', '12m_rep_eps',
+                        'real_int_rate')\
+                .sort(by= 'yr_qtr')\
+                .select(*[pl.col(f'12m_{eps}_eps').drop_nulls().last()
+                            .alias(f'trailing_{eps}_eps')
+                          for eps in ['op', 'rep']],
+                        pl.col('yr_qtr')
+                          .filter(pl.col('12m_rep_eps').is_not_null())
+                          .last()
+                          .alias('trailing_yr_qtr'),
+                        pl.col('real_int_rate').drop_nulls().last())
+
+    fwd_df, hist_df = pl.collect_all([fwd_lf, hist_lf])
+    if real_int_rate is None:
+        real_int_rate = hist_df['real_int_rate'][0]
+
+    rows = []
+    for eps in ['op', 'rep']:
+        row = {'eps': eps,
+               'trailing_yr_qtr': hist_df['trailing_yr_qtr'][0],
+               'proj_yr_qtr': proj_yr_qtr,
+               'price': float(price),
+               'real_int_rate': float(real_int_rate)}
+        for kind, value in [('trailing', hist_df[f'trailing_{eps}_eps'][0]),
+                            ('fwd', fwd_df[f'fwd_{eps}_eps'][0])]:
+            row[f'{kind}_eps'] = value
+            row[f'{kind}_pe'] = price / value if value else None
+            row[f'{kind}_yield'] = value * 100 / price \
+                if value is not None else None
+            row[f'{kind}_premium'] = row[f'{kind}_yield'] - real_int_rate \
+                if value is not None else None
+        rows.append(row)
+    df = pl.DataFrame(rows)
+
+    print('\n============================================')
+    print(f'Nowcast at price {price:,.2f}, '
+          f'TIPS rate {real_int_rate:.2f}%')
+    print(f'trailing eps through {hist_df["trailing_yr_qtr"][0]}, '
+          f'projections of {proj_yr_qtr}')
+    with pl.Config(tbl_rows= -1, tbl_cols= -1, float_precision= 2,
+                   tbl_hide_column_data_types= True):
+        for kind in ['trailing', 'fwd']:
+            print(df.select('eps', *[f'{kind}_{col}' for col in
+                                     ['eps', 'pe', 'yield', 'premium']]))
+    print(f'\t{1000 * (time.perf_counter() - start):.1f} ms')
+    print('============================================\n')
+    return df
+
+
+def read_inputs(address):
+    '''
+        return price and real_int_rate, None if absent,
+        from the json file at address
+        None, None if either is not a number
+    '''
+    with open(address, 'r') as f:
+        inputs = json.load(f)
+    try:
+        price = float(inputs['price'])
+        real_int_rate = inputs.get('real_int_rate')
+        if real_int_rate is not None:
+            real_int_rate = float(real_int_rate)
+    except (KeyError, TypeError, ValueError):
+        print('\n============================================')
+        print('In nowcast_data.py, read_inputs(address):')
+        print(f'{address}')
+        print('needs a number "price", and optionally '
+              'a number "real_int_rate"')
+        print('============================================\n')
+        return None, None
+    return price, real_int_rate
+
+
+def main(argv= None):
+    parser = argparse.ArgumentParser(
+        description= 'Nowcast the P/Es and premiums of the S&P 500 '
+                     'from a new price')
+    parser.add_argument('price', type= float, nargs= '?',
+                        help= 'level of the S&P 500')
+    parser.add_argument('--tips', type= float, default= None,
+                        help= '10-year TIPS rate, in percent')
+    parser.add_argument('--file', default= None,
+                        help= 'json file with price and real_int_rate')
+    args = parser.parse_args(argv)
+
+    if args.file is not None:
+        price, real_int_rate = read_inputs(args.file)
+        if price is None:
+            return None
+        if real_int_rate is None:
+            real_int_rate = args.tips
+    else:
+        price, real_int_rate = args.price, args.tips
+    if price is None:
+        parser.error('enter a price or --file')
+    return nowcast(price, real_int_rate)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,47 @@
+'''This program lists the generations of output files held in
+   the snapshot store and restores the generation that the user selects
+   
+   Rollback relinks record_dict.json and the parquet files in 
+   output_dir to the stored files of the selected generation,
+   then refreshes analytics.sqlite.
+   It does not reread any workbook.
+   
+   see helper_func_module/snapshot_func.py
+'''
+
+from main_script_module import sp_env as sp
+from helper_func_module import snapshot_func as sf
+from helper_func_module import publish_func as pb
+from helper_func_module import analytics_func as an
+
+
+def rollback():
+    
+    env = sp.params
+    
+    gen_ids = sf.list_generations(env)
+    if not gen_ids:
+        print('\n============================================')
+        print(f'No snapshot generations in: \n{env.SNAPSHOT_GEN_DIR}')
+        print('Return to menu of actions')
+        print('============================================\n')
+        return
+    
+    head_id = sf.head(env)
+    print('\n============================================')
+    for idx, gen_id in enumerate(gen_ids):
+        manifest = sf.read_manifest(env, gen_id)
+        mark = '*' if gen_id == head_id else ' '
+        print(f'{idx}:{mark} {gen_id}  {manifest["label"]}')
+    print('============================================\n')
+    
+    choice = input(
+        'Enter the key of the generation to restore (blank to cancel): ')
+    if not choice.isdigit() or int(choice) >= len(gen_ids):
+        print(f'{choice} is not a valid key, no files restored')
+        return
+    
+    sf.rollback(env, gen_ids[int(choice)])
+    if env.EXPORT_ANALYTICS:
+        an.refresh(env, pb.resolve(env))
+    return
@@ -49,6 +49,13 @@ class Fixed_locations:
     RECORD_DICT_DIR = INPUT_OUTPUT_DIR
     RECORD_DICT_FILE = "record_dict.json"
     RECORD_DICT_ADDR = RECORD_DICT_DIR / RECORD_DICT_FILE
+    # record_dict.json is exported from the manifest after each update
+    # set False to skip the export
+    EXPORT_RECORD_DICT_JSON = True
+    
+    # sqlite manifest of input files, see manifest_func.py
+    MANIFEST_FILE = "file_manifest.sqlite"
+    MANIFEST_ADDR = RECORD_DICT_DIR / MANIFEST_FILE
 
     OUTPUT_DIR = INPUT_OUTPUT_DIR / "output_dir"
     
@@ -60,6 +67,37 @@ class Fixed_locations:
     
     OUTPUT_PROJ_FILE = 'sp500_pe_df_estimates.parquet'
     OUTPUT_PROJ_ADDR = OUTPUT_DIR / OUTPUT_PROJ_FILE
+    
+    # measures computed from the history and projections files,
+    # read by the displays
+    # see helper_func_module/derived_func.py
+    OUTPUT_DERIVED_FILE = 'sp500_derived_df.parquet'
+    OUTPUT_DERIVED_ADDR = OUTPUT_DIR / OUTPUT_DERIVED_FILE
+    
+    # each projection joined with the eps realized,
+    # see helper_func_module/accuracy_func.py
+    OUTPUT_ACCURACY_FILE = 'sp500_proj_accuracy.parquet'
+    OUTPUT_ACCURACY_ADDR = OUTPUT_DIR / OUTPUT_ACCURACY_FILE
+    
+    # the projections in every input file, a weekly vintage,
+    # see helper_func_module/revision_func.py
+    OUTPUT_VINTAGE_FILE = 'sp500_eps_vintages.parquet'
+    OUTPUT_VINTAGE_ADDR = OUTPUT_DIR / OUTPUT_VINTAGE_FILE
+    
+    # rolling correlations among the industries,
+    # see helper_func_module/corr_func.py
+    OUTPUT_IND_CORR_FILE = 'sp500_ind_corr.parquet'
+    OUTPUT_IND_CORR_ADDR = OUTPUT_DIR / OUTPUT_IND_CORR_FILE
+    
+    # cross-sectional statistics of the industries' P/Es,
+    # see helper_func_module/ind_stats_func.py
+    OUTPUT_IND_STATS_FILE = 'sp500_ind_stats.parquet'
+    OUTPUT_IND_STATS_ADDR = OUTPUT_DIR / OUTPUT_IND_STATS_FILE
+    
+    # each industry's contribution to the changes in earnings and P/E,
+    # see helper_func_module/decomp_func.py
+    OUTPUT_IND_DECOMP_FILE = 'sp500_ind_decomp.parquet'
+    OUTPUT_IND_DECOMP_ADDR = OUTPUT_DIR / OUTPUT_IND_DECOMP_FILE
 
     BACKUP_DIR = INPUT_OUTPUT_DIR / 'backup_dir'
     BACKUP_HIST_FILE = "backup_pe_df_actuals.parquet"
@@ -68,8 +106,30 @@ class Fixed_locations:
     BACKUP_IND_ADDR  = BACKUP_DIR / BACKUP_IND_FILE
     BACKUP_PROJ_FILE  = "backup_pe_estimates_df.parquet"
     BACKUP_PROJ_ADDR  = BACKUP_DIR / BACKUP_PROJ_FILE
-    BACKUP_RECORD_DICT = "backup_record_dict.json"
-    BACKUP_RECORD_DICT_ADDR = BACKUP_DIR / BACKUP_RECORD_DICT
+    BACKUP_MANIFEST = "backup_file_manifest.sqlite"
+    BACKUP_MANIFEST_ADDR = BACKUP_DIR / BACKUP_MANIFEST
+
+    # multi-generation store for the manifest and the output files
+    # see helper_func_module/snapshot_func.py
+    SNAPSHOT_DIR = INPUT_OUTPUT_DIR / 'snapshot_dir'
+    SNAPSHOT_OBJECTS_DIR = SNAPSHOT_DIR / 'objects'
+    SNAPSHOT_GEN_DIR = SNAPSHOT_DIR / 'generations'
+    SNAPSHOT_HEAD_ADDR = SNAPSHOT_DIR / 'HEAD'
+    # number of generations to retain
+    SNAPSHOT_KEEP = 12
+
+    # embedded database for ad hoc queries, refreshed after each
+    # update and rollback, see helper_func_module/analytics_func.py
+    # set False to skip the export
+    EXPORT_ANALYTICS = True
+    ANALYTICS_FILE = 'analytics.sqlite'
+    ANALYTICS_ADDR = INPUT_OUTPUT_DIR / ANALYTICS_FILE
+
+    # progress of an unfinished update
+    # see helper_func_module/checkpoint_func.py
+    CHECKPOINT_DIR = INPUT_OUTPUT_DIR / 'checkpoint_dir'
+    CHECKPOINT_ADDR = CHECKPOINT_DIR / 'checkpoint.json'
+    CHECKPOINT_PROJ_DIR = CHECKPOINT_DIR / 'proj'
 
     DISPLAY_DIR = INPUT_OUTPUT_DIR / "display_dir"
     DISPLAY_0 = 'eps_page0.pdf'
@@ -79,6 +139,15 @@ class Fixed_locations:
     DISPLAY_4 = 'eps_page4.pdf'
     DISPLAY_5 = 'eps_page5.pdf'
     DISPLAY_6 = 'eps_page6.pdf'
+    DISPLAY_7 = 'eps_page7.pdf'
+    DISPLAY_8 = 'eps_page8.pdf'
+    DISPLAY_9 = 'eps_page9.pdf'
+    DISPLAY_10 = 'eps_page10.pdf'
+    DISPLAY_11 = 'eps_page11.pdf'
+    DISPLAY_12 = 'eps_page12.pdf'
+    DISPLAY_13 = 'eps_page13.pdf'
+    DISPLAY_14 = 'eps_page14.pdf'
+    DISPLAY_15 = 'eps_page15.pdf'
     DISPLAY_0_ADDR = DISPLAY_DIR / DISPLAY_0
     DISPLAY_1_ADDR = DISPLAY_DIR / DISPLAY_1
     DISPLAY_2_ADDR = DISPLAY_DIR / DISPLAY_2
@@ -86,5 +155,30 @@ class Fixed_locations:
     DISPLAY_4_ADDR = DISPLAY_DIR / DISPLAY_4
     DISPLAY_5_ADDR = DISPLAY_DIR / DISPLAY_5
     DISPLAY_6_ADDR = DISPLAY_DIR / DISPLAY_6
+    DISPLAY_7_ADDR = DISPLAY_DIR / DISPLAY_7
+    DISPLAY_8_ADDR = DISPLAY_DIR / DISPLAY_8
+    DISPLAY_9_ADDR = DISPLAY_DIR / DISPLAY_9
+    DISPLAY_10_ADDR = DISPLAY_DIR / DISPLAY_10
+    DISPLAY_11_ADDR = DISPLAY_DIR / DISPLAY_11
+    DISPLAY_12_ADDR = DISPLAY_DIR / DISPLAY_12
+    DISPLAY_13_ADDR = DISPLAY_DIR / DISPLAY_13
+    DISPLAY_14_ADDR = DISPLAY_DIR / DISPLAY_14
+    DISPLAY_15_ADDR = DISPLAY_DIR / DISPLAY_15
+    
+    # tables of the data shown on the pages, for other programs
+    SCENARIO_FILE = 'eps_scenarios.parquet'
+    SCENARIO_ADDR = DISPLAY_DIR / SCENARIO_FILE
+    PREMIUM_BANDS_FILE = 'eps_premium_bands.parquet'
+    PREMIUM_BANDS_ADDR = DISPLAY_DIR / PREMIUM_BANDS_FILE
+    ACCURACY_FILE = 'eps_accuracy.parquet'
+    ACCURACY_ADDR = DISPLAY_DIR / ACCURACY_FILE
+    REVISION_FILE = 'eps_revisions.parquet'
+    REVISION_ADDR = DISPLAY_DIR / REVISION_FILE
+    IMPLIED_ERP_FILE = 'eps_implied_erp.parquet'
+    IMPLIED_ERP_ADDR = DISPLAY_DIR / IMPLIED_ERP_FILE
+    REGIME_FILE = 'eps_regimes.parquet'
+    REGIME_ADDR = DISPLAY_DIR / REGIME_FILE
+    REGRESSION_FILE = 'eps_rate_regression.parquet'
+    REGRESSION_ADDR = DISPLAY_DIR / REGRESSION_FILE
     
 params = Fixed_locations()
\ No newline at end of file
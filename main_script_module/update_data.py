@@ -26,7 +26,6 @@
 
 #######################  Parameters  ###################################
 import sys
-import gc
 
 import polars as pl
 import polars.selectors as cs
@@ -39,6 +38,18 @@ from helper_func_module import update_write_history_and_industry_files
 from helper_func_module import update_proj_hist_files
 from helper_func_module import update_write_proj_files
 from helper_func_module import update_write_record
+from helper_func_module import snapshot_func as sf
+from helper_func_module import publish_func as pb
+from helper_func_module import manifest_func as mf
+from helper_func_module import checkpoint_func as ck
+from helper_func_module import writer_func as wr
+from helper_func_module import analytics_func as an
+from helper_func_module import derived_func as dv
+from helper_func_module import accuracy_func as ac
+from helper_func_module import revision_func as rv
+from helper_func_module import corr_func as cr
+from helper_func_module import ind_stats_func as xs
+from helper_func_module import decomp_func as dc
 from helper_func_module import helper_func as hp
 from helper_func_module import read_data_func as rd
 
@@ -158,8 +169,19 @@ def update():
             sp500_pe_df_actuals.parquet
             sp500_pe_df_estimates.parquet
             sp500_ind_df.parquet
+        and the measures derived from them to
+            sp500_derived_df.parquet
+            sp500_proj_accuracy.parquet
+            sp500_eps_vintages.parquet
+            sp500_ind_corr.parquet
+            sp500_ind_stats.parquet
+            sp500_ind_decomp.parquet
         Records these transactions in
-            record_dict.json
+            file_manifest.sqlite
+            
+        The update runs in the stages of checkpoint_func.STAGES
+        If an update stopped partway, update() resumes it
+        from its first incomplete stage
     '''
     
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++              
@@ -171,58 +193,159 @@ def update():
     # fetch update_data (local) immutable params, from class above
     loc_env = Fixed_Update_Parameters()
     
+    # checkpoint of an unfinished update, if any
+    checkpoint = ck.resume(env)
+    
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++              
 ## +++++  update records for new files to be read  +++++++++++++++++++++++++
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ 
 
-    # load record_dict - if record_dist is None, create it
+    if checkpoint is None:
+        # bring the snapshot store up to date with the files in output_dir,
+        # adds no generation if they match the HEAD generation
+        mf.migrate(env)
+        sf.commit(env, label= 'before update')
+        
+        # src: the published generation, read once for this update
+        src = pb.resolve(env)
+        
+        # load manifest - if there is none, create it
+        [manifest, new_files_set, files_to_read_set] = \
+             update_record.update(env, loc_env, src)
+        
+        # no new data in the input dir => no update necessary => quit
+        if not files_to_read_set:
+            print('\n============================================')
+            print('Dates of input data files are "stale"')
+            print('Stop Update and return to menu of actions')
+            print('============================================\n')
+            return
+    
+        # dst: the new generation, invisible to readers until published
+        dst = pb.stage(env)
+        
+        checkpoint = ck.new(env, dst.GEN_ID, src.GEN_ID,
+                            new_files_set, files_to_read_set,
+                            mf.latest_used_file(manifest))
+        update_write_record.write(manifest, dst)
+        ck.mark_done(env, checkpoint, 'record')
+    else:
+        src = pb.resolve(env)
+        dst = pb.restage(env, checkpoint['gen_id'])
     
-    [record_dict, new_files_set, files_to_read_set] = \
-         update_record.update(env, loc_env)
+    latest_used_file = checkpoint['latest_used_file']
     
-    # no new data in the input dir => no update necessary => quit
-    if not files_to_read_set:
-        print('\n============================================')
-        print('Dates of input data files are "stale"')
-        print('Stop Update and return to menu of actions')
-        print('============================================\n')
-        return
+## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+## +++++ stage history and industry files, then projections file +++++++++
+## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    
+    # writer writes the staged files on a pool of threads,
+    # the history files while the projections are read
+    # both stages are complete when all files have been fsynced
+    writer = wr.Writer()
+    stages = [stage for stage in ('history', 'projections')
+              if not ck.is_done(checkpoint, stage)]
+    
+    if 'history' in stages:
+        update_history(env, loc_env, src, dst, latest_used_file, writer)
+    
+    if 'projections' in stages:
+        update_projections(env, loc_env, src, dst, checkpoint, writer)
+    
+    writer.finish()
+    for stage in stages:
+        ck.mark_done(env, checkpoint, stage)
+    
+    # the measures for the displays, from the staged files,
+    # versioned by the sha256 of the staged files
+    # and the projections joined with the eps realized since src
+    # and the projections of each input file not read before
+    # and the correlations among industries for new or revised years
+    # and the cross-sectional statistics of the industries' P/Es
+    # and each industry's contribution to the changes in eps and P/E
+    if not ck.is_done(checkpoint, 'derived'):
+        dv.write(dst)
+        ac.update(src, dst)
+        rv.update(env, loc_env, src, dst)
+        cr.update(src, dst)
+        xs.write(dst)
+        dc.write(dst)
+        ck.mark_done(env, checkpoint, 'derived')
+    
+## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+## +++++ publish staged files, then archive input files ++++++++++++++++++++
+## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+    # one atomic rename of HEAD makes all staged files visible
+    # inputs remain in input_dir until the update is published
+    if not ck.is_done(checkpoint, 'publish'):
+        pb.publish(env, dst, src, label= latest_used_file)
+        ck.mark_done(env, checkpoint, 'publish')
+    
+    if not ck.is_done(checkpoint, 'archive'):
+        update_write_proj_files.archive(set(checkpoint['new_files']), env)
+        ck.mark_done(env, checkpoint, 'archive')
+    
+    # refresh the analytics database from the published files
+    if env.EXPORT_ANALYTICS and not ck.is_done(checkpoint, 'export'):
+        an.refresh(env, pb.resolve(env))
+        ck.mark_done(env, checkpoint, 'export')
+    
+    ck.clear(env)
+    
+    return
+
+
+def update_history(env, loc_env, src, dst, latest_used_file, writer):
+    '''
+        read the history and industry data in latest_used_file
+        combine them with the published history and industry files
+        submit the combined files to writer, for the staging dir
+        
+        the published files and the new sheets enter one lazy plan,
+        collected once, so polars reads only the columns and rows
+        that the plan uses and fuses the joins
+    '''
+    
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++              
 ## +++++  fetch historical aggregate data  +++++++++++++++++++++++++++++++++
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ 
     
     print('\n================================================')
-    print(f'Updating historical data from: {record_dict["latest_used_file"]}')
+    print(f'Updating historical data from: {latest_used_file}')
     print(f'in directory: \n{env.INPUT_DIR}')
     print('================================================\n')
     
+    yr_qtr = loc_env.YR_QTR_NAME
+    
     ## ACTUAL DATA from existing .parquet file (not yet updated with new data)
     # the rows (qtrs) to be updated are the rows that
     # contain null in the op_eps col => assumes history is not revised
     # put the yr_qtr for rows NOT to be updated in the set rows_no_update
-    if env.OUTPUT_HIST_ADDR.exists():
-        actual_df = pl.read_parquet(env.OUTPUT_HIST_ADDR)
-        
+    # reads only the cols yr_qtr and op_eps
+    if src.OUTPUT_HIST_ADDR.exists():
         rows_not_to_update_set = \
-            set(pl.Series(actual_df
-                          .filter(pl.col('op_eps').is_not_null())
-                          .select(pl.col(loc_env.YR_QTR_NAME)))
+            set(pl.scan_parquet(src.OUTPUT_HIST_ADDR)
+                  .filter(pl.col('op_eps').is_not_null())
+                  .select(pl.col(yr_qtr))
+                  .collect()
+                  .to_series()
                   .to_list())
     else:
-        rows_not_to_update_set = {}
+        rows_not_to_update_set = set()
     
 ## REAL INTEREST RATES, eoq, from FRED DFII10
     active_workbook = load_workbook(filename= env.INPUT_RR_ADDR,
                                     read_only= True,
                                     data_only= True)
     active_sheet = active_workbook.active
-    real_rt_df = rd.fred_reader(active_sheet,
-                                **loc_env.SHT_FRED_PARAMS)
+    real_rt_lf = rd.fred_reader(active_sheet,
+                                **loc_env.SHT_FRED_PARAMS)\
+                   .lazy()
 
 ## NEW HISTORICAL DATA
     ## WKSHT with new historical values for P and E from new excel file
-    latest_file_addr = env.INPUT_DIR / record_dict["latest_used_file"]
+    latest_file_addr = env.INPUT_DIR / latest_used_file
     active_workbook = load_workbook(filename= latest_file_addr,
                                     read_only= True,
                                     data_only= True)
@@ -234,12 +357,6 @@ def update():
                                         **loc_env.SHT_EST_DATE_PARAMS,
                                         include_prices= True)
     
-    # load new historical data
-    # omit rows whose yr_qtr appears in the rows_no_update list
-    df = rd.sp_loader(active_sheet,
-                      rows_not_to_update_set,
-                      **loc_env.SHT_HIST_PARAMS)
-    
     # if any date is None, halt
     if (name_date is None or
         any([item is None
@@ -248,37 +365,22 @@ def update():
         print('\n============================================')
         print(f'{latest_file_addr} \nmissing history date')
         print(f'Name_date: {name_date}')
-        print(actual_df['date'])
+        print(add_df['date'])
         print('============================================\n')
         sys.exit()
+    
+    # load new historical data
+    # omit rows whose yr_qtr appears in the rows_no_update list
+    df = rd.sp_loader(active_sheet,
+                      rows_not_to_update_set,
+                      **loc_env.SHT_HIST_PARAMS)
         
-    # update add_df with new historical data
-    add_df = pl.concat([add_df, df], how= "diagonal")
-               
-    # include rr in add_df
-    add_df = add_df.join(real_rt_df, 
-                         how="left", 
-                         on=[loc_env.YR_QTR_NAME],
-                         coalesce= True)
-    
-    del real_rt_df
-    del df
-    gc.collect()
-        
-## MARGINS add to add_df
+## MARGINS
     margins_df = rd.margin_loader(active_sheet,
                                   rows_not_to_update_set,
                                   **loc_env.SHT_BC_MARG_PARAMS)
-    
-    add_df = add_df.join(margins_df, 
-                         how="left", 
-                         on= loc_env.YR_QTR_NAME,
-                         coalesce= True)
-    
-    del margins_df
-    gc.collect()
 
-## QUARTERLY DATA add to add_df
+## QUARTERLY DATA
     active_sheet = active_workbook[loc_env.SHT_QTR_NAME]
 
     # ensure all dtypes (if not string or date-like) are float32
@@ -289,109 +391,130 @@ def update():
                  .cast({~(cs.temporal() | cs.string()): pl.Float32,
                         cs.datetime(): pl.Date})
     
-    add_df = add_df.join(qtrly_df,  
-                         how= "left", 
-                         on= [loc_env.YR_QTR_NAME],
-                         coalesce= True)
+    # add_lf: new historical data, with rr, margins, quarterly data
+    add_lf = pl.concat([add_df.lazy(), df.lazy()], how= "diagonal")\
+               .join(real_rt_lf,
+                     how= "left",
+                     on= [yr_qtr],
+                     coalesce= True)\
+               .join(margins_df.lazy(),
+                     how= "left",
+                     on= yr_qtr,
+                     coalesce= True)\
+               .join(qtrly_df.lazy(),
+                     how= "left",
+                     on= [yr_qtr],
+                     coalesce= True)
     
-    del qtrly_df
-    gc.collect()
-    
-## ACTUAL_DF update: remove rows to be updated and concat with add_df
-    # align cols of actual_df with add_df
+## ACTUAL_LF update: remove rows to be updated and concat with add_lf
+    # align cols of the stored history with add_lf
     # ensure rows do not overlap
     
-    if env.OUTPUT_HIST_ADDR.exists():
-        actual_df = pl.concat([add_df.filter(
-                                    ~pl.col(loc_env.YR_QTR_NAME)
+    if src.OUTPUT_HIST_ADDR.exists():
+        actual_lf = pl.concat([add_lf.filter(
+                                    ~pl.col(yr_qtr)
                                     .is_in(rows_not_to_update_set)),
-                               actual_df.select(add_df.columns)
-                                    .filter(pl.col(loc_env.YR_QTR_NAME)
+                               pl.scan_parquet(src.OUTPUT_HIST_ADDR)
+                                    .select(add_lf.collect_schema()
+                                                  .names())
+                                    .filter(pl.col(yr_qtr)
                                     .is_in(rows_not_to_update_set))],
-                               how= 'vertical')\
-                      .sort(by= loc_env.YR_QTR_NAME)
+                               how= 'vertical')
     else:
-        actual_df = add_df.sort(by= loc_env.YR_QTR_NAME)
-    
-    del add_df
-    gc.collect()
+        actual_lf = add_lf
+    actual_lf = actual_lf.sort(by= yr_qtr)
 
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## +++++  fetch historical industry data  ++++++++++++++++++++++++++++++++++++
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-    # read stored data
-    if env.OUTPUT_IND_ADDR.exists():
-        ind_df = pl.read_parquet(env.OUTPUT_IND_ADDR)\
-                        .sort(by= 'year', descending= True)
-                    
-        years_no_update = set(pl.Series(ind_df
+    # years of stored data not to update, reads only 2 cols
+    if src.OUTPUT_IND_ADDR.exists():
+        years_no_update = set(pl.scan_parquet(src.OUTPUT_IND_ADDR)
                                 .drop_nulls(subset='SP500_rep_eps')
-                                .select(pl.col('year')))
+                                .select(pl.col('year'))
+                                .collect()
+                                .to_series()
                                 .to_list())
     else:
         years_no_update = []
     
     # find new industry data
     active_sheet = active_workbook[loc_env.SHT_IND_NAME]
-    add_ind_df = rd.industry_loader(active_sheet,
+    add_ind_lf = rd.industry_loader(active_sheet,
                                     years_no_update,
-                                    **loc_env.SHT_IND_PARAMS)
-    # add col with Q4 value of real_int_rate each year from actual_df
-    add_ind_df = add_ind_df.join(
-                 actual_df.select([loc_env.YR_QTR_NAME, 'real_int_rate'])
-                          .filter(pl.col(loc_env.YR_QTR_NAME)
-                                    .map_elements(lambda x: x[-1:]=='4',
-                                                return_dtype= bool))
-                          .with_columns(pl.col(loc_env.YR_QTR_NAME)
-                                    .map_elements(lambda x: x[0:4],
-                                                return_dtype= str)
-                                    .alias('year'))
-                          .drop(loc_env.YR_QTR_NAME),
+                                    **loc_env.SHT_IND_PARAMS)\
+                   .lazy()
+    # add col with Q4 value of real_int_rate each year from actual_lf
+    add_ind_lf = add_ind_lf.join(
+                 actual_lf.select([yr_qtr, 'real_int_rate'])
+                          .filter(pl.col(yr_qtr).str.ends_with('4'))
+                          .with_columns(pl.col(yr_qtr)
+                                          .str.slice(0, 4)
+                                          .alias('year'))
+                          .drop(yr_qtr),
                  on= 'year',
                  how= 'left',
                  coalesce= True)\
             .sort(by= 'year', descending= True)\
             .cast({~cs.string() : pl.Float32})
     
-    if env.OUTPUT_IND_ADDR.exists():
-        years = pl.Series(add_ind_df['year']).to_list()
-        ind_df = pl.concat([add_ind_df,
-                            ind_df.filter(~pl.col('year')
-                                            .is_in(years))],
+    # stored years that the new data does not replace
+    if src.OUTPUT_IND_ADDR.exists():
+        ind_lf = pl.concat([add_ind_lf,
+                            pl.scan_parquet(src.OUTPUT_IND_ADDR)
+                              .sort(by= 'year', descending= True)
+                              .join(add_ind_lf.select('year'),
+                                    on= 'year',
+                                    how= 'anti',
+                                    maintain_order= 'left')],
                             how= 'vertical')
     else:
-        ind_df = add_ind_df.sort(by= 'year', descending= True)
+        ind_lf = add_ind_lf
         
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## +++++ write history, industry files  ++++++++++++++++++++++++++++++++++++
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-    actual_df = actual_df.cast({cs.float(): pl.Float32,
-                                cs.integer(): pl.Int16})
-    ind_df = ind_df.cast({cs.float(): pl.Float32,
-                          cs.integer(): pl.Int16})
+    # one collect for both plans, which share actual_lf
+    actual_df, ind_df = pl.collect_all(
+        [actual_lf.cast({cs.float(): pl.Float32,
+                         cs.integer(): pl.Int16}),
+         ind_lf.cast({cs.float(): pl.Float32,
+                      cs.integer(): pl.Int16})])
 
-    update_write_history_and_industry_files.write(actual_df, ind_df, env)
+    update_write_history_and_industry_files.write(actual_df, ind_df,
+                                                  env, src, dst, writer)
     
-    del actual_df
-    del ind_df
-    gc.collect()
+    return
+
+
+def update_projections(env, loc_env, src, dst, checkpoint, writer):
+    '''
+        read the projections in checkpoint['files_to_read']
+        combine them with the published projections file
+        submit the combined file to writer, for the staging dir
+        
+        keeps each file's projections in checkpoint_dir/,
+        a rerun reads only the files not yet parsed
+    '''
     
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++              
-## +++++ fetch current projections & archive all proj input files  +++++++++
+## +++++ fetch current projections +++++++++++++++++++++++++++++++++++++++++
 ## +++ proj_dict: yr_qtr keys & df of proj as values +++++++++++++++++++++++
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
     # fetch history
-    proj_dict = update_proj_hist_files.update(env)
+    proj_dict = update_proj_hist_files.update(env, src)
     
-    # Fetch files_to_read from inputs
-    # Update proj_dict with info in files_to_read
+    # Fetch files_to_read from inputs, skip files parsed by an
+    # earlier run of this update
     # use proj of earnings for latest input file in each yr_qtr
     # ordinarily a very short set
-    failure_to_read_lst = []
-    for file in files_to_read_set:
+    files_to_read_lst = [file for file in checkpoint['files_to_read']
+                         if file not in checkpoint['parsed'] and
+                            file not in checkpoint['failures']]
+    for file in files_to_read_lst:
         # echo file name and address to console
         active_workbook = \
             load_workbook(filename=  env.INPUT_DIR / file,
@@ -419,37 +542,34 @@ def update():
             print('In main(), projections:')
             print(f'Skipped sp-500 {name_date} missing projection date')
             print('============================================\n')
-            failure_to_read_lst.append(file)
+            ck.save_failure(env, checkpoint, file)
             continue
         
-        # accumulate proj_date_dfs in proj_dict, 
-        # key for each proj_date_df is its year_quarter
-        
-        proj_dict[year_quarter] = proj_date_df.cast(
-                                    {cs.float(): pl.Float32,
-                                     cs.integer(): pl.Int16})
+        ck.save_proj(env, checkpoint, file, year_quarter,
+                     proj_date_df.cast({cs.float(): pl.Float32,
+                                        cs.integer(): pl.Int16}))
+    
+    # accumulate proj_date_dfs in proj_dict, 
+    # key for each proj_date_df is its year_quarter
+    for file, year_quarter in checkpoint['parsed'].items():
+        proj_dict[year_quarter] = ck.load_proj(env, file)
         
     # Print housekeeping summary for files_to_read
-    l = len(files_to_read_set)
-    n = len(failure_to_read_lst)
+    l = len(checkpoint['files_to_read'])
+    n = len(checkpoint['failures'])
     print('\n====================================================')
     print('Reading input projection files is complete')
     print(f'\t{l - n} new input files read')
+    print(f'\t{len(files_to_read_lst)} parsed by this run')
     print(f'\tfrom {env.INPUT_DIR}')
     print(f'\t{n} files not read:')
-    print(f'\t{failure_to_read_lst}')
+    print(f'\t{checkpoint['failures']}')
     print('====================================================')
         
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 ## +++ write updated proj_dict to parquet file +++++++++++++++++++++++++++++
 ## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-    update_write_proj_files.write(proj_dict, new_files_set, env)
-        
-## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-## +++++ write record ++++++++++++++++++++++++++++++++++++++++++++++++++++++
-## +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-
-    update_write_record.write(record_dict, env)
+    update_write_proj_files.write(proj_dict, dst, writer)
     
-    return
\ No newline at end of file
+    return
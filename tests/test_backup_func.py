@@ -0,0 +1,26 @@
+'''
+   python -m unittest discover tests
+'''
+import tempfile
+import unittest
+from pathlib import Path
+
+from helper_func_module import backup_func as bf
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_snapshot_twice_leaves_no_tmp(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / 'a'
+            dst = Path(tmp_dir) / 'b'
+            src.write_bytes(b'data')
+            bf.snapshot(src, dst)
+            bf.snapshot(src, dst)
+            self.assertEqual(sorted(p.name for p in Path(tmp_dir).iterdir()),
+                             ['a', 'b'])
+            self.assertEqual(dst.read_bytes(), b'data')
+
+
+if __name__ == '__main__':
+    unittest.main()